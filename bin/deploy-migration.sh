@@ -46,6 +46,10 @@ for file in $SQL_FILES; do
     
     if [ $? -eq 0 ]; then
         echo "適用成功: $filename"
+        # 適用済みマイグレーションとして記録（APIのキャッシュ無効化・ETagに使用）
+        version=$(echo "$filename" | sed -E 's/^V([0-9]+)_.*/\1/')
+        echo "INSERT INTO migration_history (filename, version) VALUES ('$filename', '$version') ON CONFLICT DO NOTHING;" \
+            | docker-compose exec -T postgres-db psql -U "$POSTGRES_USER" -d "$POSTGRES_DB" -f - > /dev/null
         mv "$file" "$ARCHIVE_DIR/$filename"
         echo "移動: $filename -> $ARCHIVE_DIR"
     else
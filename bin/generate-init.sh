@@ -70,5 +70,8 @@ if [ -d "$MIGRATIONS_DIR" ]; then
     filename=$(basename "$sqlfile")
     echo "Adding migration: $filename"
     echo "\\i /docker-entrypoint-initdb.d/migrations/$filename" >> "$OUTPUT_FILE"
+    # 適用済みマイグレーションとして記録（APIのキャッシュ無効化・ETagに使用）
+    version=$(echo "$filename" | sed -E 's/^V([0-9]+)_.*/\1/')
+    echo "INSERT INTO migration_history (filename, version) VALUES ('$filename', '$version') ON CONFLICT DO NOTHING;" >> "$OUTPUT_FILE"
   done
 fi
\ No newline at end of file
@@ -89,6 +89,6 @@ if [ ! -f "$PARSER_FILE" ]; then
     exit 1
 fi
 
-# パーサーの実行
+# パーサーの実行（2つ目以降の引数はパーサーに渡す。例: parser 12 --workers 4）
 echo "Running parser: $PARSER_NAME"
-cd "$PROJECT_ROOT" && PYTHONPATH="$PROJECT_ROOT/src" "$PYTHON" -m src.db.parser.${PARSER_NAME%%.py} 
\ No newline at end of file
+cd "$PROJECT_ROOT" && PYTHONPATH="$PROJECT_ROOT/src" "$PYTHON" -m src.db.parser.${PARSER_NAME%%.py} "${@:2}" 
\ No newline at end of file
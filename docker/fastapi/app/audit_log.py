@@ -0,0 +1,185 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""非同期・バッチ書き込みの監査ログ
+
+リクエスト処理ではレコードを上限付きキューに積むだけで、ファイルへの書き込みは
+バックグラウンドスレッドがまとめて行う（JSON Lines形式、日付ごとのファイル）。
+キューが満杯の場合はリクエストを待たせずにレコードを破棄し、破棄件数を記録する。
+"""
+
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# キューに積むレコード（時刻, エンドポイント, 指紋, パラメータ, ステータス, 行数, レイテンシ, クライアント）
+_Record = Tuple[float, str, str, Optional[List[Any]], int, Optional[int], float, Optional[str]]
+
+
+def params_hash(params: Optional[List[Any]]) -> Optional[str]:
+    """パラメータの値をログに残さず、同一性だけを照合できるハッシュ"""
+    if not params:
+        return None
+    encoded = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class AuditLogger:
+    """上限付きキューとバックグラウンドスレッドによる監査ログ"""
+
+    def __init__(self, directory: str, queue_size: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[_Record]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._file_date: Optional[str] = None
+        self._written = 0
+        self._dropped = 0
+        self._dropped_reported = 0
+        self._batches = 0
+        self._write_errors = 0
+        self._last_flush_seconds = 0.0
+
+    # ---------- リクエスト処理側 ----------
+
+    def log(self, endpoint: str, fingerprint: str, params: Optional[List[Any]], status: int,
+            rows: Optional[int], latency: float, client: Optional[str] = None) -> bool:
+        """レコードをキューに積む。満杯で破棄した場合はFalse（待たない）"""
+        try:
+            self._queue.put_nowait((time.time(), endpoint, fingerprint, params, status, rows, latency, client))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+
+    def on_query_finished(self, observation, status: int, rows: Optional[int]) -> None:
+        """metrics.QueryObservation の終了リスナー"""
+        self.log(observation.endpoint, observation.fingerprint, observation.params, status,
+                 rows, observation.elapsed(), observation.client)
+
+    # ---------- バックグラウンド ----------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """キューに残ったレコードを書き出してから停止する"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch or self._dropped != self._dropped_reported:
+                self._write(batch)
+
+    def _next_batch(self) -> List[_Record]:
+        """最初の1件をflush_intervalまで待ち、以降はbatch_sizeまで待たずに取り出す"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[_Record]) -> None:
+        start = time.perf_counter()
+        lines = [self._format(record) for record in batch]
+        with self._lock:
+            dropped = self._dropped - self._dropped_reported
+            self._dropped_reported = self._dropped
+        if dropped:
+            lines.append(json.dumps({
+                "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "event": "audit_records_dropped",
+                "count": dropped,
+            }))
+        try:
+            f = self._open()
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+        except OSError as e:
+            logger.error(f"Audit log write failed ({len(batch)} records lost): {e}")
+            with self._lock:
+                self._write_errors += 1
+            return
+        with self._lock:
+            self._written += len(batch)
+            self._batches += 1
+            self._last_flush_seconds = time.perf_counter() - start
+
+    def _open(self):
+        date = datetime.now(timezone.utc).strftime("%Y%m%d")
+        if self._file is None or self._file_date != date:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(os.path.join(self.directory, f"audit-{date}.jsonl"), "a", encoding="utf-8")
+            self._file_date = date
+        return self._file
+
+    @staticmethod
+    def _format(record: _Record) -> str:
+        ts, endpoint, fingerprint, params, status, rows, latency, client = record
+        return json.dumps({
+            "ts": datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds"),
+            "endpoint": endpoint,
+            "fingerprint": fingerprint,
+            "params_hash": params_hash(params),
+            "status": status,
+            "rows": rows,
+            "latency": round(latency, 6),
+            "client": client,
+        }, ensure_ascii=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "written_total": self._written,
+                "dropped_total": self._dropped,
+                "batches_total": self._batches,
+                "write_errors_total": self._write_errors,
+                "last_flush_seconds": self._last_flush_seconds,
+            }
+
+
+def create_audit_logger_from_env() -> Optional[AuditLogger]:
+    """環境変数の設定で監査ログを生成する（無効化されている場合はNone）"""
+    if os.getenv("AUDIT_LOG_ENABLED", "true").lower() != "true":
+        return None
+    return AuditLogger(
+        directory=os.getenv("AUDIT_LOG_DIR", "logs"),
+        queue_size=int(os.getenv("AUDIT_LOG_QUEUE_SIZE", "10000")),
+        batch_size=int(os.getenv("AUDIT_LOG_BATCH_SIZE", "500")),
+        flush_interval=float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "1.0")),
+    )
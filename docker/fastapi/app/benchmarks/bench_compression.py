@@ -0,0 +1,107 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""レスポンス圧縮のCPU時間と転送量のトレードオフ
+
+tests/json_output/*.json.raw（psqlの出力）からJSONを取り出し、APIと同じく ensure_ascii=False で
+エンコードした本文を、gzip（レベル別）・Brotli（品質別、brotli導入時のみ）で圧縮して比較する。
+転送時間は帯域ごとの理論値（本文サイズ / 帯域）で、圧縮時間と合わせた合計を表示する。
+
+使用例:
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --payload ../../../tests/json_output/full_cache.json.raw
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import timeit
+import zlib
+from typing import Optional
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from compression import brotli, make_compressor  # noqa: E402
+
+JSON_OUTPUT_DIR = os.path.join(APP_DIR, "..", "..", "..", "tests", "json_output")
+DEFAULT_PAYLOAD = os.path.join(JSON_OUTPUT_DIR, "full_cache.json.raw")
+
+# 比較する帯域（Mbps）
+BANDWIDTHS = (10, 100)
+
+_FOOTER_RE = re.compile(r"\(\d+ (?:行|rows?)\)")
+
+
+def extract_json(path: str) -> Optional[bytes]:
+    """psqlの出力（ヘッダ行・区切り線・件数行付き）からJSONを取り出し、APIと同じ形式で再エンコードする"""
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    body = "\n".join(
+        line.rstrip("+").strip() for line in lines[2:] if not _FOOTER_RE.fullmatch(line.strip())
+    ).strip()
+    if not body:
+        return None
+    try:
+        value = json.loads(body)
+    except ValueError:
+        return None
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def load_payload(path: str) -> bytes:
+    payload = extract_json(path)
+    if payload is not None:
+        return payload
+    # 空の結果が保存されている場合は、最も大きいサンプルで代用する
+    for candidate in sorted(glob.glob(os.path.join(JSON_OUTPUT_DIR, "*.json.raw")), key=os.path.getsize, reverse=True):
+        payload = extract_json(candidate)
+        if payload is not None:
+            print(f"{os.path.basename(path)} にJSONが含まれないため {os.path.basename(candidate)} を使用します")
+            return payload
+    raise SystemExit("圧縮対象のJSONが見つかりません")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="レスポンス圧縮のベンチマーク")
+    parser.add_argument("--payload", default=DEFAULT_PAYLOAD, help="psqlで出力したJSONファイル")
+    parser.add_argument("--iterations", type=int, default=50, help="1設定あたりの計測回数")
+    args = parser.parse_args()
+
+    payload = load_payload(args.payload)
+    settings = [("identity", None)]
+    settings += [("gzip", level) for level in (1, 4, 6, 9)]
+    if brotli is not None:
+        settings += [("br", quality) for quality in (1, 4, 6, 11)]
+    else:
+        print("brotli が未導入のためgzipのみ計測します")
+
+    header = f"{'encoding':<10}{'level':>6}{'bytes':>10}{'ratio':>8}{'compress':>12}{'decompress':>12}"
+    header += "".join(f"{f'total@{mbps}M':>14}" for mbps in BANDWIDTHS)
+    print(f"本文: {len(payload)} bytes")
+    print(header)
+    for encoding, level in settings:
+        if encoding == "identity":
+            compressed, compress_time, decompress_time = payload, 0.0, 0.0
+        else:
+            compress = lambda: make_compressor(encoding, level, level).compress(payload, final=True)  # noqa: E731
+            compressed = compress()
+            compress_time = timeit.timeit(compress, number=args.iterations) / args.iterations
+            decompress = (lambda: brotli.decompress(compressed)) if encoding == "br" \
+                else (lambda: zlib.decompress(compressed, 16 + zlib.MAX_WBITS))
+            decompress_time = timeit.timeit(decompress, number=args.iterations) / args.iterations
+        row = f"{encoding:<10}{level if level is not None else '-':>6}{len(compressed):>10}"
+        row += f"{len(payload) / len(compressed):>8.1f}{compress_time * 1e3:>10.2f}ms{decompress_time * 1e3:>10.2f}ms"
+        for mbps in BANDWIDTHS:
+            transfer = len(compressed) * 8 / (mbps * 1e6)
+            row += f"{(compress_time + decompress_time + transfer) * 1e3:>12.2f}ms"
+        print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
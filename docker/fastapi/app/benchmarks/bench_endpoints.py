@@ -0,0 +1,79 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""授業検索エンドポイントと自由形式の /query のレイテンシ（p50/p99）の比較
+
+起動中のAPIに対して、同じ検索を
+- POST /query（/examples の「特定の教員の授業一覧」「特定の学部の授業一覧」と同じ形のSQL）
+- GET /courses/by-instructor・/courses/by-faculty
+で順に送り、クライアント側で計測したレイテンシのパーセンタイルを表示する。
+キャッシュの効果も含めて比較するため、最初の1回（ウォームアップ）は集計しない。
+
+使用例:
+    python benchmarks/bench_endpoints.py --base-url http://localhost:5000/api/v1
+    python benchmarks/bench_endpoints.py --instructor "藤原 和将" --faculty 理工学部 --requests 500
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+import httpx
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from query_examples import QUERY_EXAMPLES  # noqa: E402
+
+
+def percentile(samples: List[float], ratio: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def measure(send: Callable[[], httpx.Response], count: int) -> List[float]:
+    """count回送信し、各リクエストのレイテンシ（ミリ秒）を返す"""
+    send().raise_for_status()
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        send().raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="授業検索エンドポイントと /query のレイテンシの比較")
+    parser.add_argument("--base-url", default="http://localhost:5000/api/v1", help="APIのベースURL")
+    parser.add_argument("--instructor", default=QUERY_EXAMPLES[0]["params"][0], help="検索する教員名")
+    parser.add_argument("--faculty", default=QUERY_EXAMPLES[1]["params"][0], help="検索する学部名")
+    parser.add_argument("--requests", type=int, default=200, help="1経路あたりのリクエスト数")
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.base_url, timeout=60) as client:
+        cases = [
+            ("query: 教員の授業一覧", lambda: client.post(
+                "/query", json={"query": QUERY_EXAMPLES[0]["query"], "params": [args.instructor]})),
+            ("courses/by-instructor", lambda: client.get(
+                "/courses/by-instructor", params={"name": args.instructor})),
+            ("query: 学部の授業一覧", lambda: client.post(
+                "/query", json={"query": QUERY_EXAMPLES[1]["query"], "params": [args.faculty]})),
+            ("courses/by-faculty", lambda: client.get(
+                "/courses/by-faculty", params={"name": args.faculty})),
+        ]
+        print(f"{args.requests}リクエスト × {len(cases)}経路（{args.base_url}）")
+        for label, send in cases:
+            samples = measure(send, args.requests)
+            print(
+                f"  {label:<24}p50 {statistics.median(samples):>8.2f}ms"
+                f"  p99 {percentile(samples, 0.99):>8.2f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
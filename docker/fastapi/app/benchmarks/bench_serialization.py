@@ -0,0 +1,107 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""/query のレスポンスのシリアライズ速度（rows/sec）の比較
+
+- response_model: 従来の経路。FastAPIがQueryResponseで検証・変換してからJSONResponseで出力する
+- fast_json: ハンドラでカーソルの行から直接JSONのバイト列にする経路（FastJSONResponse）
+
+行はDBから取得した場合と同じ型（int・日本語の文字列・Decimal・TIMESTAMP・JSONB）で合成する。
+両経路の出力が同一であることも確認する。
+
+使用例:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --rows 1000 --iterations 50
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from fast_json import FastJSONResponse, orjson  # noqa: E402
+from main import QueryResponse  # noqa: E402
+
+
+def make_rows(count: int) -> List[List[Any]]:
+    """シラバス検索の結果に近い行を合成する"""
+    updated_at = datetime.datetime(2025, 7, 8, 12, 34, 56, 789000)
+    return [
+        [
+            i,
+            "数理·情報科学特別研究",
+            "後期",
+            Decimal("2.0"),
+            updated_at,
+            {"開講情報一覧": [{"年度": "2025", "学期": "後期"}], "担当教員一覧": [{"氏名": "藤原 和将"}]},
+        ]
+        for i in range(count)
+    ]
+
+
+def make_payload(rows: List[List[Any]]) -> Dict[str, Any]:
+    return {
+        "results": rows,
+        "execution_time": 0.0226,
+        "row_count": len(rows),
+        "truncated": False,
+        "next_cursor": None,
+    }
+
+
+def response_model_path(payload: Dict[str, Any]) -> bytes:
+    field = create_response_field(name="Response_execute_query", type_=QueryResponse)
+    content = asyncio.run(serialize_response(field=field, response_content=payload, is_coroutine=True))
+    return JSONResponse(content).body
+
+
+def fast_json_path(payload: Dict[str, Any]) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def measure(fn: Callable[[Dict[str, Any]], bytes], payload: Dict[str, Any], iterations: int) -> float:
+    """1秒あたりにシリアライズできる行数"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    elapsed = time.perf_counter() - start
+    return payload["row_count"] * iterations / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="/query レスポンスのシリアライズ速度の比較")
+    parser.add_argument("--rows", type=int, default=1000, help="1レスポンスの行数")
+    parser.add_argument("--iterations", type=int, default=50, help="計測回数")
+    args = parser.parse_args()
+
+    payload = make_payload(make_rows(args.rows))
+    before = json.loads(response_model_path(payload))
+    after = json.loads(fast_json_path(payload))
+    if before != after:
+        print("出力が一致しません", file=sys.stderr)
+        return 1
+
+    print(f"{args.rows}行 × {args.iterations}回（JSONエンコーダ: {'orjson' if orjson is not None else 'json'}）")
+    baseline = None
+    for label, fn in (("response_model", response_model_path), ("fast_json", fast_json_path)):
+        rate = measure(fn, payload, args.iterations)
+        baseline = baseline or rate
+        print(f"  {label:<16}{rate:>14,.0f} rows/sec  (x{rate / baseline:.1f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""SQL検証器のマイクロベンチマークとコーパス検証
+
+tests/*.sql の各文と /examples のクエリをコーパスとして、
+1. 新しい検証器がコーパスをすべて許可し、禁止クエリをすべて拒否することを確認する
+2. 旧実装（パターン毎のre.match/re.search）と1回あたりの検証時間を比較する
+
+使用例:
+    python benchmarks/bench_validator.py
+    python benchmarks/bench_validator.py --corpus ../../../tests --iterations 2000
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+from typing import Any, List, Optional, Tuple
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from query_examples import QUERY_EXAMPLES  # noqa: E402
+from sql_validator import (  # noqa: E402
+    QueryValidationError, find_suspicious_param, split_statements, validate_sql,
+)
+
+DEFAULT_CORPUS = os.path.join(APP_DIR, "..", "..", "..", "tests")
+
+# 拒否されなければならないクエリ
+FORBIDDEN_CORPUS = [
+    "UPDATE syllabus SET term = '前期'",
+    "SELECT 1; DROP TABLE syllabus",
+    "select * from syllabus; delete from syllabus",
+    "WITH d AS (DELETE FROM book RETURNING *) SELECT * FROM d",
+    "SELECT * FROM syllabus WHERE term = 'x",
+    "CREATE TABLE x (id int)",
+    "-- comment only",
+    # 識別子の途中からリテラルが始まったと誤認させ、後続の命令を隠す試み
+    "SELECT namE'\\' ; DROP TABLE syllabus; --'",
+    "SELECT a$x$ ; DROP TABLE syllabus; $x$",
+    "SELECT '\\'; DROP TABLE syllabus; '",
+]
+
+# 旧実装（比較用）
+_LEGACY_FORBIDDEN = [
+    r";(?!\s*$)", r"(?i)INSERT", r"(?i)UPDATE", r"(?i)DELETE", r"(?i)DROP",
+    r"(?i)CREATE", r"(?i)ALTER", r"(?i)TRUNCATE", r"(?i)ATTACH", r"(?i)DETACH",
+]
+_LEGACY_METADATA = [
+    r"^SELECT\s+column_name,\s*data_type\s+FROM\s+information_schema\.columns\s+WHERE\s+table_name\s*=\s*'[^']+'",
+    r"^SELECT\s+table_name\s+FROM\s+information_schema\.tables\s+WHERE\s+table_schema\s*=\s*'public'",
+    r"^SELECT\s+constraint_name,\s*column_name\s+FROM\s+information_schema\.key_column_usage\s+WHERE\s+table_name\s*=\s*'[^']+'",
+]
+_LEGACY_SUSPICIOUS = ["%--", "%';", "%;", "%/*", "%*/", "%@@"]
+
+
+def legacy_validate(query: str, params: Optional[List[Any]] = None) -> bool:
+    query_stripped = query.strip()
+    for pattern in _LEGACY_METADATA:
+        if re.match(pattern, query_stripped, re.IGNORECASE):
+            return True
+    if not re.match(r"^\s*SELECT", query, re.IGNORECASE):
+        return False
+    for pattern in _LEGACY_FORBIDDEN:
+        if re.search(pattern, query):
+            return False
+    if params:
+        for param in params:
+            if isinstance(param, str):
+                for pattern in _LEGACY_SUSPICIOUS:
+                    if pattern in param:
+                        return False
+    return True
+
+
+def new_validate(query: str, params: Optional[List[Any]] = None) -> bool:
+    try:
+        validate_sql(query, params)
+    except QueryValidationError:
+        return False
+    return find_suspicious_param(params) is None
+
+
+def load_corpus(corpus_dir: str) -> List[Tuple[str, str, Optional[List[Any]]]]:
+    """(名前, クエリ, パラメータ) の一覧を返す"""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.sql"))):
+        with open(path, encoding="utf-8") as f:
+            statements = split_statements(f.read())
+        for i, statement in enumerate(statements, 1):
+            corpus.append((f"{os.path.basename(path)}#{i}", statement, None))
+    for example in QUERY_EXAMPLES:
+        corpus.append((f"examples:{example['name']}", example["query"], example["params"]))
+    return corpus
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SQL検証器のベンチマークとコーパス検証")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="*.sqlを含むディレクトリ")
+    parser.add_argument("--iterations", type=int, default=1000, help="1クエリあたりの計測回数")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    failures = 0
+
+    print("== コーパス検証（許可されるべきクエリ）")
+    for name, query, params in corpus:
+        ok = new_validate(query, params)
+        legacy = legacy_validate(query, params)
+        mark = "ok" if ok else "NG"
+        note = "" if legacy else "  (旧実装では誤って拒否)"
+        print(f"  [{mark}] {name}{note}")
+        failures += not ok
+
+    print("== コーパス検証（拒否されるべきクエリ）")
+    for query in FORBIDDEN_CORPUS:
+        rejected = not new_validate(query)
+        print(f"  [{'ok' if rejected else 'NG'}] {query!r}")
+        failures += not rejected
+
+    # 旧実装は先頭コメントやWITH句を拒否して早期終了するため、両方が許可するクエリでも比較する
+    common = [entry for entry in corpus if legacy_validate(entry[1], entry[2])]
+    for title, queries in (("コーパス全体", corpus), ("両実装が許可するクエリ", common)):
+        if not queries:
+            continue
+        print(f"== ベンチマーク: {title}（{args.iterations}回 × {len(queries)}クエリ）")
+        for label, func in (("legacy", legacy_validate), ("tokenizer", new_validate)):
+            elapsed = timeit.timeit(
+                lambda: [func(query, params) for _, query, params in queries],
+                number=args.iterations,
+            )
+            per_call = elapsed / (args.iterations * len(queries)) * 1e6
+            print(f"  {label:<10} {per_call:8.2f} us/query")
+
+    if failures:
+        print(f"{failures}件の検証に失敗しました", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
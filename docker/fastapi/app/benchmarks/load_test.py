@@ -0,0 +1,101 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""/api/v1/query の同時実行負荷テスト
+
+DB待ちを含むクエリ（既定は pg_sleep）を同時実行数を変えながら投げ、
+スループットが同時実行数に応じて伸びることを確認する。
+イベントループがDB処理で塞がれている場合、スループットは同時実行数によらず一定になる。
+
+使用例:
+    python benchmarks/load_test.py --url http://localhost:5000 --concurrency 1 2 4 8 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+DEFAULT_QUERY = "SELECT pg_sleep(%s)"
+
+
+async def _worker(client: httpx.AsyncClient, url: str, payload: Dict[str, Any],
+                  count: int, latencies: List[float], errors: List[str]) -> None:
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            response = await client.post(url, json=payload)
+            if response.status_code != 200:
+                errors.append(f"{response.status_code}: {response.text[:200]}")
+                continue
+        except httpx.HTTPError as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(base_url: str, concurrency: int, requests_per_worker: int,
+                    payload: Dict[str, Any]) -> Dict[str, Any]:
+    """指定した同時実行数で負荷をかけ、結果を集計する"""
+    url = f"{base_url.rstrip('/')}/api/v1/query"
+    latencies: List[float] = []
+    errors: List[str] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            _worker(client, url, payload, requests_per_worker, latencies, errors)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+        "first_error": errors[0] if errors else "",
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="/api/v1/query の同時実行負荷テスト")
+    parser.add_argument("--url", default="http://localhost:5000", help="APIのベースURL")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="計測する同時実行数")
+    parser.add_argument("--requests", type=int, default=20, help="1ワーカーあたりのリクエスト数")
+    parser.add_argument("--sleep", type=float, default=0.05, help="pg_sleepの秒数（DB待ち時間）")
+    parser.add_argument("--query", default=DEFAULT_QUERY, help="実行するクエリ")
+    args = parser.parse_args()
+
+    payload: Dict[str, Any] = {"query": args.query}
+    if args.query == DEFAULT_QUERY:
+        payload["params"] = [args.sleep]
+
+    print(f"{'conc':>5} {'reqs':>6} {'err':>5} {'req/s':>9} {'p50(ms)':>9} {'p99(ms)':>9} {'scale':>6}")
+    baseline = None
+    for level in args.concurrency:
+        result = asyncio.run(run_level(args.url, level, args.requests, payload))
+        if baseline is None:
+            baseline = result["throughput"] or 1.0
+        print(
+            f"{result['concurrency']:>5} {result['requests']:>6} {result['errors']:>5} "
+            f"{result['throughput']:>9.1f} {result['p50'] * 1000:>9.1f} "
+            f"{result['p99'] * 1000:>9.1f} {result['throughput'] / baseline:>6.2f}"
+        )
+        if result["first_error"]:
+            print(f"      first error: {result['first_error']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""レスポンス圧縮（gzip / Brotli）のASGIミドルウェア
+
+Accept-Encoding でクライアントが受け付ける形式を選び、一定サイズ以上のテキスト系レスポンス
+（JSON・NDJSON・CSV等）を圧縮する。シラバスのJSONは日本語のキー名（開講情報一覧・担当教員一覧など）が
+繰り返し現れるため圧縮が効きやすい。
+ストリーミングレスポンスはバッチごとにフラッシュしながら圧縮し、逐次送信を妨げない。
+Brotliは brotli パッケージがインストールされている場合のみ使用する。
+"""
+
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli未導入の環境ではgzipのみ
+    brotli = None
+
+# 圧縮対象とするContent-Type（前方一致）
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/",
+)
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+# これより小さいレスポンスは圧縮しない（バイト）
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# gzipの圧縮レベル（1〜9）
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Brotliの品質（0〜11）
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """優先順に並べた利用可能な圧縮形式"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encodingから圧縮形式を選ぶ（q=0で拒否された形式は選ばない）"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, options = part.strip().partition(";")
+        q = 1.0
+        options = options.strip()
+        if options.startswith("q="):
+            try:
+                q = float(options[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    candidates = [
+        (weights.get(encoding, weights.get("*", 0.0)), -i, encoding)
+        for i, encoding in enumerate(available_encodings())
+    ]
+    q, _, encoding = max(candidates)
+    return encoding if q > 0 else None
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        flush = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+def make_compressor(encoding: str, gzip_level: int = COMPRESSION_GZIP_LEVEL,
+                    brotli_quality: int = COMPRESSION_BROTLI_QUALITY):
+    if encoding == "br":
+        return _BrotliCompressor(brotli_quality)
+    return _GzipCompressor(gzip_level)
+
+
+class CompressionMiddleware:
+    """一定サイズ以上のテキスト系レスポンスをgzip/Brotliで圧縮する"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 gzip_level: int = COMPRESSION_GZIP_LEVEL,
+                 brotli_quality: int = COMPRESSION_BROTLI_QUALITY):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """1レスポンス分の送信を仲介し、必要に応じて本文を圧縮する"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start = None
+        self._compressor = None
+        # 圧縮しないと決まった後はそのまま転送する
+        self._passthrough = False
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        if self._passthrough:
+            await self._send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            # 最初の本文が届いた時点で圧縮するかどうかを決める
+            headers = self._start["headers"]
+            if not self._compressible(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                self._passthrough = True
+                if self._compressible(headers):
+                    self._start["headers"] = _with_vary(headers)
+                await self._send(self._start)
+                await self._send(message)
+                return
+            self._compressor = make_compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            compressed = self._compressor.compress(body, final=not more_body)
+            headers = [(k, v) for k, v in _with_vary(headers) if k != b"content-length"]
+            headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+            if not more_body:
+                headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+            self._start["headers"] = headers
+            await self._send(self._start)
+            await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+            return
+
+        compressed = self._compressor.compress(body, final=not more_body)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    @staticmethod
+    def _compressible(headers: List[Tuple[bytes, bytes]]) -> bool:
+        content_type = b""
+        for name, value in headers:
+            name = name.lower()
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value.lower()
+        return content_type.decode("latin-1").startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+
+def _with_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Vary: Accept-Encoding を付与したヘッダを返す（共有キャッシュでの取り違え防止）"""
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" in value.lower():
+                return headers
+            headers = list(headers)
+            headers[i] = (name, value + b", Accept-Encoding")
+            return headers
+    return list(headers) + [(b"vary", b"Accept-Encoding")]
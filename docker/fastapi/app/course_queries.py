@@ -0,0 +1,101 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""授業検索エンドポイント（/courses/... 等）で使う固定のクエリ
+
+いずれも01-init.sqlで作成済みのインデックス（instructor.name・faculty.faculty_name・
+lecture_time(day_of_week, period)・各中間テーブルのsyllabus_id等）で絞り込める形にしている。
+クエリ文字列は条件の組み合わせごとに固定のため、接続ごとのプリペアドステートメントと
+結果キャッシュがそのまま再利用される。
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 授業一覧の列（レスポンスのキー名と同じ順序）
+COURSE_FIELDS = ["syllabus_id", "syllabus_code", "year", "subject_name", "subtitle", "term", "campus", "credits"]
+INSTRUCTOR_COURSE_FIELDS = COURSE_FIELDS + ["role"]
+TIMETABLE_FIELDS = COURSE_FIELDS + ["day_of_week", "period"]
+
+_COURSE_SELECT = """
+    SELECT s.syllabus_id, sm.syllabus_code, sm.syllabus_year, sn.name, s.subtitle, s.term, s.campus, s.credits{extra}
+    FROM syllabus s
+    JOIN syllabus_master sm ON sm.syllabus_id = s.syllabus_id
+    JOIN subject_name sn ON sn.subject_name_id = s.subject_name_id
+"""
+
+BOOK_FIELDS = ["title", "author", "publisher", "price", "isbn", "role", "note", "categorized"]
+
+# 書籍マスタに分類済みの書籍と、未分類のまま登録された書籍をまとめて返す
+BOOKS_BY_SYLLABUS = """
+    SELECT b.title, b.author, b.publisher, b.price, b.isbn, sb.role, sb.note, TRUE
+    FROM syllabus_book sb
+    JOIN book b ON b.book_id = sb.book_id
+    WHERE sb.syllabus_id = %s
+    UNION ALL
+    SELECT bu.title, bu.author, bu.publisher, bu.price, bu.isbn, bu.role, NULL, FALSE
+    FROM book_uncategorized bu
+    WHERE bu.syllabus_id = %s
+    ORDER BY 6, 1
+"""
+
+
+def _course_query(extra: str, join: str, where: Sequence[str], order_by: str,
+                  year: Optional[int]) -> str:
+    conditions = list(where)
+    if year is not None:
+        conditions.append("sm.syllabus_year = %s")
+    return (
+        _COURSE_SELECT.format(extra=extra)
+        + join
+        + "    WHERE " + " AND ".join(conditions) + "\n"
+        + f"    ORDER BY {order_by}\n"
+    )
+
+
+def courses_by_instructor(name: str, year: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """教員名（完全一致）で担当授業を検索するクエリとパラメータ（末尾の列は担当区分）"""
+    query = _course_query(
+        ", si.role",
+        "    JOIN syllabus_instructor si ON si.syllabus_id = s.syllabus_id\n"
+        "    JOIN instructor i ON i.instructor_id = si.instructor_id\n",
+        ["i.name = %s"], "sm.syllabus_year DESC, s.syllabus_id", year
+    )
+    return query, [name] + ([year] if year is not None else [])
+
+
+def courses_by_faculty(name: str, year: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """学部名（完全一致）で開講授業を検索するクエリとパラメータ"""
+    query = _course_query(
+        "",
+        "    JOIN syllabus_faculty sf ON sf.syllabus_id = s.syllabus_id\n"
+        "    JOIN faculty f ON f.faculty_id = sf.faculty_id\n",
+        ["f.faculty_name = %s"], "sm.syllabus_year DESC, s.syllabus_id", year
+    )
+    return query, [name] + ([year] if year is not None else [])
+
+
+def timetable(day_of_week: str, period: Optional[int] = None,
+              year: Optional[int] = None) -> Tuple[str, List[Any]]:
+    """曜日（・時限）で授業を検索するクエリとパラメータ（末尾の列は曜日・時限）"""
+    where = ["lt.day_of_week = %s"] + (["lt.period = %s"] if period is not None else [])
+    query = _course_query(
+        ", lt.day_of_week, lt.period",
+        "    JOIN lecture_time lt ON lt.syllabus_id = s.syllabus_id\n",
+        where, "lt.period, sm.syllabus_year DESC, s.syllabus_id", year
+    )
+    params: List[Any] = [day_of_week]
+    if period is not None:
+        params.append(period)
+    if year is not None:
+        params.append(year)
+    return query, params
+
+
+def books_by_syllabus(syllabus_id: int) -> Tuple[str, List[Any]]:
+    return BOOKS_BY_SYLLABUS, [syllabus_id, syllabus_id]
+
+
+def to_records(rows: Sequence[Sequence[Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """行をレスポンス用の辞書にする"""
+    return [dict(zip(fields, row)) for row in rows]
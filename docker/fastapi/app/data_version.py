@@ -0,0 +1,98 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""データバージョン（適用済みマイグレーション）の追跡
+
+シラバスデータはマイグレーション適用時にのみ変化するため、
+migration_history の最新バージョンをデータバージョンとして扱う。
+バックグラウンドで定期的に確認し、変化した場合は登録されたリスナー
+（結果キャッシュの破棄など）を呼び出す。
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+from loguru import logger
+
+
+def fetch_data_version(conn) -> str:
+    """接続先DBのデータバージョンを取得する
+
+    migration_historyが存在しない古いDBでは、テーブル更新件数の累計で代用する。
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('public.migration_history') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            cursor.execute("SELECT max(version) FROM migration_history")
+            version = cursor.fetchone()[0]
+            if version is not None:
+                return str(version)
+        cursor.execute(
+            "SELECT coalesce(sum(n_tup_ins + n_tup_upd + n_tup_del), 0) FROM pg_stat_user_tables"
+        )
+        return f"stat-{cursor.fetchone()[0]}"
+
+
+def version_at_least(version: Optional[str], required: str) -> bool:
+    """versionがrequired以降か（マイグレーションのバージョンは数値として比較する）"""
+    if version is None:
+        return False
+    if version.isdigit() and required.isdigit():
+        return int(version) >= int(required)
+    # migration_historyがない場合の代替バージョン（stat-...）は一致のみ判定できる
+    return version == required
+
+
+class DataVersionTracker:
+    """データバージョンを定期的に確認し、変化を通知する"""
+
+    def __init__(self, pool, interval: float = 30.0):
+        self.pool = pool
+        self.interval = interval
+        self._version: Optional[str] = None
+        self._listeners: List[Callable[[Optional[str], str], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        """最後に確認したデータバージョン（未確認の場合はNone）"""
+        return self._version
+
+    def add_listener(self, listener: Callable[[Optional[str], str], None]) -> None:
+        """バージョン変化時に listener(旧バージョン, 新バージョン) を呼び出す"""
+        self._listeners.append(listener)
+
+    def refresh(self) -> Optional[str]:
+        """DBからバージョンを取得し、変化していればリスナーに通知する"""
+        try:
+            with self.pool.connection() as conn:
+                version = fetch_data_version(conn)
+        except Exception as e:
+            logger.warning(f"Failed to fetch data version: {e}")
+            return self._version
+        old = self._version
+        if version != old:
+            self._version = version
+            if old is not None:
+                logger.info(f"Data version changed: {old} -> {version}")
+            for listener in self._listeners:
+                try:
+                    listener(old, version)
+                except Exception as e:
+                    logger.error(f"Data version listener failed: {e}")
+        return version
+
+    def start(self) -> None:
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="data-version", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.refresh()
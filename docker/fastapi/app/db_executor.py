@@ -0,0 +1,67 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""DB処理専用の上限付きスレッドエグゼキュータ
+
+psycopg2はブロッキングAPIのため、asyncハンドラから直接呼ぶとイベントループが停止する。
+DB処理はこのエグゼキュータ上で実行し、ハンドラはその完了をawaitする。
+スレッド数は接続プールの最大接続数に合わせ、プール待ちのスレッドを作らない。
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class DBExecutor:
+    """ブロッキングなDB処理を専用スレッドで実行する"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._active = 0
+        self._pending = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """fnをエグゼキュータで実行し、結果を返す"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._pending += 1
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, fn, *args, **kwargs)
+        )
+
+    def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._pending -= 1
+            self._active += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """実行中・待機中のタスク数を返す"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "pending": self._pending,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def create_executor_from_env() -> DBExecutor:
+    """環境変数の設定でエグゼキュータを生成する（既定はプールの最大接続数）"""
+    default_workers = os.getenv("DB_POOL_MAX_SIZE", "10")
+    return DBExecutor(int(os.getenv("DB_EXECUTOR_WORKERS", default_workers)))
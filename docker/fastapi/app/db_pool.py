@@ -0,0 +1,401 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""PostgreSQL接続プール
+
+リクエスト毎の psycopg2.connect（TCP接続・認証・バックエンド起動）を避けるため、
+上限付きの接続プールを提供する。
+
+- 最小/最大接続数を環境変数で設定可能
+- 払い出し時に接続を検証（閉塞・トランザクション状態・一定時間アイドル後のping）
+- アイドル時間・生存時間を超えた接続を破棄
+- 飽和状況の統計（使用中・待機数・タイムアウト数など）を提供
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, Optional
+
+import psycopg2
+import psycopg2.extensions
+from loguru import logger
+
+
+class PoolTimeout(Exception):
+    """接続プールから時間内に接続を取得できなかった"""
+
+
+class PoolClosed(Exception):
+    """クローズ済みのプールから接続を取得しようとした"""
+
+
+@dataclass
+class ConnectionInfo:
+    """プールが管理する接続ごとのメタ情報"""
+    created_at: float
+    last_used_at: float
+    use_count: int = 0
+    # 接続単位の付随状態（プリペアドステートメント等）を保持する
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+
+class ConnectionPool:
+    """スレッドセーフな上限付きpsycopg2接続プール"""
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 5.0,
+        max_idle: float = 300.0,
+        max_lifetime: float = 3600.0,
+        validate_after: float = 5.0,
+        name: str = "primary",
+        **connect_kwargs: Any,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.validate_after = validate_after
+        self.name = name
+        self.connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition()
+        # LIFOで払い出し、使われない接続がアイドル超過で自然に破棄されるようにする
+        self._idle: Deque[Any] = deque()
+        self._info: Dict[int, ConnectionInfo] = {}
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = True
+        self._reaper: Optional[threading.Thread] = None
+
+        # 統計情報
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._validation_failures = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    # ---------- ライフサイクル ----------
+
+    def open(self) -> None:
+        """プールを開き、最小接続数まで接続を確立する"""
+        with self._cond:
+            if not self._closed:
+                return
+            self._closed = False
+        self._fill_to_min()
+        self._reaper = threading.Thread(
+            target=self._reap_loop, name=f"db-pool-reaper-{self.name}", daemon=True
+        )
+        self._reaper.start()
+        logger.info(
+            f"Connection pool '{self.name}' opened (min={self.min_size}, max={self.max_size})"
+        )
+
+    def close(self) -> None:
+        """プールを閉じ、アイドル接続をすべて切断する"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_conn(conn)
+        logger.info(f"Connection pool '{self.name}' closed")
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    # ---------- 払い出し・返却 ----------
+
+    def getconn(self, timeout: Optional[float] = None):
+        """接続を払い出す（検証済み）"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            conn = None
+            create = False
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise PoolClosed(f"Connection pool '{self.name}' is closed")
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # 接続確立はロック外で行うため枠だけ確保する
+                        self._size += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"Timed out after {timeout:.1f}s waiting for a connection "
+                            f"(pool '{self.name}', max_size={self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._validate(conn):
+                self._discard(conn)
+                continue
+
+            waited = time.monotonic() - start
+            with self._cond:
+                self._in_use += 1
+                self._checkouts += 1
+                self._peak_in_use = max(self._peak_in_use, self._in_use)
+                self._wait_time_total += waited
+                self._wait_time_max = max(self._wait_time_max, waited)
+                info = self._info[id(conn)]
+                info.use_count += 1
+            return conn
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """接続をプールに返却する"""
+        with self._cond:
+            self._in_use -= 1
+        if not discard:
+            discard = not self._reset(conn) or self._expired(conn, time.monotonic())
+        if discard or self._closed:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._info[id(conn)].last_used_at = time.monotonic()
+            self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """with文で接続を借り、終了時に返却する"""
+        conn = self.getconn(timeout)
+        discard = False
+        try:
+            yield conn
+        except psycopg2.Error:
+            # 接続が切断された場合のみ破棄する（statement_timeout等の取消は再利用可能）
+            discard = bool(conn.closed)
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    @contextmanager
+    def fresh_connection(self) -> Iterator[Optional[Any]]:
+        """まだ一度も払い出していない接続を借りる（アイドル接続になければ新たに確立する）
+
+        未使用のアイドル接続がなく最大接続数に達している場合はNoneを返す（待たない）。
+        ウォームアップで、接続を1本ずつ準備してからプールに加えるために使う。
+        """
+        conn = None
+        create = False
+        with self._cond:
+            if self._closed:
+                raise PoolClosed(f"Connection pool '{self.name}' is closed")
+            conn = next((idle for idle in self._idle if self._info[id(idle)].use_count == 0), None)
+            if conn is not None:
+                self._idle.remove(conn)
+            elif self._size < self.max_size:
+                self._size += 1
+                create = True
+        if conn is None and not create:
+            yield None
+            return
+        if create:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+        with self._cond:
+            self._in_use += 1
+            self._checkouts += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._info[id(conn)].use_count += 1
+        discard = False
+        try:
+            yield conn
+        except psycopg2.Error:
+            discard = bool(conn.closed)
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def info(self, conn) -> ConnectionInfo:
+        """接続のメタ情報を返す"""
+        return self._info[id(conn)]
+
+    # ---------- 統計 ----------
+
+    def stats(self) -> Dict[str, Any]:
+        """プールの飽和状況を返す"""
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                "name": self.name,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "peak_in_use": self._peak_in_use,
+                "saturation": self._in_use / self.max_size,
+                "checkouts_total": checkouts,
+                "timeouts_total": self._timeouts,
+                "connections_created_total": self._created,
+                "connections_discarded_total": self._discarded,
+                "validation_failures_total": self._validation_failures,
+                "wait_time_avg": self._wait_time_total / checkouts if checkouts else 0.0,
+                "wait_time_max": self._wait_time_max,
+            }
+
+    # ---------- 内部処理 ----------
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn, **self.connect_kwargs)
+        now = time.monotonic()
+        with self._cond:
+            self._info[id(conn)] = ConnectionInfo(created_at=now, last_used_at=now)
+            self._created += 1
+        return conn
+
+    def _validate(self, conn) -> bool:
+        """払い出し前の検証。一定時間アイドルだった接続のみpingする"""
+        now = time.monotonic()
+        if conn.closed or self._expired(conn, now):
+            return False
+        info = self._info[id(conn)]
+        if now - info.last_used_at < self.validate_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Connection validation failed (pool '{self.name}'): {e}")
+            with self._cond:
+                self._validation_failures += 1
+            return False
+
+    def _reset(self, conn) -> bool:
+        """返却時にトランザクションを終了させる。失敗した場合はFalse"""
+        if conn.closed:
+            return False
+        try:
+            status = conn.info.transaction_status
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _expired(self, conn, now: float) -> bool:
+        info = self._info.get(id(conn))
+        if info is None:
+            return True
+        return bool(self.max_lifetime) and now - info.created_at > self.max_lifetime
+
+    def _discard(self, conn) -> None:
+        self._close_conn(conn)
+        with self._cond:
+            self._info.pop(id(conn), None)
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_conn(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _fill_to_min(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception as e:
+                with self._cond:
+                    self._size -= 1
+                logger.error(f"Failed to prefill connection pool '{self.name}': {e}")
+                return
+            with self._cond:
+                self._idle.append(conn)
+                self._cond.notify()
+
+    def _reap_loop(self) -> None:
+        """アイドル超過・生存期間超過の接続を定期的に破棄する"""
+        interval = max(1.0, min(self.max_idle or 60.0, self.max_lifetime or 60.0, 60.0) / 2)
+        while not self._closed:
+            time.sleep(interval)
+            now = time.monotonic()
+            stale = []
+            with self._cond:
+                keep: Deque[Any] = deque()
+                # 古い順に見て、最小接続数を割らない範囲で破棄する
+                for conn in self._idle:
+                    info = self._info[id(conn)]
+                    idle_too_long = bool(self.max_idle) and now - info.last_used_at > self.max_idle
+                    if self._expired(conn, now) or (
+                        idle_too_long and self._size - len(stale) > self.min_size
+                    ):
+                        stale.append(conn)
+                    else:
+                        keep.append(conn)
+                self._idle = keep
+            for conn in stale:
+                self._discard(conn)
+            self._fill_to_min()
+
+
+def create_pool_from_env(dsn: str, **connect_kwargs: Any) -> ConnectionPool:
+    """環境変数の設定でプールを生成する"""
+    return ConnectionPool(
+        dsn,
+        min_size=int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+        max_idle=float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+        validate_after=float(os.getenv("DB_POOL_VALIDATE_AFTER", "5")),
+        **connect_kwargs,
+    )
@@ -0,0 +1,71 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""クエリ結果の高速なJSONシリアライズ
+
+カーソルから得た行（タプル・DictRow）をpydanticの検証や jsonable_encoder を通さず、直接JSONのバイト列にする。
+orjson が利用できればそれを使い、なければ標準の json モジュールで同じ出力を作る。
+値の表現はpydanticのJSONモードに合わせる。
+- datetime / date / time: ISO 8601（UTCは Z）
+- Decimal: 精度を落とさないよう文字列
+- JSONB: psycopg2がdict / listに変換済みのためそのまま
+"""
+
+import datetime
+import json
+from decimal import Decimal
+from typing import Any, Iterable, Sequence
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson未導入の環境では標準のjsonを使う
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """標準でシリアライズできない値の変換"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_UTC_Z
+
+    def dumps(value: Any) -> bytes:
+        """値をJSONのバイト列にする"""
+        return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+    def dumps_lines(rows: Iterable[Sequence[Any]]) -> bytes:
+        """行ごとに1行のJSON配列としたNDJSONのバイト列にする"""
+        option = _OPTIONS | orjson.OPT_APPEND_NEWLINE
+        return b"".join(orjson.dumps(row, default=_default, option=option) for row in rows)
+else:
+    def dumps(value: Any) -> bytes:
+        """値をJSONのバイト列にする"""
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+    def dumps_lines(rows: Iterable[Sequence[Any]]) -> bytes:
+        """行ごとに1行のJSON配列としたNDJSONのバイト列にする"""
+        return "".join(
+            json.dumps(row, ensure_ascii=False, separators=(",", ":"), default=_default) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """response_modelによる検証を経ずに、内容をそのままJSONにするレスポンス"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
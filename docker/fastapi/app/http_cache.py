@@ -0,0 +1,59 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""ETagによる条件付きGET
+
+レスポンスはマイグレーションの適用（データバージョンの更新）がなければ変わらないため、
+データバージョンとリクエストの指紋からETagを作り、If-None-Matchが一致すれば304を返す。
+ブラウザやCDNのキャッシュが再検証だけで済み、PostgreSQLに問い合わせずに応答できる。
+ETagは圧縮（Content-Encoding）の有無によらず同じ値とするため、弱いETag（W/）とする。
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+from fastapi.responses import Response
+
+# Cache-Controlのmax-age（秒）。0の場合は毎回再検証させる（no-cache）
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+
+
+def make_etag(*parts: str) -> str:
+    digest = hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Matchの値（カンマ区切り・*）にETagが含まれるか（弱い比較）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def cache_control(max_age: int = HTTP_CACHE_MAX_AGE) -> str:
+    return f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+
+
+def set_validators(response: Response, etag: str, vary: Optional[str] = None) -> Response:
+    """レスポンスにETagとCache-Controlを付与する"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control()
+    if vary:
+        response.headers["Vary"] = vary
+    return response
+
+
+def not_modified(etag: str, vary: Optional[str] = None) -> Response:
+    """304 Not Modified（本文なし）"""
+    return set_validators(Response(status_code=304), etag, vary)
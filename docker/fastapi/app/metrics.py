@@ -0,0 +1,186 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""Prometheusメトリクス
+
+/metrics で以下を公開する。
+- クエリのリクエスト数（エンドポイント・クエリ雛形・ステータス別）
+- 処理段階（検証・DB実行・シリアライズ）ごとのレイテンシのヒストグラム
+- 返却行数のヒストグラム
+- 接続プール・エグゼキュータ・結果キャッシュ等の統計（スクレイプ時に読み取る）
+
+クエリ雛形はリテラルを除いて正規化したクエリの指紋（sql_validator.fingerprint）で区別する。
+ラベルの種類が際限なく増えないよう、記録する指紋の数には上限を設け、超えた分は "other" にまとめる。
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from loguru import logger
+from prometheus_client import Counter, Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from sql_validator import fingerprint, normalize_template
+
+# ラベルとして記録するクエリ指紋の最大数
+METRICS_MAX_FINGERPRINTS = int(os.getenv("METRICS_MAX_FINGERPRINTS", "500"))
+
+OTHER_FINGERPRINT = "other"
+
+query_requests_total = Counter(
+    "api_query_requests_total",
+    "Query requests by endpoint, query fingerprint and HTTP status",
+    ["endpoint", "fingerprint", "status"],
+)
+
+query_phase_seconds = Histogram(
+    "api_query_phase_seconds",
+    "Query latency by processing phase (validation, db, serialization)",
+    ["phase", "fingerprint"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+statement_execute_seconds = Histogram(
+    "api_statement_execute_seconds",
+    "Execution time of parameterized queries (excluding PREPARE), prepared or direct",
+    ["mode", "fingerprint"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+query_rows = Histogram(
+    "api_query_rows",
+    "Rows returned per query",
+    ["fingerprint"],
+    buckets=(0, 1, 5, 10, 50, 100, 250, 500, 1000, 5000, 10000, 100000),
+)
+
+
+class _FingerprintRegistry:
+    """観測したクエリ指紋とその雛形（上限を超えた指紋は "other" として扱う）"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._templates: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def label(self, query: str) -> str:
+        key = fingerprint(query)
+        with self._lock:
+            if key in self._templates:
+                return key
+            if len(self._templates) >= self.capacity:
+                return OTHER_FINGERPRINT
+            self._templates[key] = normalize_template(query)
+        return key
+
+    def templates(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._templates)
+
+
+fingerprints = _FingerprintRegistry(METRICS_MAX_FINGERPRINTS)
+
+
+# QueryObservation.finish() のたびに呼ばれるリスナー（監査ログ等）
+_finish_listeners: List[Callable[["QueryObservation", int, Optional[int]], None]] = []
+
+
+def add_finish_listener(listener: Callable[["QueryObservation", int, Optional[int]], None]) -> None:
+    """listener(observation, status, rows) を登録する"""
+    _finish_listeners.append(listener)
+
+
+class QueryObservation:
+    """1クエリ分の計測。処理段階ごとの時間を記録し、finish()でリクエスト数を数える"""
+
+    def __init__(self, endpoint: str, query: str, params: Optional[List[Any]] = None,
+                 client: Optional[str] = None):
+        self.endpoint = endpoint
+        self.query = query
+        self.fingerprint = fingerprints.label(query)
+        self.params = params
+        self.client = client
+        self._started = time.perf_counter()
+        self._finished = False
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name: str, seconds: float) -> None:
+        query_phase_seconds.labels(name, self.fingerprint).observe(seconds)
+
+    def finish(self, status: int, rows: Optional[int] = None) -> None:
+        """リクエスト数を数え、リスナーを呼ぶ（2回目以降の呼び出しは無視する）
+
+        リスナーの例外はログに記録するのみとし、リクエストの結果には影響させない。
+        """
+        if self._finished:
+            return
+        self._finished = True
+        query_requests_total.labels(self.endpoint, self.fingerprint, str(status)).inc()
+        if rows is not None:
+            query_rows.labels(self.fingerprint).observe(rows)
+        for listener in _finish_listeners:
+            try:
+                listener(self, status, rows)
+            except Exception as e:
+                logger.error(f"Query finish listener {getattr(listener, '__qualname__', listener)} failed: {e}")
+
+
+class _StatsCollector:
+    """stats()が返す辞書をスクレイプ時にメトリクスへ変換する
+
+    キーが _total で終わる値はカウンタ、それ以外の数値はゲージとして公開する。
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def add(self, name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+        self._sources[name] = stats
+
+    def collect(self):
+        for name, stats in list(self._sources.items()):
+            try:
+                values = stats()
+            except Exception:
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if not isinstance(value, (int, float)):
+                    continue
+                metric = f"api_{name}_{key}"
+                if key.endswith("_total"):
+                    family = CounterMetricFamily(metric[:-len("_total")], f"{name} {key}")
+                else:
+                    family = GaugeMetricFamily(metric, f"{name} {key}")
+                family.add_metric([], value)
+                yield family
+
+
+_stats_collector = _StatsCollector()
+REGISTRY.register(_stats_collector)
+
+
+def register_stats(name: str, stats: Callable[[], Dict[str, Any]]) -> None:
+    """stats()を返すオブジェクト（接続プール・キャッシュ等）をメトリクスに加える"""
+    _stats_collector.add(name, stats)
+
+
+def render_latest():
+    """/metrics のレスポンス本文とContent-Type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,107 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""キーセット（カーソル）方式のページング
+
+クエリを外側のSELECTで包み、ソートキーの行値比較 (k1, k2) > (v1, v2) と LIMIT で1ページ分を取得する。
+OFFSETのように読み飛ばす行を毎回スキャンしないため、後ろのページでもインデックスの範囲走査で済む。
+続きのページは、最後の行のソートキーを符号化した継続トークン（next_cursor）で要求する。
+"""
+
+import base64
+import hashlib
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+from query_engine import QueryResult
+from result_cache import make_cache_key
+from sql_validator import as_subquery
+
+# ソートキーに指定できるカラム名（結果のカラム名・別名）
+_COLUMN_NAME_RE = re.compile(r"[^\W\d]\w*")
+
+
+class PaginationError(Exception):
+    """ページング指定の誤り"""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def _quote(name: str) -> str:
+    if not _COLUMN_NAME_RE.fullmatch(name):
+        raise PaginationError(f"Invalid sort key column: {name}")
+    return f'"{name}"'
+
+
+def query_fingerprint(query: str, params: Optional[List[Any]], order_by: List[str],
+                      descending: bool) -> str:
+    """継続トークンを発行したクエリの識別子（別のクエリへのトークン流用を防ぐ）"""
+    source = make_cache_key(query, params) + "\x00" + json.dumps([order_by, descending], ensure_ascii=False)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(fingerprint: str, values: List[Any]) -> str:
+    payload = json.dumps({"f": fingerprint, "k": values}, ensure_ascii=False, default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, fingerprint: str, key_count: int) -> List[Any]:
+    """継続トークンから最後の行のソートキーを取り出す"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["k"]
+        issued_for = payload["f"]
+    except (ValueError, TypeError, KeyError):
+        raise PaginationError("Invalid cursor")
+    if issued_for != fingerprint:
+        raise PaginationError("Cursor does not belong to this query")
+    if not isinstance(values, list) or len(values) != key_count:
+        raise PaginationError("Invalid cursor")
+    return values
+
+
+def build_page_query(query: str, params: Optional[List[Any]], order_by: List[str],
+                     descending: bool, page_size: int,
+                     cursor: Optional[str]) -> Tuple[str, Optional[List[Any]]]:
+    """1ページ分を取得するクエリとパラメータを組み立てる
+
+    ソートキーは一意かつNULLを含まないこと（主キーを最後に含めるのが確実）。
+    """
+    if not order_by:
+        raise PaginationError("order_by is required for pagination")
+    columns = [_quote(name) for name in order_by]
+    keys = ", ".join(columns)
+    direction = " DESC" if descending else ""
+    inner = as_subquery(query)
+    page_params = list(params or [])
+    if cursor is not None and params is None:
+        # パラメータなしのクエリは%を書式として解釈されていないため、キーを渡す前にエスケープする
+        inner = inner.replace("%", "%%")
+    sql = f"SELECT * FROM ({inner}) AS _page"
+    if cursor is not None:
+        fingerprint = query_fingerprint(query, params, order_by, descending)
+        page_params += decode_cursor(cursor, fingerprint, len(order_by))
+        placeholders = ", ".join(["%s"] * len(order_by))
+        sql += f" WHERE ({keys}) {'<' if descending else '>'} ({placeholders})"
+    sql += " ORDER BY " + ", ".join(column + direction for column in columns)
+    # 次ページの有無を判定するため1行多く取得する
+    sql += f" LIMIT {page_size + 1}"
+    return sql, (page_params if params is not None or cursor is not None else None)
+
+
+def next_cursor(result: QueryResult, query: str, params: Optional[List[Any]],
+                order_by: List[str], descending: bool) -> Optional[str]:
+    """続きがある場合、最後の行のソートキーから継続トークンを作る"""
+    if not result.truncated or not result.rows:
+        return None
+    last = result.rows[-1]
+    try:
+        values = [last[result.columns.index(name)] for name in order_by]
+    except ValueError:
+        raise PaginationError("Sort key column is not in the result")
+    return encode_cursor(query_fingerprint(query, params, order_by, descending), values)
@@ -0,0 +1,188 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""EXPLAINの見積もりによる実行前の受付判定
+
+クエリを実行する前にプランナの見積もり（総コスト・行数）を確認し、
+- QUERY_ADMISSION_MAX_COST / QUERY_ADMISSION_MAX_ROWS を超えるクエリは実行せずに拒否する
+- QUERY_ADMISSION_HEAVY_COST を超えるクエリは同時実行数を絞った専用の枠で順番を待たせる
+ことで、30秒の実行時間の上限に達するようなクエリが他のクエリの接続を奪わないようにする。
+
+見積もりはクエリとパラメータ（結果キャッシュと同じキー）ごとにキャッシュし、同じクエリでは
+EXPLAINを繰り返さない。リテラルやパラメータが違えば見積もりも変わる（LIMIT 1 と LIMIT 100000000 等）ため、
+雛形が同じでも別に見積もる。統計情報が変わるマイグレーションの適用時にはキャッシュを破棄する。
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from result_cache import make_cache_key
+from sql_validator import check_bindable, is_metadata_query
+
+QUERY_ADMISSION_ENABLED = os.getenv("QUERY_ADMISSION_ENABLED", "true").lower() == "true"
+# これを超える見積もりコストのクエリは拒否する（0で無制限）
+QUERY_ADMISSION_MAX_COST = float(os.getenv("QUERY_ADMISSION_MAX_COST", "5000000"))
+# これを超える見積もり行数のクエリは拒否する（0で無制限）
+QUERY_ADMISSION_MAX_ROWS = float(os.getenv("QUERY_ADMISSION_MAX_ROWS", "5000000"))
+# これを超える見積もりコストのクエリは重いクエリの枠で実行する（0で枠を使わない）
+QUERY_ADMISSION_HEAVY_COST = float(os.getenv("QUERY_ADMISSION_HEAVY_COST", "500000"))
+# 重いクエリの同時実行数
+QUERY_ADMISSION_HEAVY_CONCURRENCY = int(os.getenv("QUERY_ADMISSION_HEAVY_CONCURRENCY", "2"))
+# 重いクエリの枠が空くのを待つ上限（秒）
+QUERY_ADMISSION_QUEUE_TIMEOUT = float(os.getenv("QUERY_ADMISSION_QUEUE_TIMEOUT", "10"))
+# 見積もりを保持するクエリの数（LRU）
+QUERY_ADMISSION_CACHE_SIZE = int(os.getenv("QUERY_ADMISSION_CACHE_SIZE", "1000"))
+
+
+class QueryRejected(Exception):
+    """見積もりが上限を超えたため実行しないクエリ（理由をdetailに含める）"""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+class HeavyQueueTimeout(Exception):
+    """重いクエリの枠が空かなかった"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Too many expensive queries are running; retry later")
+        self.detail = str(self)
+        self.retry_after = retry_after
+
+
+@dataclass
+class PlanEstimate:
+    cost: float
+    rows: float
+
+
+def explain(conn, query: str, params: Optional[List[Any]]) -> PlanEstimate:
+    """EXPLAIN (FORMAT JSON) の最上位ノードから見積もりを取得する（実行はしない）"""
+    check_bindable(query, params)
+    with conn.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+        plan = cursor.fetchone()[0][0]["Plan"]
+    return PlanEstimate(cost=float(plan["Total Cost"]), rows=float(plan["Plan Rows"]))
+
+
+class QueryAdmission:
+    """見積もりのキャッシュ・上限の判定・重いクエリの枠"""
+
+    def __init__(self, max_cost: float = QUERY_ADMISSION_MAX_COST,
+                 max_rows: float = QUERY_ADMISSION_MAX_ROWS,
+                 heavy_cost: float = QUERY_ADMISSION_HEAVY_COST,
+                 heavy_concurrency: int = QUERY_ADMISSION_HEAVY_CONCURRENCY,
+                 queue_timeout: float = QUERY_ADMISSION_QUEUE_TIMEOUT,
+                 cache_size: int = QUERY_ADMISSION_CACHE_SIZE):
+        self.max_cost = max_cost
+        self.max_rows = max_rows
+        self.heavy_cost = heavy_cost
+        self.queue_timeout = queue_timeout
+        self.cache_size = cache_size
+        self._heavy = asyncio.Semaphore(heavy_concurrency)
+        self._estimates: "OrderedDict[str, PlanEstimate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._explains = 0
+        self._hits = 0
+        self._rejected = 0
+        self._queued = 0
+        self._queue_timeouts = 0
+        self._heavy_running = 0
+
+    @staticmethod
+    def applies_to(query: str) -> bool:
+        """受付判定の対象か（メタデータクエリは常に軽いため対象外）"""
+        return not is_metadata_query(query)
+
+    def cached(self, query: str, params: Optional[List[Any]]) -> Optional[PlanEstimate]:
+        key = make_cache_key(query, params)
+        with self._lock:
+            estimate = self._estimates.get(key)
+            if estimate is not None:
+                self._estimates.move_to_end(key)
+                self._hits += 1
+            return estimate
+
+    def estimate(self, conn, query: str, params: Optional[List[Any]]) -> PlanEstimate:
+        """EXPLAINで見積もり、クエリとパラメータごとに保持する（エグゼキュータ上で呼ばれる）"""
+        estimate = explain(conn, query, params)
+        with self._lock:
+            self._explains += 1
+            self._estimates[make_cache_key(query, params)] = estimate
+            while len(self._estimates) > self.cache_size:
+                self._estimates.popitem(last=False)
+        return estimate
+
+    def is_heavy(self, estimate: PlanEstimate) -> bool:
+        return 0 < self.heavy_cost < estimate.cost
+
+    def check(self, estimate: PlanEstimate) -> None:
+        """見積もりが上限を超えていればQueryRejectedを送出する"""
+        reason = None
+        if self.max_cost and estimate.cost > self.max_cost:
+            reason = f"estimated cost {estimate.cost:.0f} exceeds the limit {self.max_cost:.0f}"
+        elif self.max_rows and estimate.rows > self.max_rows:
+            reason = f"estimated rows {estimate.rows:.0f} exceeds the limit {self.max_rows:.0f}"
+        if reason is None:
+            return
+        with self._lock:
+            self._rejected += 1
+        raise QueryRejected(
+            f"Query refused before execution: {reason}. "
+            "Narrow the query with selective WHERE conditions or avoid unbounded joins."
+        )
+
+    @contextlib.asynccontextmanager
+    async def slot(self, heavy: bool):
+        """重いクエリは専用の枠が空くまで待ってから実行する（空かない場合はHeavyQueueTimeout）"""
+        if not heavy:
+            yield
+            return
+        with self._lock:
+            self._queued += 1
+        try:
+            await asyncio.wait_for(self._heavy.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._queue_timeouts += 1
+            raise HeavyQueueTimeout(self.queue_timeout)
+        with self._lock:
+            self._heavy_running += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._heavy_running -= 1
+            self._heavy.release()
+
+    def on_data_version_change(self, old: Optional[str], new: str) -> None:
+        """DataVersionTrackerのリスナー。統計情報が変わるため見積もりを破棄する"""
+        if old is not None:
+            with self._lock:
+                self._estimates.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "estimates": len(self._estimates),
+                "explains_total": self._explains,
+                "estimate_cache_hits_total": self._hits,
+                "rejected_total": self._rejected,
+                "heavy_queued_total": self._queued,
+                "heavy_queue_timeouts_total": self._queue_timeouts,
+                "heavy_running": self._heavy_running,
+            }
+
+
+def create_admission_from_env() -> Optional[QueryAdmission]:
+    """環境変数の設定で受付判定を生成する（無効の場合はNone）"""
+    if not QUERY_ADMISSION_ENABLED:
+        return None
+    return QueryAdmission()
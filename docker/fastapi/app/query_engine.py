@@ -0,0 +1,61 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""クエリ実行エンジン
+
+APIが約束する制限（実行時間30秒・最大1000行）をサーバ側で強制する。
+- 実行時間: 接続ごとの statement_timeout（プール接続時に設定）
+- 行数: サーバサイドカーソルから上限+1行だけFETCHし、超過分はDBから転送しない
+"""
+
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from sql_validator import check_bindable
+
+# クエリ実行の最大時間（ミリ秒）
+QUERY_TIMEOUT_MS = int(os.getenv("QUERY_TIMEOUT_MS", "30000"))
+# 1回のクエリで返却される最大行数
+QUERY_MAX_ROWS = int(os.getenv("QUERY_MAX_ROWS", "1000"))
+
+
+@dataclass
+class QueryResult:
+    rows: List[Any]
+    truncated: bool
+    # 結果のカラム名（cursor.descriptionの順）
+    columns: List[str] = field(default_factory=list)
+    # 最新のデータバージョンの接続先で得た結果か（遅れているレプリカの結果はFalse）
+    current: bool = True
+    # カーソルでの実行・取得にかかった時間（秒。レート制限のコストに使う）
+    db_time: float = 0.0
+
+
+def column_names(cursor) -> List[str]:
+    return [col.name for col in cursor.description or []]
+
+
+def session_options(timeout_ms: int = QUERY_TIMEOUT_MS) -> str:
+    """接続時に渡すセッション設定（libpqのoptions）"""
+    return f"-c statement_timeout={timeout_ms}"
+
+
+def run_select(conn, query: str, params: Optional[List[Any]] = None,
+               max_rows: int = QUERY_MAX_ROWS) -> QueryResult:
+    """サーバサイドカーソルでクエリを実行し、最大max_rows行を返す
+
+    上限を超える行が存在した場合は truncated=True を返す。
+    """
+    check_bindable(query, params)
+    # 名前付きカーソル（DECLARE ... CURSOR）はトランザクション内でのみ有効
+    with conn.cursor(name=f"q_{uuid.uuid4().hex}") as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchmany(max_rows + 1)
+        columns = column_names(cursor)
+    truncated = len(rows) > max_rows
+    if truncated:
+        rows = rows[:max_rows]
+    return QueryResult(rows=rows, truncated=truncated, columns=columns)
@@ -0,0 +1,20 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""よく使用されるクエリの例（/examples で提供し、検証器のコーパスとしても使用する）"""
+
+QUERY_EXAMPLES = [
+    {
+        "name": "特定の教員の授業一覧",
+        "query": "SELECT s.syllabus_id, sn.name AS 科目名, s.term AS 学期 FROM syllabus s JOIN syllabus_instructor si ON s.syllabus_id = si.syllabus_id JOIN instructor i ON si.instructor_id = i.instructor_id JOIN subject_name sn ON s.subject_name_id = sn.subject_name_id WHERE i.name = %s ORDER BY s.syllabus_id;",
+        "params": ["藤原 和将"],
+        "description": "指定された教員が担当する授業の一覧を取得"
+    },
+    {
+        "name": "特定の学部の授業一覧",
+        "query": "SELECT s.syllabus_id, sn.name AS 科目名, f.faculty_name AS 学部名 FROM syllabus s JOIN subject sub ON s.subject_name_id = sub.subject_name_id JOIN faculty f ON sub.faculty_id = f.faculty_id JOIN subject_name sn ON s.subject_name_id = sn.subject_name_id WHERE f.faculty_name = %s ORDER BY s.syllabus_id;",
+        "params": ["理工学部"],
+        "description": "指定された学部の授業一覧を取得"
+    }
+]
@@ -0,0 +1,113 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""大きなクエリ結果のストリーミング出力（NDJSON / CSV）
+
+結果全体をメモリに載せてpydanticで検証する通常のレスポンスに代わり、
+サーバサイドカーソルからバッチ単位で行を読み、そのままソケットへ書き出す。
+形式は Accept ヘッダ（application/x-ndjson または text/csv）で選択する。
+"""
+
+import csv
+import io
+import os
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Sequence
+
+from fast_json import dumps_lines
+from query_engine import column_names
+from sql_validator import check_bindable
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+
+# 1回のFETCHで読み込む行数
+STREAM_BATCH_SIZE = int(os.getenv("QUERY_STREAM_BATCH_SIZE", "500"))
+# ストリーミング時の最大行数（0で無制限）
+STREAM_MAX_ROWS = int(os.getenv("QUERY_STREAM_MAX_ROWS", "100000"))
+
+# ジェネレータの終端を表す番兵
+_END = object()
+
+
+def negotiate_stream_format(accept: Optional[str]) -> Optional[str]:
+    """Acceptヘッダからストリーミング形式を決める。該当しなければNone"""
+    if not accept:
+        return None
+    for part in accept.split(","):
+        media_type = part.split(";")[0].strip().lower()
+        if media_type in (NDJSON_MEDIA_TYPE, CSV_MEDIA_TYPE):
+            return media_type
+    return None
+
+
+def _encode_ndjson(rows: Sequence[Sequence[Any]]) -> bytes:
+    return dumps_lines(rows)
+
+
+def _encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_query(pool, query: str, params: Optional[List[Any]], media_type: str,
+                 batch_size: int = STREAM_BATCH_SIZE,
+                 max_rows: int = STREAM_MAX_ROWS,
+                 on_db_time: Optional[Callable[[float], None]] = None) -> Iterator[bytes]:
+    """クエリ結果をエンコード済みのバッチとして順に返すジェネレータ
+
+    接続はジェネレータが閉じられるまで保持される。on_db_timeにはカーソルの実行・取得に
+    かかった時間（秒）を都度渡す（送信の待ち時間は含まない）。
+    """
+    check_bindable(query, params)
+    encode = _encode_ndjson if media_type == NDJSON_MEDIA_TYPE else _encode_csv
+    with pool.connection() as conn:
+        with conn.cursor(name=f"s_{uuid.uuid4().hex}") as cursor:
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            if on_db_time is not None:
+                on_db_time(time.perf_counter() - start)
+            sent = 0
+            header_sent = media_type != CSV_MEDIA_TYPE
+            while True:
+                size = batch_size if not max_rows else min(batch_size, max_rows - sent)
+                start = time.perf_counter()
+                rows = cursor.fetchmany(size) if size > 0 else []
+                if on_db_time is not None:
+                    on_db_time(time.perf_counter() - start)
+                if not header_sent:
+                    # 名前付きカーソルの列情報は最初のFETCH後に確定する
+                    yield _encode_csv([column_names(cursor)])
+                    header_sent = True
+                if not rows:
+                    return
+                sent += len(rows)
+                yield encode(rows)
+
+
+async def iterate_in_executor(executor, chunks: Iterator[bytes],
+                              first: Optional[bytes] = None,
+                              on_close: Optional[Callable[[], None]] = None) -> AsyncIterator[bytes]:
+    """同期ジェネレータをDBエグゼキュータ上で1バッチずつ進める
+
+    クライアントが切断した場合もジェネレータを閉じ、接続をプールに返却する。
+    on_closeは送信の終了時（切断・エラーを含む）に呼ばれる。
+    """
+    try:
+        if first is not None:
+            yield first
+        while True:
+            chunk = await executor.run(next, chunks, _END)
+            if chunk is _END:
+                return
+            yield chunk
+    finally:
+        try:
+            await executor.run(chunks.close)
+        finally:
+            if on_close is not None:
+                on_close()
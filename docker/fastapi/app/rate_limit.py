@@ -0,0 +1,346 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""クライアントごとの同時実行数制限とトークンバケットによるレート制限
+
+重いJSONBクエリを並列に送る1クライアントがDB接続を使い切らないよう、
+/query・/query/batch・/courses 等の固定クエリの実行前にクライアント（IPアドレスまたはRATE_LIMIT_KEY_HEADER）ごとに
+- 同時実行数が RATE_LIMIT_MAX_CONCURRENCY に達していないか
+- トークンバケットの残量があるか
+を確認し、超過した場合は RateLimitExceeded（429・Retry-After）とする。
+
+トークンの単位は「DBの実行時間（秒）」で、1秒あたり RATE_LIMIT_RATE 回復し、
+RATE_LIMIT_BURST まで貯まる。実行前に RATE_LIMIT_MIN_COST を差し引き、
+実行後にカーソルでの実行・取得にかかった時間との差を差し引くため、重いクエリほど多く消費する
+（残量は負になり得る）。接続の待ち時間やレスポンスの送信時間、キャッシュから返した結果は含めない。
+
+既定では無効。nginx等のリバースプロキシの背後ではクライアントのIPアドレスがすべてプロキシのものになるため、
+有効にする場合は RATE_LIMIT_TRUSTED_PROXIES にプロキシのアドレスを指定し、X-Forwarded-For から
+クライアントのアドレスを求める（または RATE_LIMIT_KEY_HEADER を使う）。
+
+状態はプロセス内に持つ。uvicornの複数ワーカーで上限を共有する場合は RATE_LIMIT_REDIS_URL に
+Redis互換のサーバを指定する（redis パッケージが必要）。Redisに接続できない場合は制限せずに通す。
+"""
+
+import hashlib
+import ipaddress
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis未導入の環境ではプロセス内の状態のみ
+    aioredis = None
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+# クライアントごとの同時実行数の上限（0で無制限）
+RATE_LIMIT_MAX_CONCURRENCY = int(os.getenv("RATE_LIMIT_MAX_CONCURRENCY", "8"))
+# 1秒あたりに回復するトークン（DB実行時間の秒数）
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "2.0"))
+# トークンの上限（短時間に集中して使えるDB実行時間の秒数）
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "60"))
+# 実行前に差し引く1リクエストあたりの最小コスト（秒）
+RATE_LIMIT_MIN_COST = float(os.getenv("RATE_LIMIT_MIN_COST", "0.01"))
+# クライアントの識別に使うヘッダ（認証済みのキーを付与するゲートウェイの背後で使う。空の場合はIPアドレス）
+RATE_LIMIT_KEY_HEADER = os.getenv("RATE_LIMIT_KEY_HEADER", "")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+# X-Forwarded-For を信頼するプロキシのアドレス（カンマ区切り。CIDR表記可。空の場合は接続元のアドレスを使う）
+RATE_LIMIT_TRUSTED_PROXIES = os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "")
+
+# 判定結果
+_ALLOWED = "allowed"
+_CONCURRENCY = "concurrency"
+_RATE = "rate"
+
+
+class RateLimitExceeded(Exception):
+    """同時実行数またはレートの上限を超えた（429で返す）"""
+
+    def __init__(self, reason: str, retry_after: float):
+        self.reason = reason
+        self.retry_after = retry_after
+        if reason == _CONCURRENCY:
+            detail = "Too many concurrent queries from this client"
+        else:
+            detail = "Query rate limit exceeded for this client"
+        super().__init__(detail)
+        self.detail = detail
+
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class MemoryBackend:
+    """プロセス内の状態（uvicornのワーカーごとに独立）"""
+
+    # この数を超えたら、満タンかつ実行中のないクライアントの状態を破棄する
+    MAX_IDLE_CLIENTS = 10000
+
+    def __init__(self):
+        # クライアント -> [トークン残量, 最終更新時刻, 実行中の数]
+        self._state: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, key: str, now: float, rate: float, burst: float) -> list:
+        state = self._state.get(key)
+        if state is None:
+            state = self._state[key] = [burst, now, 0]
+        else:
+            state[0] = min(burst, state[0] + max(0.0, now - state[1]) * rate)
+            state[1] = now
+        return state
+
+    async def acquire(self, key: str, now: float, rate: float, burst: float, cost: float,
+                      max_concurrency: int) -> Tuple[str, float]:
+        with self._lock:
+            if len(self._state) > self.MAX_IDLE_CLIENTS:
+                self._prune(now, rate, burst)
+            state = self._refill(key, now, rate, burst)
+            if max_concurrency and state[2] >= max_concurrency:
+                return _CONCURRENCY, 1.0
+            if state[0] < cost:
+                return _RATE, (cost - state[0]) / rate
+            state[0] -= cost
+            state[2] += 1
+            return _ALLOWED, 0.0
+
+    async def release(self, key: str, now: float, rate: float, burst: float, extra_cost: float) -> None:
+        with self._lock:
+            state = self._refill(key, now, rate, burst)
+            state[0] -= extra_cost
+            state[2] = max(0, state[2] - 1)
+
+    def clients(self) -> int:
+        return len(self._state)
+
+    def _prune(self, now: float, rate: float, burst: float) -> None:
+        for key in [
+            key for key, (tokens, updated, in_flight) in self._state.items()
+            if in_flight == 0 and tokens + (now - updated) * rate >= burst
+        ]:
+            del self._state[key]
+
+
+# 判定と更新を1往復で原子的に行うLuaスクリプト（状態はハッシュ tokens / ts / inflight）
+_ACQUIRE_SCRIPT = """
+local now, rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local cost, max_concurrency, ttl = tonumber(ARGV[4]), tonumber(ARGV[5]), tonumber(ARGV[6])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'inflight')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+local inflight = tonumber(state[3]) or 0
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local result = {'allowed', '0'}
+if max_concurrency > 0 and inflight >= max_concurrency then
+    result = {'concurrency', '1'}
+elseif tokens < cost then
+    result = {'rate', tostring((cost - tokens) / rate)}
+else
+    tokens = tokens - cost
+    inflight = inflight + 1
+end
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now), 'inflight', inflight)
+redis.call('EXPIRE', KEYS[1], ttl)
+return result
+"""
+
+_RELEASE_SCRIPT = """
+local now, rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local extra_cost, ttl = tonumber(ARGV[4]), tonumber(ARGV[5])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'inflight')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+local inflight = tonumber(state[3]) or 1
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate) - extra_cost
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now), 'inflight', math.max(0, inflight - 1))
+redis.call('EXPIRE', KEYS[1], ttl)
+return 1
+"""
+
+
+class RedisBackend:
+    """Redis互換サーバ上の状態（全ワーカーで共有）
+
+    実行中の数はプロセスが異常終了すると減らないため、キーにTTLを付け、
+    アクセスのないクライアントの状態はTTL経過後に消える。
+    """
+
+    KEY_PREFIX = "syllabus_api:ratelimit:"
+
+    def __init__(self, url: str, ttl: int):
+        self._client = aioredis.from_url(url)
+        self._acquire = self._client.register_script(_ACQUIRE_SCRIPT)
+        self._release = self._client.register_script(_RELEASE_SCRIPT)
+        self._ttl = ttl
+
+    async def acquire(self, key: str, now: float, rate: float, burst: float, cost: float,
+                      max_concurrency: int) -> Tuple[str, float]:
+        decision, retry_after = await self._acquire(
+            keys=[self.KEY_PREFIX + key], args=[now, rate, burst, cost, max_concurrency, self._ttl]
+        )
+        return decision.decode(), float(retry_after)
+
+    async def release(self, key: str, now: float, rate: float, burst: float, extra_cost: float) -> None:
+        await self._release(keys=[self.KEY_PREFIX + key], args=[now, rate, burst, extra_cost, self._ttl])
+
+    def clients(self) -> Optional[int]:
+        # 全ワーカーの合計はRedis側でしか分からないため返さない
+        return None
+
+
+class Lease:
+    """許可された1リクエスト分の枠。release()でDBの実行時間に応じたコストを差し引いて返却する"""
+
+    def __init__(self, limiter: Optional["RateLimiter"], key: str):
+        self._limiter = limiter
+        self._key = key
+        self._db_time = 0.0
+        self._released = False
+
+    def charge(self, seconds: float) -> None:
+        """カーソルでの実行・取得にかかった時間を加算する"""
+        self._db_time += seconds
+
+    @property
+    def db_time(self) -> float:
+        return self._db_time
+
+    async def release(self) -> None:
+        if self._released or self._limiter is None:
+            return
+        self._released = True
+        await self._limiter._release(self._key, self._db_time)
+
+
+class RateLimiter:
+    """クライアントごとの同時実行数とトークンバケットの残量を確認する"""
+
+    def __init__(self, backend, max_concurrency: int = RATE_LIMIT_MAX_CONCURRENCY,
+                 rate: float = RATE_LIMIT_RATE, burst: float = RATE_LIMIT_BURST,
+                 min_cost: float = RATE_LIMIT_MIN_COST):
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.min_cost = min_cost
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = {_CONCURRENCY: 0, _RATE: 0}
+        self._backend_errors = 0
+
+    async def acquire(self, key: str) -> Lease:
+        """枠を確保する。上限を超えている場合はRateLimitExceededを送出する"""
+        try:
+            decision, retry_after = await self.backend.acquire(
+                key, time.time(), self.rate, self.burst, self.min_cost, self.max_concurrency
+            )
+        except Exception as e:
+            # 状態の保存先の障害でAPI全体を止めないよう、制限せずに通す
+            logger.warning(f"Rate limiter backend failed, allowing request: {e}")
+            with self._lock:
+                self._backend_errors += 1
+            return Lease(None, key)
+        with self._lock:
+            if decision == _ALLOWED:
+                self._allowed += 1
+            else:
+                self._rejected[decision] += 1
+        if decision != _ALLOWED:
+            raise RateLimitExceeded(decision, retry_after)
+        return Lease(self, key)
+
+    async def _release(self, key: str, db_time: float) -> None:
+        try:
+            await self.backend.release(
+                key, time.time(), self.rate, self.burst, max(0.0, db_time - self.min_cost)
+            )
+        except Exception as e:
+            logger.warning(f"Rate limiter backend failed on release: {e}")
+            with self._lock:
+                self._backend_errors += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "allowed_total": self._allowed,
+                "rejected_concurrency_total": self._rejected[_CONCURRENCY],
+                "rejected_rate_total": self._rejected[_RATE],
+                "backend_errors_total": self._backend_errors,
+                "clients": self.backend.clients(),
+            }
+
+
+def _parse_networks(value: str) -> Tuple[Any, ...]:
+    networks = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(item, strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid RATE_LIMIT_TRUSTED_PROXIES entry: {item}")
+    return tuple(networks)
+
+
+_TRUSTED_PROXIES = _parse_networks(RATE_LIMIT_TRUSTED_PROXIES)
+
+
+def _is_trusted(address: Optional[str], trusted: Tuple[Any, ...]) -> bool:
+    if not address:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+
+def client_address(headers, peer: Optional[str], trusted: Optional[Tuple[Any, ...]] = None) -> Optional[str]:
+    """クライアントのIPアドレス
+
+    接続元が信頼するプロキシの場合は X-Forwarded-For を右から辿り、信頼するプロキシ以外の
+    最初のアドレスを返す（クライアントが付けた左側の値は偽装できるため使わない）。
+    """
+    trusted = _TRUSTED_PROXIES if trusted is None else trusted
+    if not trusted or not _is_trusted(peer, trusted):
+        return peer
+    # 複数のX-Forwarded-Forヘッダは順に連結したものとして扱う
+    forwarded = [
+        item.strip() for header in headers.getlist("x-forwarded-for") for item in header.split(",")
+    ]
+    for address in reversed([item for item in forwarded if item]):
+        if not _is_trusted(address, trusted):
+            return address
+    return peer
+
+
+def client_key(headers, client_host: Optional[str]) -> str:
+    """レート制限の単位となるクライアントの識別子"""
+    if RATE_LIMIT_KEY_HEADER:
+        value = headers.get(RATE_LIMIT_KEY_HEADER)
+        if value:
+            # キーそのものはRedisのキー名やメモリに残さない
+            return "key:" + hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+    return f"ip:{client_host or 'unknown'}"
+
+
+def create_rate_limiter_from_env() -> Optional[RateLimiter]:
+    """環境変数の設定でレート制限を生成する（無効の場合はNone）"""
+    if not RATE_LIMIT_ENABLED:
+        return None
+    backend = MemoryBackend()
+    if RATE_LIMIT_REDIS_URL:
+        if aioredis is None:
+            logger.warning("RATE_LIMIT_REDIS_URL is set but the redis package is not installed; using in-process state")
+        else:
+            # バケットが空から満タンに戻るまでの時間の2倍でアクセスのない状態を消す
+            ttl = max(60, int(2 * RATE_LIMIT_BURST / RATE_LIMIT_RATE))
+            backend = RedisBackend(RATE_LIMIT_REDIS_URL, ttl)
+    return RateLimiter(backend)
@@ -0,0 +1,180 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""読み取りレプリカへのルーティング
+
+/query の読み取りを DATABASE_REPLICA_URLS のレプリカへ重み付きラウンドロビンで振り分け、
+マイグレーション（deploy-migration.sh）が書き込むプライマリと読み取りが競合しないようにする。
+- バックグラウンドで各接続先の死活・レプリケーション遅延・データバージョンを確認する
+- 応答しない、または遅延が REPLICA_MAX_LAG を超えたレプリカには振り分けない
+- 接続エラーが続いたレプリカは重みを下げ、REPLICA_MAX_FAILURES 回で除外する
+- min_data_version を指定したクエリは、そのマイグレーションが適用済みのレプリカにのみ振り分ける
+- 振り分け先がない場合はプライマリで実行する（プライマリは常に最新のため条件を満たす）
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from data_version import fetch_data_version, version_at_least
+
+# 死活・遅延を確認する間隔（秒）
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+# 許容するレプリケーション遅延（秒、0で無制限）
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", "30"))
+# この回数連続で接続エラーになったレプリカは次の確認まで除外する
+REPLICA_MAX_FAILURES = int(os.getenv("REPLICA_MAX_FAILURES", "3"))
+
+# レプリケーション遅延（秒）。WALをすべて適用済みの場合やプライマリでは0
+_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class Backend:
+    """振り分け先（プライマリまたはレプリカ）1つ分の状態"""
+
+    def __init__(self, name: str, pool, weight: float = 1.0, primary: bool = False):
+        self.name = name
+        self.pool = pool
+        self.weight = weight
+        self.primary = primary
+        # プライマリは確認前から利用可能とし、レプリカは最初の確認に成功してから振り分ける
+        self.healthy = primary
+        self.lag: Optional[float] = None
+        self.data_version: Optional[str] = None
+        self.failures = 0
+        self.routed = 0
+        self._current_weight = 0.0
+
+    def effective_weight(self) -> float:
+        """接続エラーが続くほど重みを下げる"""
+        return self.weight / (1 + self.failures) if self.healthy else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "primary": self.primary,
+            "healthy": self.healthy,
+            "lag": self.lag,
+            "data_version": self.data_version,
+            "failures": self.failures,
+            "effective_weight": self.effective_weight(),
+            "routed_total": self.routed,
+        }
+
+
+class ReplicaRouter:
+    """健全性で重み付けしたラウンドロビンで読み取りの接続先を選ぶ"""
+
+    def __init__(self, primary_pool, replica_pools: List[Tuple[str, Any]],
+                 interval: float = REPLICA_HEALTH_INTERVAL, max_lag: float = REPLICA_MAX_LAG,
+                 max_failures: int = REPLICA_MAX_FAILURES):
+        self.primary = Backend("primary", primary_pool, primary=True)
+        self.replicas = [Backend(name, pool) for name, pool in replica_pools]
+        self.interval = interval
+        self.max_lag = max_lag
+        self.max_failures = max_failures
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fallbacks = 0
+
+    def choose(self, min_data_version: Optional[str] = None) -> Backend:
+        """クエリを実行する接続先を選ぶ"""
+        if not self.replicas:
+            return self.primary
+        with self._lock:
+            candidates = [
+                backend for backend in self.replicas
+                if backend.effective_weight() > 0
+                and (not self.max_lag or (backend.lag or 0.0) <= self.max_lag)
+                and (min_data_version is None or version_at_least(backend.data_version, min_data_version))
+            ]
+            if not candidates:
+                self._fallbacks += 1
+                self.primary.routed += 1
+                return self.primary
+            # smooth weighted round-robin（重みに比例しつつ、同じ接続先が連続しにくい）
+            total = 0.0
+            for backend in candidates:
+                weight = backend.effective_weight()
+                backend._current_weight += weight
+                total += weight
+            chosen = max(candidates, key=lambda backend: backend._current_weight)
+            chosen._current_weight -= total
+            chosen.routed += 1
+            return chosen
+
+    def report_failure(self, backend: Backend) -> None:
+        """実行時の接続エラーを記録し、続く場合は次の確認まで除外する"""
+        if backend.primary:
+            return
+        with self._lock:
+            backend.failures += 1
+            if backend.failures >= self.max_failures and backend.healthy:
+                backend.healthy = False
+                logger.warning(f"Replica '{backend.name}' excluded after {backend.failures} failures")
+
+    # ---------- 死活・遅延の確認 ----------
+
+    def check(self, backend: Backend) -> None:
+        try:
+            with backend.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(_LAG_QUERY)
+                    lag = float(cursor.fetchone()[0])
+                version = fetch_data_version(conn)
+        except Exception as e:
+            with self._lock:
+                if backend.healthy and not backend.primary:
+                    logger.warning(f"Replica '{backend.name}' health check failed: {e}")
+                    backend.healthy = False
+            return
+        with self._lock:
+            if not backend.healthy:
+                logger.info(f"Replica '{backend.name}' is healthy (lag={lag:.1f}s, version={version})")
+            backend.healthy = True
+            backend.failures = 0
+            backend.lag = lag
+            backend.data_version = version
+
+    def check_all(self) -> None:
+        for backend in [self.primary] + self.replicas:
+            self.check(backend)
+
+    def start(self) -> None:
+        """レプリカのプールを開き、確認を始める（レプリカがない場合は何もしない）"""
+        if not self.replicas:
+            return
+        for backend in self.replicas:
+            backend.pool.open()
+        self.check_all()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for backend in self.replicas:
+            backend.pool.close()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "replicas": len(self.replicas),
+                "healthy_replicas": sum(1 for backend in self.replicas if backend.healthy),
+                "primary_fallbacks_total": self._fallbacks,
+                "backends": [backend.snapshot() for backend in [self.primary] + self.replicas],
+            }
@@ -0,0 +1,163 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""読み取りクエリの結果キャッシュ
+
+正規化したクエリ文字列とパラメータをキーに、プロセス内でクエリ結果を保持する。
+- LRU方式で、合計サイズ（バイト）の上限を超えたら古いものから追い出す
+- TTLを超えたエントリは破棄する
+- データバージョン（マイグレーション）が変わった時点で全件破棄する
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from sql_validator import tokenize
+
+# 結果が実行時刻などで変わる関数を含むクエリはキャッシュしない
+VOLATILE_PATTERN = re.compile(
+    r"(?i)\b(now|random|clock_timestamp|statement_timestamp|timeofday|current_timestamp|"
+    r"current_date|current_time|localtimestamp|localtime|pg_sleep|nextval|txid_current)\b"
+)
+
+
+def normalize_query(query: str) -> str:
+    """空白・末尾のセミコロンの違いを吸収したクエリ文字列を返す
+
+    文字列リテラル（E'...' を含む）・ドル引用・引用符付き識別子の中の空白は意味を持つため、
+    トークン単位で区切り、それ以外の空白のみを1つにまとめる。
+    """
+    normalized = "".join(
+        " " if kind == "ws" else text for kind, text in tokenize(query)
+    ).strip()
+    return normalized.rstrip(";").rstrip()
+
+
+def make_cache_key(query: str, params: Optional[List[Any]]) -> str:
+    """正規化クエリとパラメータからキャッシュキーを作る"""
+    return normalize_query(query) + "\x00" + json.dumps(
+        params or [], ensure_ascii=False, sort_keys=True, default=str
+    )
+
+
+def is_cacheable(query: str) -> bool:
+    return VOLATILE_PATTERN.search(query) is None
+
+
+def estimate_size(value: Any) -> int:
+    """キャッシュ値のおおよそのサイズ（JSON化した際のバイト数）"""
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    expires_at: float
+
+
+class QueryResultCache:
+    """合計バイト数で上限を設けたLRU/TTLキャッシュ"""
+
+    def __init__(self, max_bytes: int, ttl: float, max_entry_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # 1件で容量の大半を占める結果はキャッシュしない
+        self.max_entry_bytes = max_entry_bytes or max_bytes // 4
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        # clear()のたびに進む世代番号。実行中に破棄されたクエリの結果を格納しないために使う
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= now:
+                self._remove(key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: str, value: Any, size: Optional[int] = None,
+            generation: Optional[int] = None) -> bool:
+        """値を格納する。格納しなかった場合はFalse
+
+        generationを指定した場合、その後にclear()されていれば格納しない。
+        """
+        size = estimate_size(value) if size is None else size
+        if size > self.max_entry_bytes:
+            return False
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._invalidations += 1
+            self._generation += 1
+
+    def on_data_version_change(self, old: Optional[str], new: str) -> None:
+        """DataVersionTrackerのリスナー。マイグレーション適用時に全件破棄する"""
+        if old is not None:
+            self.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits_total": self._hits,
+                "misses_total": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions_total": self._evictions,
+                "invalidations_total": self._invalidations,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+
+def create_cache_from_env() -> Optional[QueryResultCache]:
+    """環境変数の設定でキャッシュを生成する（無効化されている場合はNone）"""
+    if os.getenv("QUERY_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    return QueryResultCache(
+        max_bytes=int(os.getenv("QUERY_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        ttl=float(os.getenv("QUERY_CACHE_TTL", "3600")),
+    )
@@ -0,0 +1,330 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""スロークエリログ
+
+/query で SLOW_QUERY_THRESHOLD 秒を超えたクエリについて、雛形（リテラルを除いたSQL）・
+パラメータの形（型と長さ。値は残さない）・実行時間・ステータスを記録する。
+一部（SLOW_QUERY_EXPLAIN_SAMPLE の割合、同じ雛形は SLOW_QUERY_EXPLAIN_INTERVAL 秒に1回まで）は
+EXPLAIN（見積もりのみ。クエリは実行しない）の実行計画を添える。
+
+SLOW_QUERY_EXPLAIN_ANALYZE=true の場合は、代わりに読み取り専用トランザクションでクエリを再実行し、
+EXPLAIN (ANALYZE, BUFFERS) の実行計画を添える。再実行はプライマリで受付判定・レート制限を経ずに行うため、
+statement_timeout を SLOW_QUERY_ANALYZE_TIMEOUT_MS に下げ、バックグラウンドスレッドで1件ずつ実行する。
+実行時間の上限を超えたクエリは常に再実行せず、EXPLAIN（見積もりのみ）を添える。
+
+記録とEXPLAINはバックグラウンドスレッドで行い、日付ごとのファイル（slow-YYYYMMDD.jsonl）に書き出す。
+SLOW_QUERY_LOG_RETENTION_DAYS 日より古いファイルは削除する。
+
+集計（時間の合計が大きい順）:
+    python slow_query_log.py
+    python slow_query_log.py --days 1 --limit 10
+    python slow_query_log.py --show 3f2a9c1b7d4e   # 指紋を指定して最新の実行計画を表示
+"""
+
+import argparse
+import glob
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from sql_validator import check_bindable, normalize_template
+
+SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "true").lower() == "true"
+SLOW_QUERY_LOG_DIR = os.getenv("SLOW_QUERY_LOG_DIR", "logs")
+# 記録する実行時間の下限（秒）
+SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD", "1.0"))
+# 実行計画を取得する割合
+SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+# 同じ雛形の実行計画を取得する最短間隔（秒）
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "600"))
+# クエリを再実行して EXPLAIN (ANALYZE, BUFFERS) を取得する（falseの場合はEXPLAINの見積もりのみ）
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv("SLOW_QUERY_EXPLAIN_ANALYZE", "false").lower() == "true"
+# EXPLAIN ANALYZE で再実行する際の statement_timeout（ミリ秒）
+SLOW_QUERY_ANALYZE_TIMEOUT_MS = int(os.getenv("SLOW_QUERY_ANALYZE_TIMEOUT_MS", "5000"))
+SLOW_QUERY_LOG_RETENTION_DAYS = int(os.getenv("SLOW_QUERY_LOG_RETENTION_DAYS", "14"))
+
+# 記録の対象とするエンドポイント（バッチは各クエリの実行時間を個別に持たないため対象外）
+_TRACKED_ENDPOINTS = {"query", "query_get", "query_stream"}
+
+# 実行時間の上限を超えた（再実行しても終わらない）
+_TIMEOUT_STATUS = 504
+
+# EXPLAINの種類
+_EXPLAIN_ANALYZE = "EXPLAIN (ANALYZE, BUFFERS)"
+_EXPLAIN_ESTIMATE = "EXPLAIN"
+
+
+def params_shape(params: Optional[List[Any]]) -> Optional[List[str]]:
+    """パラメータの型（文字列・配列は長さ付き）。値そのものは残さない"""
+    if params is None:
+        return None
+    shape = []
+    for param in params:
+        name = type(param).__name__
+        if isinstance(param, (str, bytes, list, tuple, dict)):
+            name += f"({len(param)})"
+        shape.append(name)
+    return shape
+
+
+class SlowQueryLog:
+    """閾値を超えたクエリを記録し、一部の実行計画を取得する"""
+
+    def __init__(self, pool, directory: str, threshold: float = SLOW_QUERY_THRESHOLD,
+                 explain_sample: float = SLOW_QUERY_EXPLAIN_SAMPLE,
+                 explain_interval: float = SLOW_QUERY_EXPLAIN_INTERVAL,
+                 explain_analyze: bool = SLOW_QUERY_EXPLAIN_ANALYZE,
+                 analyze_timeout_ms: int = SLOW_QUERY_ANALYZE_TIMEOUT_MS,
+                 retention_days: int = SLOW_QUERY_LOG_RETENTION_DAYS, queue_size: int = 1000):
+        self.pool = pool
+        self.directory = directory
+        self.threshold = threshold
+        self.explain_sample = explain_sample
+        self.explain_interval = explain_interval
+        self.explain_analyze = explain_analyze
+        self.analyze_timeout_ms = analyze_timeout_ms
+        self.retention_days = retention_days
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Optional[str], str, Optional[List[Any]]]]" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._last_explained: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._file_date: Optional[str] = None
+        self._recorded = 0
+        self._explained = 0
+        self._dropped = 0
+        self._errors = 0
+
+    # ---------- リクエスト処理側 ----------
+
+    def on_query_finished(self, observation, status: int, rows: Optional[int]) -> None:
+        """metrics.QueryObservation の終了リスナー"""
+        if observation.endpoint not in _TRACKED_ENDPOINTS:
+            return
+        elapsed = observation.elapsed()
+        if elapsed < self.threshold or status not in (200, _TIMEOUT_STATUS):
+            return
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "endpoint": observation.endpoint,
+            "fingerprint": observation.fingerprint,
+            "template": normalize_template(observation.query),
+            "params_shape": params_shape(observation.params),
+            "duration": round(elapsed, 6),
+            "status": status,
+            "rows": rows,
+        }
+        try:
+            self._queue.put_nowait((record, self._explain_mode(observation.fingerprint, status),
+                                    observation.query, observation.params))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def _explain_mode(self, fingerprint: str, status: int) -> Optional[str]:
+        """実行計画を取得する場合はEXPLAINの種類を返す（抽出・同じ雛形の間隔で間引く）"""
+        if random.random() >= self.explain_sample:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            last = self._last_explained.get(fingerprint)
+            if last is not None and now - last < self.explain_interval:
+                return None
+            self._last_explained[fingerprint] = now
+        if not self.explain_analyze or status == _TIMEOUT_STATUS:
+            return _EXPLAIN_ESTIMATE
+        return _EXPLAIN_ANALYZE
+
+    # ---------- バックグラウンド ----------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="slow-query-log", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                record, explain_mode, query, params = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if explain_mode is not None and not self._stop.is_set():
+                record["plan"] = self._explain(explain_mode, query, params)
+                record["plan_type"] = "analyze" if explain_mode == _EXPLAIN_ANALYZE else "estimate"
+            self._write(record)
+
+    def _explain(self, explain_mode: str, query: str, params: Optional[List[Any]]) -> Optional[str]:
+        """読み取り専用トランザクションでEXPLAINを実行し、実行計画のテキストを返す
+
+        ANALYZEの場合はクエリを再実行するため、statement_timeout を analyze_timeout_ms に下げる。
+        """
+        try:
+            check_bindable(query, params)
+            with self.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION READ ONLY")
+                    if explain_mode == _EXPLAIN_ANALYZE:
+                        cursor.execute("SET LOCAL statement_timeout = %s", (self.analyze_timeout_ms,))
+                    cursor.execute(f"{explain_mode} {query}", params)
+                    plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            logger.warning(f"Slow query EXPLAIN failed: {e}")
+            with self._lock:
+                self._errors += 1
+            return None
+        with self._lock:
+            self._explained += 1
+        return plan
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        try:
+            f = self._open()
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+        except OSError as e:
+            logger.error(f"Slow query log write failed: {e}")
+            with self._lock:
+                self._errors += 1
+            return
+        with self._lock:
+            self._recorded += 1
+
+    def _open(self):
+        date = datetime.now(timezone.utc).strftime("%Y%m%d")
+        if self._file is None or self._file_date != date:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(os.path.join(self.directory, f"slow-{date}.jsonl"), "a", encoding="utf-8")
+            self._file_date = date
+            self._remove_expired()
+        return self._file
+
+    def _remove_expired(self) -> None:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        for path in glob.glob(os.path.join(self.directory, "slow-*.jsonl")):
+            if os.path.basename(path)[len("slow-"):-len(".jsonl")] < cutoff:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "recorded_total": self._recorded,
+                "explained_total": self._explained,
+                "dropped_total": self._dropped,
+                "errors_total": self._errors,
+            }
+
+
+def create_slow_query_log_from_env(pool) -> Optional[SlowQueryLog]:
+    """環境変数の設定でスロークエリログを生成する（無効化されている場合はNone）"""
+    if not SLOW_QUERY_LOG_ENABLED:
+        return None
+    return SlowQueryLog(pool, SLOW_QUERY_LOG_DIR)
+
+
+# ---------- 集計（CLI） ----------
+
+def read_records(directory: str, days: int) -> List[Dict[str, Any]]:
+    """直近days日分の記録を読み込む"""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days - 1)).strftime("%Y%m%d")
+    records = []
+    for path in sorted(glob.glob(os.path.join(directory, "slow-*.jsonl"))):
+        if os.path.basename(path)[len("slow-"):-len(".jsonl")] < cutoff:
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def top_offenders(records: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """雛形ごとに集計し、時間の合計が大きい順に返す"""
+    groups: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        group = groups.setdefault(record["fingerprint"], {
+            "fingerprint": record["fingerprint"],
+            "template": record["template"],
+            "count": 0,
+            "timeouts": 0,
+            "total": 0.0,
+            "max": 0.0,
+            "plans": 0,
+        })
+        group["count"] += 1
+        group["timeouts"] += record.get("status") == _TIMEOUT_STATUS
+        group["total"] += record["duration"]
+        group["max"] = max(group["max"], record["duration"])
+        group["plans"] += record.get("plan") is not None
+    return sorted(groups.values(), key=lambda group: group["total"], reverse=True)[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="スロークエリログの集計")
+    parser.add_argument("--dir", default=SLOW_QUERY_LOG_DIR, help="ログのディレクトリ")
+    parser.add_argument("--days", type=int, default=7, help="集計する日数（今日を含む）")
+    parser.add_argument("--limit", type=int, default=20, help="表示する雛形の数")
+    parser.add_argument("--show", metavar="FINGERPRINT", help="指定した指紋の最新の実行計画を表示する")
+    args = parser.parse_args()
+
+    records = read_records(args.dir, args.days)
+    if args.show:
+        planned = [record for record in records if record["fingerprint"] == args.show and record.get("plan")]
+        if not planned:
+            print(f"{args.show} の実行計画は記録されていません", file=sys.stderr)
+            return 1
+        latest = planned[-1]
+        print(f"{latest['ts']}  {latest['duration']:.3f}s  params={latest['params_shape']}  ({latest['plan_type']})")
+        print(latest["template"])
+        print()
+        print(latest["plan"])
+        return 0
+
+    offenders = top_offenders(records, args.limit)
+    if not offenders:
+        print("記録されたスロークエリはありません")
+        return 0
+    print(f"{'fingerprint':<14}{'count':>7}{'timeouts':>10}{'total(s)':>11}{'avg(s)':>9}{'max(s)':>9}{'plans':>7}  template")
+    for group in offenders:
+        template = group["template"]
+        if len(template) > 80:
+            template = template[:77] + "..."
+        print(
+            f"{group['fingerprint']:<14}{group['count']:>7}{group['timeouts']:>10}{group['total']:>11.2f}"
+            f"{group['total'] / group['count']:>9.2f}{group['max']:>9.2f}{group['plans']:>7}  {template}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""SQLクエリの検証（トークナイザ方式）
+
+正規表現はモジュール読み込み時に一度だけコンパイルし、クエリは1パスで走査する。
+文字列リテラル・引用符付き識別子・コメントはトークンとして読み飛ばすため、
+`updated_at` や `created_at`、文字列中の `;` を禁止語と誤判定しない。
+
+パラメータはpsycopg2がクライアント側でクエリ文字列に埋め込む。psycopg2は引用符やコメントを
+区別せずに %s・%(name)s を置き換えるため、パラメータ付きのクエリでは、プレースホルダが
+トークンとしてのパラメータ（リテラル・識別子・コメントの外）の位置にあることも確認する。
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional, Tuple
+
+# 禁止されたSQLキーワード（単語トークンとして出現した場合のみ拒否）
+FORBIDDEN_KEYWORDS = frozenset({
+    "INSERT",     # INSERT文
+    "UPDATE",     # UPDATE文
+    "DELETE",     # DELETE文
+    "DROP",       # DROP文
+    "CREATE",     # CREATE文
+    "ALTER",      # ALTER文
+    "TRUNCATE",   # TRUNCATE文
+    "ATTACH",     # ATTACH文
+    "DETACH",     # DETACH文
+})
+
+# 常に許可されるパターン（メタデータクエリ）
+METADATA_PATTERNS = [
+    re.compile(r"^SELECT\s+column_name,\s*data_type\s+FROM\s+information_schema\.columns\s+WHERE\s+table_name\s*=\s*'[^']+'", re.IGNORECASE),  # テーブル情報
+    re.compile(r"^SELECT\s+table_name\s+FROM\s+information_schema\.tables\s+WHERE\s+table_schema\s*=\s*'public'", re.IGNORECASE),  # テーブル一覧
+    re.compile(r"^SELECT\s+constraint_name,\s*column_name\s+FROM\s+information_schema\.key_column_usage\s+WHERE\s+table_name\s*=\s*'[^']+'", re.IGNORECASE),  # 外部キー情報
+]
+
+# 疑わしいLIKEパターン
+SUSPICIOUS_PATTERNS = [
+    "%--",
+    "%';",
+    "%;",
+    "%/*",
+    "%*/",
+    "%@@"
+]
+_SUSPICIOUS_RE = re.compile("|".join(re.escape(p) for p in SUSPICIOUS_PATTERNS))
+
+# トークン定義（上から順に照合する）
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<string>[Ee]'(?:[^'\\]|\\.|'')*'|[BbXxNn]?'(?:[^']|'')*')
+  | (?P<dollar>\$(?P<tag>[A-Za-z_][A-Za-z_0-9]*|)\$.*?\$(?P=tag)\$)
+  | (?P<ident>"(?:[^"]|"")*")
+  | (?P<param>%(?:\([^)]*\))?s|%%)
+  | (?P<word>[^\W\d][\w$]*)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<semicolon>;)
+  | (?P<unterminated>'|"|/\*|\$[A-Za-z_0-9]*\$)
+  | (?P<op>.)
+""", re.VERBOSE | re.DOTALL)
+
+# psycopg2がパラメータの埋め込み時に解釈する % の並び（%% は % 1文字になる）。
+# psycopg2と同じくクエリの先頭から走査するため、%% の組み合わせもpsycopg2と一致する
+_PSYCOPG_FORMAT_RE = re.compile(r"%(?:%|\([^)]*\)s|s)")
+# リテラル・引用符付き識別子・コメントの開始となり得る文字
+_QUOTING_RE = re.compile(r"['\"$]|--|/\*")
+
+# 意味を持たないトークン
+_SKIP = frozenset({"ws", "comment"})
+
+# 先頭に置けるキーワード（WITHはデータ変更を伴うCTEも禁止語で拒否される）
+_LEADING_KEYWORDS = frozenset({"SELECT", "WITH"})
+
+# 許可されるクエリ全体を表す正規表現。許可されるクエリはこの1回の照合（1パス）で判定が終わる。
+# 単語は丸ごと消費するため、識別子の途中（name'...' の E や a$x$ の $）からリテラルを開始しない。
+# 所有量指定子（*+, ++）によりバックトラックせず、クエリ長に対して線形時間で終わる
+_ACCEPT_RE = re.compile(r"""
+    (?:\s++|--[^\n]*+|/\*.*?\*/)*+
+    (?i:SELECT|WITH)(?![\w$])
+    (?:
+        \s++
+      | --[^\n]*+
+      | /\*.*?\*/
+      | [Ee]'(?:[^'\\]++|\\.|'')*+'
+      | [BbXxNn]?'(?:[^']++|'')*+'
+      | \$(?P<tag>[A-Za-z_][A-Za-z_0-9]*|)\$.*?\$(?P=tag)\$
+      | "(?:[^"]++|"")*+"
+      | (?!(?i:%s)(?![\w$]))[^\W\d][\w$]*+
+      | \$\d++
+      | \d[\w.]*+
+      | [^;'"\s\w$]
+    )*+
+    (?:;(?:\s++|--[^\n]*+|/\*.*?\*/)*+)?
+""" % "|".join(sorted(FORBIDDEN_KEYWORDS)), re.VERBOSE | re.DOTALL)
+
+class QueryValidationError(Exception):
+    """検証で拒否されたクエリ"""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def tokenize(query: str) -> Iterator[Tuple[str, str]]:
+    """(トークン種別, 文字列) を順に返す"""
+    for match in _TOKEN_RE.finditer(query):
+        yield match.lastgroup, match.group()
+
+
+def is_metadata_query(query: str) -> bool:
+    query_stripped = query.strip()
+    return any(pattern.match(query_stripped) for pattern in METADATA_PATTERNS)
+
+
+def validate_sql(query: str, params: Optional[List[Any]] = None) -> None:
+    """クエリ文字列を1パスで検証する。拒否する場合はQueryValidationError
+
+    paramsがNoneでない場合（psycopg2がパラメータを埋め込む場合）は、リテラル・識別子・
+    コメントの中のプレースホルダも拒否する。
+    """
+    check_bindable(query, params)
+    # メタデータクエリの確認（常に許可）
+    if is_metadata_query(query):
+        return
+    if _ACCEPT_RE.fullmatch(query):
+        return
+    # 拒否理由の特定（拒否時のみトークン単位で走査する）
+    raise QueryValidationError(_rejection_reason(query))
+
+
+def check_bindable(query: str, params: Optional[List[Any]]) -> None:
+    """psycopg2にパラメータを埋め込ませてよいか確認する。拒否する場合はQueryValidationError
+
+    validate_sql を経た文字列でも、クエリを実行・EXPLAINする各経路の直前で改めて確認する。
+    """
+    if params is not None and has_embedded_placeholder(query):
+        raise QueryValidationError("Placeholder inside a string literal, quoted identifier or comment")
+
+
+def has_embedded_placeholder(query: str) -> bool:
+    """psycopg2が置き換えるプレースホルダのうち、パラメータのトークンでないものがあるか
+
+    '%s' やコメント中の %s、リテラルをまたぐ %('...')s などが該当する。これらは埋め込まれた
+    パラメータが引用符やコメントを閉じ、後続のSQLとして解釈されるおそれがある。
+    """
+    # リテラル・識別子・コメントがなければ、% は必ずパラメータか演算子のトークンの先頭にある
+    if "%" not in query or not _QUOTING_RE.search(query):
+        return False
+    param_starts = {
+        match.start() for match in _TOKEN_RE.finditer(query)
+        if match.lastgroup == "param" and match.group() != "%%"
+    }
+    return any(
+        match.group() != "%%" and match.start() not in param_starts
+        for match in _PSYCOPG_FORMAT_RE.finditer(query)
+    )
+
+
+def _rejection_reason(query: str) -> str:
+    first = True
+    terminated = False
+    for kind, text in tokenize(query):
+        if kind in _SKIP:
+            continue
+        if kind == "unterminated":
+            return "Unterminated literal or comment in query"
+        if first:
+            # SELECT（またはWITH）で始まることを確認（メタデータクエリでない場合）
+            if kind != "word" or text.upper() not in _LEADING_KEYWORDS:
+                break
+            first = False
+        elif terminated:
+            # 末尾以外のセミコロン（複数命令）
+            return "Forbidden SQL pattern detected"
+        elif kind == "semicolon":
+            terminated = True
+        elif kind == "word" and text.upper() in FORBIDDEN_KEYWORDS:
+            return "Forbidden SQL pattern detected"
+    if first:
+        return "Only SELECT queries and metadata queries are allowed"
+    return "Forbidden SQL pattern detected"
+
+
+def find_suspicious_param(params: Optional[List[Any]]) -> Optional[str]:
+    """疑わしいLIKEパターンを含むパラメータを返す（なければNone）"""
+    if params:
+        for param in params:
+            if isinstance(param, str) and _SUSPICIOUS_RE.search(param):
+                return param
+    return None
+
+
+@lru_cache(maxsize=1024)
+def normalize_template(query: str) -> str:
+    """リテラルを ? に置き換え、コメント・空白・大文字小文字の違いを除いたクエリの雛形"""
+    parts = []
+    for kind, text in tokenize(query):
+        if kind in _SKIP or kind == "semicolon":
+            continue
+        if kind in ("string", "dollar", "number"):
+            parts.append("?")
+        elif kind == "word":
+            parts.append(text.upper())
+        else:
+            parts.append(text)
+    return " ".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query: str) -> str:
+    """同じ雛形のクエリで共通となる短い識別子（メトリクスのラベル等に使う）"""
+    return hashlib.sha1(normalize_template(query).encode("utf-8")).hexdigest()[:12]
+
+
+def as_subquery(query: str) -> str:
+    """検証済みのクエリをサブクエリとして埋め込めるよう、コメントと末尾のセミコロンを除く
+
+    行コメントが外側の括弧を打ち消さないよう、コメントは空白に置き換える。
+    """
+    parts = []
+    for kind, text in tokenize(query):
+        if kind == "comment":
+            parts.append(" ")
+        elif kind != "semicolon":
+            parts.append(text)
+    return "".join(parts).strip()
+
+
+def split_statements(sql: str) -> List[str]:
+    """スクリプトをトップレベルのセミコロンで文に分割する（コメントのみの文は除く）"""
+    statements = []
+    buffer: List[str] = []
+    meaningful = False
+    for kind, text in tokenize(sql):
+        buffer.append(text)
+        if kind == "semicolon":
+            if meaningful:
+                statements.append("".join(buffer).strip())
+            buffer, meaningful = [], False
+        elif kind not in _SKIP:
+            meaningful = True
+    if meaningful:
+        statements.append("".join(buffer).strip())
+    return statements
@@ -0,0 +1,243 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""接続単位のプリペアドステートメントキャッシュ
+
+クライアントは同じパラメータ化テンプレート（教員→シラバスの結合など）を繰り返し送るため、
+クエリ文字列をキーに PREPARE 済みの文を接続ごとにLRUで保持し、EXECUTE で再利用する。
+psycopg2 の %s プレースホルダは $1, $2, ... に変換し、行数上限は LIMIT として文に含める。
+
+効果はパラメータ付きクエリの実行・取得時間（PREPAREは含まない）を、プリペアドステートメントを
+使った場合（prepared）と通常の経路で実行した場合（direct）に分けて計測し、雛形ごとに比較できるようにする。
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from loguru import logger
+
+from metrics import fingerprints, statement_execute_seconds
+from query_engine import QueryResult, QUERY_MAX_ROWS, column_names
+from sql_validator import tokenize
+
+PREPARED_STATEMENTS_ENABLED = os.getenv("PREPARED_STATEMENTS_ENABLED", "true").lower() == "true"
+# 1接続あたりに保持するプリペアドステートメント数
+PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("PREPARED_STATEMENT_CACHE_SIZE", "100"))
+
+# 文字列リテラル中の % は psycopg2 の規則どおり %% のみ許可する
+_LITERAL_PERCENT_RE = re.compile(r"(?:[^%]|%%)*", re.DOTALL)
+
+# ConnectionInfo.extras に格納するキー
+_EXTRAS_KEY = "prepared_statements"
+
+# 実行時間を記録する経路
+PREPARED = "prepared"
+DIRECT = "direct"
+
+
+def to_prepared_sql(query: str, param_count: int, max_rows: int) -> Optional[str]:
+    """psycopg2形式のクエリをPREPARE可能なSQLに変換する。変換できない場合はNone"""
+    parts: List[str] = []
+    placeholders = 0
+    for kind, text in tokenize(query):
+        if kind == "comment":
+            # 行コメントが後続のラップ部分を打ち消さないよう空白に置き換える
+            parts.append(" ")
+        elif kind == "semicolon":
+            continue
+        elif kind == "param":
+            if text == "%%":
+                parts.append("%")
+            elif text == "%s":
+                placeholders += 1
+                parts.append(f"${placeholders}")
+            else:
+                # 名前付きパラメータ（%(name)s）は対象外
+                return None
+        elif kind in ("string", "dollar", "ident"):
+            if "%" in text:
+                if not _LITERAL_PERCENT_RE.fullmatch(text):
+                    return None
+                text = text.replace("%%", "%")
+            parts.append(text)
+        elif kind == "unterminated" or (kind == "op" and text == "%"):
+            return None
+        else:
+            parts.append(text)
+    if placeholders != param_count:
+        return None
+    return f"SELECT * FROM ({''.join(parts).strip()}) AS _q LIMIT {max_rows + 1}"
+
+
+class _Stats:
+    """全接続を通したプリペアドステートメントの統計"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prepares = 0
+        self.reuses = 0
+        self.evictions = 0
+        self.fallbacks = 0
+        self.prepare_time_total = 0.0
+        self.prepared_executions = 0
+        self.prepared_execute_time_total = 0.0
+        self.direct_executions = 0
+        self.direct_execute_time_total = 0.0
+
+    def record(self, **deltas: float) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": PREPARED_STATEMENTS_ENABLED,
+                "capacity_per_connection": PREPARED_STATEMENT_CACHE_SIZE,
+                # PREPARE（構文解析・意味解析。実行計画はEXECUTE時に作られる）を実行した回数
+                "prepare_calls_total": self.prepares,
+                # PREPARE済みの文を再利用し、解析を省略した回数
+                "reuses_total": self.reuses,
+                "evictions_total": self.evictions,
+                "fallbacks_total": self.fallbacks,
+                "avg_prepare_time": self.prepare_time_total / self.prepares if self.prepares else 0.0,
+                # パラメータ付きクエリの実行・取得時間（PREPAREを除く）の実測値
+                "prepared_executions_total": self.prepared_executions,
+                "prepared_execute_time_avg": (
+                    self.prepared_execute_time_total / self.prepared_executions if self.prepared_executions else 0.0
+                ),
+                "direct_executions_total": self.direct_executions,
+                "direct_execute_time_avg": (
+                    self.direct_execute_time_total / self.direct_executions if self.direct_executions else 0.0
+                ),
+            }
+
+
+stats = _Stats()
+
+
+def observe_execute(query: str, mode: str, seconds: float) -> None:
+    """パラメータ付きクエリの実行・取得時間を経路（PREPARED / DIRECT）ごとに記録する"""
+    statement_execute_seconds.labels(mode, fingerprints.label(query)).observe(seconds)
+    if mode == PREPARED:
+        stats.record(prepared_executions=1, prepared_execute_time_total=seconds)
+    else:
+        stats.record(direct_executions=1, direct_execute_time_total=seconds)
+
+
+class _ConnectionStatements:
+    """1接続分のプリペアドステートメント（LRU）"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.names: "OrderedDict[str, str]" = OrderedDict()
+        # PREPAREできなかったクエリ（型推論の失敗など）は再試行しない
+        self.unpreparable: "OrderedDict[str, None]" = OrderedDict()
+        self._counter = 0
+
+    def next_name(self) -> str:
+        self._counter += 1
+        return f"api_stmt_{self._counter}"
+
+
+def placeholder_count(query: str) -> int:
+    """psycopg2が置き換えるプレースホルダ（%s・%(name)s）の数"""
+    return sum(1 for kind, text in tokenize(query) if kind == "param" and text != "%%")
+
+
+def _connection_statements(extras: Dict[str, Any]) -> _ConnectionStatements:
+    statements = extras.get(_EXTRAS_KEY)
+    if statements is None:
+        statements = extras[_EXTRAS_KEY] = _ConnectionStatements(PREPARED_STATEMENT_CACHE_SIZE)
+    return statements
+
+
+def _statement_name(cursor, statements: _ConnectionStatements, query: str, param_count: int,
+                    max_rows: int) -> Optional[str]:
+    """PREPARE済みの文の名前を返す（なければPREPAREする）。PREPAREできない場合はNone"""
+    name = statements.names.get(query)
+    if name is not None:
+        statements.names.move_to_end(query)
+        stats.record(reuses=1)
+        return name
+    sql = to_prepared_sql(query, param_count, max_rows)
+    if sql is None:
+        _mark_unpreparable(statements, query)
+        return None
+    name = statements.next_name()
+    # 失敗してもトランザクション（バッチ実行の読み取り専用トランザクション等）を継続できるようセーブポイントを置く
+    cursor.execute("SAVEPOINT api_prepare")
+    start = time.perf_counter()
+    try:
+        cursor.execute(f"PREPARE {name} AS {sql}")
+    except psycopg2.Error as e:
+        # 型を推論できない等。セーブポイントまで戻して通常の経路に任せる
+        logger.debug(f"PREPARE failed, falling back to direct execution: {e}")
+        cursor.execute("ROLLBACK TO SAVEPOINT api_prepare")
+        _mark_unpreparable(statements, query)
+        return None
+    cursor.execute("RELEASE SAVEPOINT api_prepare")
+    stats.record(prepares=1, prepare_time_total=time.perf_counter() - start)
+    statements.names[query] = name
+    if len(statements.names) > statements.capacity:
+        _, evicted = statements.names.popitem(last=False)
+        cursor.execute(f"DEALLOCATE {evicted}")
+        stats.record(evictions=1)
+    return name
+
+
+def prepare(conn, extras: Dict[str, Any], query: str, max_rows: int = QUERY_MAX_ROWS) -> bool:
+    """パラメータの値なしで、雛形をPREPAREだけしておく（ウォームアップ用）
+
+    PREPAREした（済みだった）場合はTrue。
+    """
+    param_count = placeholder_count(query)
+    if not PREPARED_STATEMENTS_ENABLED or not param_count:
+        return False
+    statements = _connection_statements(extras)
+    if query in statements.unpreparable:
+        return False
+    with conn.cursor() as cursor:
+        return _statement_name(cursor, statements, query, param_count, max_rows) is not None
+
+
+def run_prepared(conn, extras: Dict[str, Any], query: str, params: List[Any],
+                 max_rows: int = QUERY_MAX_ROWS) -> Optional[QueryResult]:
+    """PREPARE済みの文でクエリを実行する
+
+    プリペアドステートメントを使えない場合はNoneを返し、呼び出し側は通常の経路で実行する。
+    """
+    if not PREPARED_STATEMENTS_ENABLED or not params:
+        return None
+    statements = _connection_statements(extras)
+    if query in statements.unpreparable:
+        return None
+
+    with conn.cursor() as cursor:
+        name = _statement_name(cursor, statements, query, len(params), max_rows)
+        if name is None:
+            return None
+        placeholders = ", ".join(["%s"] * len(params))
+        start = time.perf_counter()
+        cursor.execute(f"EXECUTE {name} ({placeholders})", params)
+        rows = cursor.fetchall()
+        observe_execute(query, PREPARED, time.perf_counter() - start)
+        columns = column_names(cursor)
+
+    truncated = len(rows) > max_rows
+    if truncated:
+        rows = rows[:max_rows]
+    return QueryResult(rows=rows, truncated=truncated, columns=columns)
+
+
+def _mark_unpreparable(statements: _ConnectionStatements, query: str) -> None:
+    stats.record(fallbacks=1)
+    statements.unpreparable[query] = None
+    if len(statements.unpreparable) > statements.capacity:
+        statements.unpreparable.popitem(last=False)
@@ -0,0 +1,204 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""起動時のウォームアップ
+
+デプロイ直後のリクエストが接続の確立・プリペアドステートメントの作成・クエリ雛形の解析・
+PostgreSQLの共有バッファの読み込みを負担しないよう、起動時にバックグラウンドで
+- 接続プールを WARMUP_CONNECTIONS 本まで、1本ずつ確立する
+- 確立した接続で /examples のクエリと、前回の実行で多く実行されたクエリ（上位 WARMUP_TOP_N 件）を実行する
+を行い、完了するまで /health を503（準備中）とする。ウォームアップが同時に借りる接続は1本のみで、
+WARMUP_TIMEOUT 秒を過ぎた時点で打ち切る。
+
+多く実行されたクエリは終了時に WARMUP_STATE_FILE へ保存する（クエリ指紋ごとに最後に実行されたクエリの文字列のみ。
+パラメータの値は保存しない）。リテラル（文字列・ドル引用・数値）を直接含むクエリは氏名などの値を含み得るため、
+記録も保存もせず、値をすべてプレースホルダで渡すクエリのみを対象とする。
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from metrics import OTHER_FINGERPRINT
+from query_engine import QUERY_TIMEOUT_MS
+from sql_validator import tokenize
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+# 前回の実行から引き継ぐクエリの数
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "20"))
+# ウォームアップで確立する接続数（0で接続プールの最大接続数）
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", "0"))
+WARMUP_STATE_FILE = os.getenv("WARMUP_STATE_FILE", "logs/warmup_queries.json")
+# ウォームアップ全体の時間の上限（秒）
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "60"))
+
+# 記録の対象とするエンドポイント（ストリーミングは大量の行を返すため対象外）
+_TRACKED_ENDPOINTS = {
+    "query", "query_get", "batch",
+    "courses_by_instructor", "courses_by_faculty", "timetable", "books_by_syllabus",
+}
+
+Query = Tuple[str, Optional[List[Any]]]
+
+# 値を含み得るトークン
+_LITERAL_TOKENS = {"string", "dollar", "number"}
+
+
+def has_inline_literals(query: str) -> bool:
+    """クエリがリテラルを直接含むか（含むクエリはディスクに保存しない）"""
+    return any(kind in _LITERAL_TOKENS for kind, _ in tokenize(query))
+
+
+class HotQueryTracker:
+    """クエリ指紋ごとの実行回数と、最後に実行されたクエリを記録する（パラメータの値は残さない）"""
+
+    def __init__(self):
+        # 指紋 -> [実行回数, クエリ]
+        self._queries: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def on_query_finished(self, observation, status: int, rows: Optional[int]) -> None:
+        """QueryObservation.finish() のリスナー"""
+        if status != 200 or observation.endpoint not in _TRACKED_ENDPOINTS:
+            return
+        if observation.fingerprint == OTHER_FINGERPRINT or has_inline_literals(observation.query):
+            return
+        with self._lock:
+            entry = self._queries.get(observation.fingerprint)
+            if entry is None:
+                self._queries[observation.fingerprint] = [1, observation.query]
+            else:
+                entry[0] += 1
+                entry[1] = observation.query
+
+    def top(self, n: int) -> List[str]:
+        with self._lock:
+            ranked = sorted(self._queries.values(), key=lambda entry: entry[0], reverse=True)
+        return [query for _, query in ranked[:n]]
+
+    def save(self, path: str, n: int) -> None:
+        """上位n件をJSONで保存する（ワーカーごとに一時ファイルへ書いてから置き換える）"""
+        queries = self.top(n)
+        if not queries:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump([{"query": query} for query in queries], f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to save warm-up queries: {e}")
+
+
+def load_queries(path: str, n: int) -> List[Query]:
+    """前回保存したクエリを (クエリ, None) として読み込む（ファイルがない場合は空）
+
+    以前の形式のファイルにパラメータやリテラルを含むクエリが含まれていても使わない。
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load warm-up queries: {e}")
+        return []
+    return [
+        (entry["query"], None)
+        for entry in entries[:n]
+        if isinstance(entry, dict) and isinstance(entry.get("query"), str)
+        and not has_inline_literals(entry["query"])
+    ]
+
+
+class WarmUp:
+    """ウォームアップの実行と準備完了の状態"""
+
+    def __init__(self, connections: int = WARMUP_CONNECTIONS, timeout: float = WARMUP_TIMEOUT):
+        self.connections = connections
+        self.timeout = timeout
+        self.ready = False
+        self._queries = 0
+        self._connections_warmed = 0
+        self._failures = 0
+        self._timed_out = False
+        self._duration = 0.0
+
+    def run(self, pool, queries: List[Query], execute: Callable[[Any, str, Optional[List[Any]]], None]) -> None:
+        """未使用の接続を1本ずつ借り、queriesを実行してからプールに返す。失敗したクエリは読み飛ばす
+
+        executeは (接続, クエリ, パラメータ) で1クエリを実行する関数。同時に借りる接続は1本のみのため、
+        ウォームアップ中も残りの接続は通常のリクエストやヘルスチェックが使える。
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        target = self.connections or pool.max_size
+        try:
+            for _ in range(target):
+                if time.monotonic() >= deadline:
+                    self._timed_out = True
+                    break
+                try:
+                    with pool.fresh_connection() as conn:
+                        if conn is None:
+                            # 通常のリクエストで既に最大接続数まで使われている
+                            break
+                        self._warm(conn, queries, execute, deadline)
+                except Exception as e:
+                    logger.warning(f"Warm-up could not open more connections: {e}")
+                    break
+                self._connections_warmed += 1
+            self._queries = len(queries)
+        finally:
+            self._duration = time.monotonic() - start
+            self.ready = True
+            logger.info(
+                f"Warm-up finished in {self._duration:.2f}s "
+                f"({self._queries} queries on {self._connections_warmed} connections, {self._failures} failures"
+                f"{', timed out' if self._timed_out else ''})"
+            )
+
+    def _warm(self, conn, queries: List[Query], execute: Callable[[Any, str, Optional[List[Any]]], None],
+              deadline: float) -> None:
+        for query, params in queries:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._timed_out = True
+                return
+            try:
+                # 1クエリの実行時間も残り時間に収める（SET LOCALはトランザクションの終了で元に戻る）
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SET LOCAL statement_timeout = %s", (max(1, min(int(remaining * 1000), QUERY_TIMEOUT_MS)),)
+                    )
+                execute(conn, query, params)
+            except Exception as e:
+                self._failures += 1
+                logger.debug(f"Warm-up query failed: {e}")
+                # 失敗したトランザクションを終え、同じ接続で次のクエリを実行できるようにする
+                try:
+                    conn.rollback()
+                except Exception:
+                    return
+
+    def start(self, pool, queries: List[Query], execute: Callable[[Any, str, Optional[List[Any]]], None]) -> None:
+        """バックグラウンドでrun()を実行する"""
+        threading.Thread(
+            target=self.run, args=(pool, queries, execute), name="warm-up", daemon=True
+        ).start()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "queries": self._queries,
+            "connections": self._connections_warmed,
+            "failures_total": self._failures,
+            "timed_out": self._timed_out,
+            "duration_seconds": self._duration,
+        }
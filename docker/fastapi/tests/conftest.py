@@ -0,0 +1,10 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import os
+import sys
+
+# appのモジュールはコンテナ内と同じくトップレベルのモジュールとしてインポートする
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+sys.path.insert(0, APP_DIR)
@@ -0,0 +1,63 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from query_engine import QueryResult
+from result_cache import QueryResultCache, make_cache_key
+
+
+@pytest.fixture
+def main(tmp_path, monkeypatch):
+    # ログファイルはテスト用のディレクトリに作る
+    monkeypatch.chdir(tmp_path)
+    module = importlib.import_module("main")
+    monkeypatch.setattr(module, "result_cache", QueryResultCache(max_bytes=1 << 20, ttl=60))
+    monkeypatch.setattr(module, "query_admission", None)
+    monkeypatch.setattr(module, "rate_limiter", None)
+    return module
+
+
+def result_for(query):
+    return QueryResult(rows=[[query]], truncated=False, columns=["query"])
+
+
+def test_batch_keeps_request_order_with_cache_hits_and_misses(main, monkeypatch):
+    queries = [f"SELECT {i}" for i in range(5)]
+    # 1番目と3番目はキャッシュ済み
+    for i in (1, 3):
+        main.result_cache.put(make_cache_key(queries[i], None), result_for(queries[i]))
+    executed = []
+
+    async def run_routed(min_data_version, fn, items):
+        assert fn is main._run_batch
+        executed.extend(query for query, _, _, _ in items)
+        return [(result_for(query), 0.01) for query, _, _, _ in items]
+
+    monkeypatch.setattr(main, "_run_routed", run_routed)
+    response = TestClient(main.app).post(
+        f"{main.API_PREFIX}/query/batch", json=[{"query": query} for query in queries]
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["results"][0][0] for result in results] == queries
+    # キャッシュになかったクエリだけを、リクエストの順に1回で実行する
+    assert executed == [queries[0], queries[2], queries[4]]
+    assert [result["execution_time"] for result in results][1::2] == [0.0, 0.0]
+
+
+def test_batch_is_not_executed_when_one_query_is_forbidden(main, monkeypatch):
+    async def run_routed(*args):
+        raise AssertionError("must not execute")
+
+    monkeypatch.setattr(main, "_run_routed", run_routed)
+    response = TestClient(main.app).post(
+        f"{main.API_PREFIX}/query/batch",
+        json=[{"query": "SELECT 1"}, {"query": "DELETE FROM syllabus"}],
+    )
+    assert response.status_code == 403
+    assert response.json()["detail"].startswith("queries[1]:")
@@ -0,0 +1,100 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+import compression
+from compression import CompressionMiddleware, negotiate_encoding
+
+LARGE = {"担当教員一覧": ["藤原 和将"] * 200}
+
+
+def make_client(minimum_size=1024):
+    async def large(request):
+        return JSONResponse(LARGE)
+
+    async def small(request):
+        return JSONResponse({"ok": True})
+
+    async def image(request):
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    async def stream(request):
+        async def chunks():
+            for i in range(3):
+                yield f'{{"row": {i}}}\n'.encode("utf-8")
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    async def text(request):
+        return PlainTextResponse("x" * 2000, headers={"Vary": "Accept"})
+
+    app = Starlette(routes=[
+        Route("/large", large), Route("/small", small), Route("/image", image),
+        Route("/stream", stream), Route("/text", text),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept_encoding,expected", [
+    (None, None),
+    ("", None),
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("identity", None),
+    ("*", compression.available_encodings()[0]),
+    ("br;q=0, gzip", "gzip"),
+    ("br, gzip;q=0.5", compression.available_encodings()[0]),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding) == expected
+
+
+def test_large_json_is_compressed():
+    response = make_client().get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    # TestClientは本文を展開して返す
+    assert response.json() == LARGE
+    assert int(response.headers["content-length"]) < len(response.content)
+
+
+def test_response_below_threshold_is_not_compressed():
+    response = make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+def test_threshold_is_configurable():
+    response = make_client(minimum_size=1).get("/small", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_binary_media_type_is_not_compressed():
+    response = make_client().get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_client_without_accept_encoding_gets_identity():
+    response = make_client().get("/large", headers={"Accept-Encoding": ""})
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_compressed_regardless_of_size():
+    client = make_client()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == b'{"row": 0}\n{"row": 1}\n{"row": 2}\n'
+
+
+def test_existing_vary_is_extended():
+    response = make_client().get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
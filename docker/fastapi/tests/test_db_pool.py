@@ -0,0 +1,125 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+import db_pool
+from db_pool import ConnectionPool, PoolClosed, PoolTimeout
+
+
+class FakeInfo:
+    transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.pings += 1
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.pings = 0
+        self.info = FakeInfo()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    created = []
+
+    def connect(dsn, **kwargs):
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    monkeypatch.setattr(db_pool.psycopg2, "connect", connect)
+    return created
+
+
+def make_pool(**kwargs):
+    pool = ConnectionPool("postgresql://test", **kwargs)
+    # 定期的な破棄のスレッドは起動しない
+    pool._closed = False
+    pool._fill_to_min()
+    return pool
+
+
+def test_checkout_reuses_returned_connection(connections):
+    pool = make_pool(min_size=1, max_size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    stats = pool.stats()
+    assert stats["checkouts_total"] == 2
+    assert stats["connections_created_total"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_times_out_when_all_connections_are_in_use(connections):
+    pool = make_pool(min_size=0, max_size=1, timeout=0.05)
+    conn = pool.getconn()
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+    assert pool.stats()["timeouts_total"] == 1
+    pool.putconn(conn)
+    assert pool.getconn() is conn
+
+
+def test_broken_idle_connection_is_replaced_on_checkout(connections):
+    pool = make_pool(min_size=1, max_size=1, validate_after=0)
+    stale = connections[0]
+    stale.broken = True
+    conn = pool.getconn()
+    assert conn is not stale
+    assert stale.closed
+    stats = pool.stats()
+    assert stats["validation_failures_total"] == 1
+    assert stats["connections_discarded_total"] == 1
+
+
+def test_recently_used_connection_is_not_pinged(connections):
+    pool = make_pool(min_size=1, max_size=1, validate_after=60)
+    with pool.connection():
+        pass
+    assert connections[0].pings == 0
+
+
+def test_closed_connection_is_discarded_on_error(connections):
+    pool = make_pool(min_size=0, max_size=1)
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection() as conn:
+            conn.closed = 2
+            raise psycopg2.OperationalError("connection lost")
+    assert pool.stats()["size"] == 0
+
+
+def test_checkout_after_close_fails(connections):
+    pool = make_pool(min_size=1, max_size=1)
+    pool.close()
+    with pytest.raises(PoolClosed):
+        pool.getconn()
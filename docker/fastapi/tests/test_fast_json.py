@@ -0,0 +1,77 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import datetime
+import importlib
+import json
+import sys
+from decimal import Decimal
+
+import pytest
+
+import fast_json
+
+ROW = [
+    13,
+    Decimal("2.50"),
+    Decimal("12345678901234567890.123456789"),
+    datetime.datetime(2025, 4, 1, 9, 0, tzinfo=datetime.timezone.utc),
+    datetime.datetime(2025, 4, 1, 9, 0, 30, 123456),
+    datetime.datetime(2025, 4, 1, 18, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=9))),
+    datetime.date(2025, 4, 1),
+    datetime.time(9, 0),
+    None,
+    "前期",
+    {"開講情報一覧": [{"曜日": "月", "時限": 1}]},
+]
+
+EXPECTED = [
+    13,
+    "2.50",
+    "12345678901234567890.123456789",
+    "2025-04-01T09:00:00Z",
+    "2025-04-01T09:00:30.123456",
+    "2025-04-01T18:00:00+09:00",
+    "2025-04-01",
+    "09:00:00",
+    None,
+    "前期",
+    {"開講情報一覧": [{"曜日": "月", "時限": 1}]},
+]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """orjsonを使う実装と、標準のjsonを使う実装の両方を確認する"""
+    if request.param == "json":
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    elif fast_json.orjson is None and importlib.util.find_spec("orjson") is None:
+        pytest.skip("orjson is not installed")
+    module = importlib.reload(fast_json)
+    yield module
+    monkeypatch.undo()
+    importlib.reload(fast_json)
+
+
+def test_decimal_and_datetime_values(backend):
+    assert json.loads(backend.dumps({"results": [ROW]})) == {"results": [EXPECTED]}
+
+
+def test_non_ascii_is_not_escaped(backend):
+    assert "前期".encode("utf-8") in backend.dumps(["前期"])
+
+
+def test_ndjson_lines(backend):
+    body = backend.dumps_lines([ROW, [1, Decimal("0.1")]])
+    lines = body.decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [EXPECTED, [1, "0.1"]]
+    assert body.endswith(b"\n")
+
+
+def test_matches_pydantic_json_mode():
+    pydantic = pytest.importorskip("pydantic")
+    adapter = pydantic.TypeAdapter(list)
+    values = [Decimal("2.50"), datetime.datetime(2025, 4, 1, 9, 0, tzinfo=datetime.timezone.utc),
+              datetime.date(2025, 4, 1)]
+    assert json.loads(fast_json.dumps(values)) == adapter.dump_python(values, mode="json")
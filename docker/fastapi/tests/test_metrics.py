@@ -0,0 +1,22 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import metrics
+from metrics import QueryObservation
+
+
+def test_listener_errors_do_not_propagate_and_finish_runs_once(monkeypatch):
+    calls = []
+
+    def failing(observation, status, rows):
+        raise RuntimeError("listener failed")
+
+    def recording(observation, status, rows):
+        calls.append(status)
+
+    monkeypatch.setattr(metrics, "_finish_listeners", [failing, recording])
+    observation = QueryObservation("query", "SELECT 1")
+    observation.finish(200, 1)
+    observation.finish(500)
+    assert calls == [200]
@@ -0,0 +1,79 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import sqlite3
+
+import pytest
+
+from pagination import PaginationError, build_page_query, encode_cursor, next_cursor, query_fingerprint
+from query_engine import QueryResult
+
+QUERY = "SELECT syllabus_id, term FROM syllabus WHERE credits >= %s"
+PARAMS = [1]
+
+
+@pytest.fixture
+def db():
+    # 行値比較 (k1, k2) > (v1, v2) を持つSQLiteで、組み立てたクエリを実際に実行する
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE syllabus (syllabus_id INTEGER, term TEXT, credits INTEGER)")
+    # 学期には重複があり、syllabus_id で同順位を解消する
+    rows = [(i, ["前期", "後期", "通年"][i % 3], 2) for i in range(1, 24)]
+    conn.executemany("INSERT INTO syllabus VALUES (?, ?, ?)", rows)
+    yield conn
+    conn.close()
+
+
+def fetch_page(db, order_by, descending, page_size, cursor):
+    sql, params = build_page_query(QUERY, PARAMS, order_by, descending, page_size, cursor)
+    cursor_obj = db.execute(sql.replace("%s", "?"), params or [])
+    rows = cursor_obj.fetchall()
+    columns = [column[0] for column in cursor_obj.description]
+    return QueryResult(rows=rows[:page_size], truncated=len(rows) > page_size, columns=columns)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_all_rows_once_with_ties(db, descending):
+    order_by = ["term", "syllabus_id"]
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        result = fetch_page(db, order_by, descending, 5, cursor)
+        seen.extend(result.rows)
+        pages += 1
+        cursor = next_cursor(result, QUERY, PARAMS, order_by, descending)
+        if cursor is None:
+            break
+    expected = db.execute(
+        f"SELECT syllabus_id, term FROM syllabus ORDER BY term{' DESC' if descending else ''}, "
+        f"syllabus_id{' DESC' if descending else ''}"
+    ).fetchall()
+    assert seen == expected
+    assert pages == 5
+
+
+def test_last_page_has_no_cursor(db):
+    result = fetch_page(db, ["syllabus_id"], False, 100, None)
+    assert len(result.rows) == 23
+    assert next_cursor(result, QUERY, PARAMS, ["syllabus_id"], False) is None
+
+
+def test_cursor_is_bound_to_its_query():
+    token = encode_cursor(query_fingerprint(QUERY, PARAMS, ["syllabus_id"], False), [5])
+    with pytest.raises(PaginationError, match="does not belong"):
+        build_page_query(QUERY, [2], ["syllabus_id"], False, 10, token)
+    with pytest.raises(PaginationError, match="does not belong"):
+        build_page_query(QUERY, PARAMS, ["syllabus_id"], True, 10, token)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30", encode_cursor("x", [1])])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(PaginationError):
+        build_page_query(QUERY, PARAMS, ["syllabus_id"], False, 10, cursor)
+
+
+def test_sort_key_must_be_a_column_name():
+    with pytest.raises(PaginationError, match="Invalid sort key"):
+        build_page_query(QUERY, PARAMS, ['syllabus_id"; DROP TABLE syllabus; --'], False, 10, None)
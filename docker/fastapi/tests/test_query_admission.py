@@ -0,0 +1,47 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+from query_admission import PlanEstimate, QueryAdmission
+
+
+class FakeCursor:
+    def __init__(self, cost):
+        self.cost = cost
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchone(self):
+        return ([{"Plan": {"Total Cost": self.cost, "Plan Rows": self.cost}}],)
+
+
+class FakeConnection:
+    def __init__(self, cost):
+        self.cost = cost
+
+    def cursor(self):
+        return FakeCursor(self.cost)
+
+
+def test_literals_are_estimated_separately():
+    admission = QueryAdmission(cache_size=10)
+    admission.estimate(FakeConnection(1.0), "SELECT * FROM syllabus LIMIT 1", None)
+    # 雛形が同じでもリテラルが違えば安い見積もりを使い回さない
+    assert admission.cached("SELECT * FROM syllabus LIMIT 100000000", None) is None
+    assert admission.cached("SELECT * FROM syllabus  LIMIT 1", None) == PlanEstimate(cost=1.0, rows=1.0)
+
+
+def test_params_are_estimated_separately():
+    admission = QueryAdmission(cache_size=10)
+    query = "SELECT * FROM syllabus WHERE year = %s"
+    admission.estimate(FakeConnection(9e9), query, [2025])
+    # 高い見積もりが同じ雛形の別のパラメータを拒否させない
+    assert admission.cached(query, [2024]) is None
+    assert admission.cached(query, [2025]).cost == 9e9
@@ -0,0 +1,69 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+from collections import namedtuple
+
+import pytest
+
+from query_engine import QUERY_MAX_ROWS, run_select, session_options
+
+Column = namedtuple("Column", "name")
+
+
+class FakeNamedCursor:
+    """サーバサイドカーソル。FETCHした行数を記録する"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetched = 0
+        self.description = [Column("syllabus_id")]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchmany(self, size):
+        rows = self.rows[self.fetched:self.fetched + size]
+        self.fetched += len(rows)
+        return rows
+
+
+class FakeConnection:
+    def __init__(self, row_count):
+        self.cursor_obj = FakeNamedCursor([(i,) for i in range(row_count)])
+
+    def cursor(self, name=None):
+        assert name is not None, "run_select must use a server-side cursor"
+        return self.cursor_obj
+
+
+@pytest.mark.parametrize("row_count,truncated", [
+    (QUERY_MAX_ROWS - 1, False),
+    (QUERY_MAX_ROWS, False),
+    (QUERY_MAX_ROWS + 1, True),
+    (QUERY_MAX_ROWS * 5, True),
+])
+def test_rows_are_truncated_at_query_max_rows(row_count, truncated):
+    conn = FakeConnection(row_count)
+    result = run_select(conn, "SELECT syllabus_id FROM syllabus")
+    assert len(result.rows) == min(row_count, QUERY_MAX_ROWS)
+    assert result.truncated is truncated
+    assert result.columns == ["syllabus_id"]
+    # 上限+1行より多くはDBから転送しない
+    assert conn.cursor_obj.fetched <= QUERY_MAX_ROWS + 1
+
+
+def test_max_rows_can_be_lowered_per_query():
+    result = run_select(FakeConnection(10), "SELECT syllabus_id FROM syllabus", max_rows=3)
+    assert [row[0] for row in result.rows] == [0, 1, 2]
+    assert result.truncated
+
+
+def test_session_options_set_statement_timeout():
+    assert session_options(1500) == "-c statement_timeout=1500"
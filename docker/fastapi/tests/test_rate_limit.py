@@ -0,0 +1,50 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import asyncio
+
+from starlette.datastructures import Headers
+
+from rate_limit import MemoryBackend, RateLimiter, _parse_networks, client_address
+
+TRUSTED = _parse_networks("172.16.0.0/12, 10.0.0.1")
+
+
+def test_untrusted_peer_ignores_forwarded_header():
+    headers = Headers({"x-forwarded-for": "203.0.113.9"})
+    assert client_address(headers, "198.51.100.7", TRUSTED) == "198.51.100.7"
+
+
+def test_trusted_proxy_uses_rightmost_untrusted_address():
+    # 左側の値はクライアントが任意に付けられるため使わない
+    headers = Headers({"x-forwarded-for": "192.0.2.1, 203.0.113.9, 10.0.0.1"})
+    assert client_address(headers, "172.18.0.5", TRUSTED) == "203.0.113.9"
+
+
+def test_trusted_proxy_without_header_falls_back_to_peer():
+    assert client_address(Headers({}), "172.18.0.5", TRUSTED) == "172.18.0.5"
+
+
+def test_no_trusted_proxies_uses_peer():
+    headers = Headers({"x-forwarded-for": "203.0.113.9"})
+    assert client_address(headers, "172.18.0.5", ()) == "172.18.0.5"
+
+
+def test_release_charges_db_time_only():
+    backend = MemoryBackend()
+    limiter = RateLimiter(backend, max_concurrency=0, rate=1.0, burst=10.0, min_cost=0.5)
+
+    async def run():
+        lease = await limiter.acquire("ip:203.0.113.9")
+        lease.charge(1.5)
+        lease.charge(1.0)
+        await lease.release()
+        # 二重に返却しても差し引かない
+        await lease.release()
+
+    asyncio.run(run())
+    tokens, _, in_flight = backend._state["ip:203.0.113.9"]
+    # 最小コスト0.5 + (DB時間2.5 - 0.5)。回復分は僅かなので範囲で比べる
+    assert 7.5 <= tokens < 7.6
+    assert in_flight == 0
@@ -0,0 +1,67 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+from collections import Counter
+
+from replica_router import ReplicaRouter
+
+
+def make_router(*replicas, max_lag=30.0, max_failures=3):
+    """レプリカを確認済みの状態にしたルーター（replicasは (名前, 遅延, データバージョン)）"""
+    router = ReplicaRouter("primary-pool", [(name, f"{name}-pool") for name, _, _ in replicas],
+                           max_lag=max_lag, max_failures=max_failures)
+    for backend, (_, lag, version) in zip(router.replicas, replicas):
+        backend.healthy = True
+        backend.lag = lag
+        backend.data_version = version
+    return router
+
+
+def test_without_replicas_uses_primary():
+    router = ReplicaRouter("primary-pool", [])
+    assert router.choose() is router.primary
+    assert router.choose("20250401") is router.primary
+
+
+def test_unchecked_replica_is_not_used():
+    router = ReplicaRouter("primary-pool", [("r1", "r1-pool")])
+    assert router.choose() is router.primary
+
+
+def test_reads_are_spread_over_healthy_replicas():
+    router = make_router(("r1", 0.0, "20250401"), ("r2", 0.0, "20250401"))
+    chosen = Counter(router.choose().name for _ in range(10))
+    assert chosen == {"r1": 5, "r2": 5}
+
+
+def test_lagging_replica_is_skipped():
+    router = make_router(("r1", 120.0, "20250401"), ("r2", 1.0, "20250401"))
+    assert {router.choose().name for _ in range(4)} == {"r2"}
+
+
+def test_min_data_version_routes_to_up_to_date_replica():
+    router = make_router(("old", 0.0, "20250301"), ("new", 0.0, "20250401"))
+    assert {router.choose("20250401").name for _ in range(4)} == {"new"}
+    assert {router.choose("20250301").name for _ in range(4)} == {"old", "new"}
+
+
+def test_min_data_version_falls_back_to_primary():
+    router = make_router(("r1", 0.0, "20250301"))
+    assert router.choose("20250401") is router.primary
+    assert router.stats()["primary_fallbacks_total"] == 1
+
+
+def test_unknown_replica_version_falls_back_to_primary():
+    router = make_router(("r1", 0.0, None))
+    assert router.choose("20250401") is router.primary
+
+
+def test_failing_replica_is_excluded_until_next_check():
+    router = make_router(("r1", 0.0, "20250401"), max_failures=2)
+    replica = router.replicas[0]
+    router.report_failure(replica)
+    assert router.choose() is replica
+    router.report_failure(replica)
+    assert not replica.healthy
+    assert router.choose() is router.primary
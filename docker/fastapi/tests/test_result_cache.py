@@ -0,0 +1,62 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import pytest
+
+from result_cache import QueryResultCache, make_cache_key, normalize_query
+
+
+@pytest.mark.parametrize("a,b", [
+    ('SELECT "a  b" FROM t', 'SELECT "a b" FROM t'),
+    ("SELECT $$x  y$$", "SELECT $$x y$$"),
+    ("SELECT $tag$x  y$tag$", "SELECT $tag$x y$tag$"),
+    ("SELECT E'\\'  x'", "SELECT E'\\' x'"),
+    ("SELECT 'x  y'", "SELECT 'x y'"),
+])
+def test_whitespace_inside_literals_and_identifiers_is_kept(a, b):
+    assert make_cache_key(a, None) != make_cache_key(b, None)
+
+
+def test_whitespace_and_trailing_semicolon_are_normalized():
+    assert normalize_query("  SELECT\n\tname   FROM instructor ;  ") == "SELECT name FROM instructor"
+    assert make_cache_key("SELECT 1", None) == make_cache_key("SELECT  1;", [])
+
+
+def test_params_are_part_of_the_key():
+    query = "SELECT name FROM instructor WHERE instructor_id = %s"
+    assert make_cache_key(query, [1]) != make_cache_key(query, [2])
+
+
+def test_least_recently_used_entry_is_evicted_over_byte_limit():
+    cache = QueryResultCache(max_bytes=30, ttl=60, max_entry_bytes=30)
+    cache.put("a", "x", size=10)
+    cache.put("b", "x", size=10)
+    cache.put("c", "x", size=10)
+    # a を参照すると最も古いのは b になる
+    assert cache.get("a") == "x"
+    cache.put("d", "x", size=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == "x"
+    assert cache.get("d") == "x"
+    assert cache.stats()["bytes"] == 30
+
+
+def test_oversized_entry_is_not_stored():
+    cache = QueryResultCache(max_bytes=100, ttl=60)
+    assert not cache.put("a", "x", size=26)
+    assert cache.get("a") is None
+
+
+def test_expired_entry_is_dropped():
+    cache = QueryResultCache(max_bytes=100, ttl=0)
+    cache.put("a", "x", size=1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_put_after_clear_is_ignored_for_old_generation():
+    cache = QueryResultCache(max_bytes=100, ttl=60)
+    generation = cache.generation
+    cache.clear()
+    assert not cache.put("a", "x", size=1, generation=generation)
@@ -0,0 +1,41 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import asyncio
+
+from query_stream import iterate_in_executor
+from slow_query_log import SlowQueryLog
+
+
+def test_explain_does_not_reexecute_by_default(tmp_path):
+    slow_log = SlowQueryLog(None, str(tmp_path), explain_sample=1.0, explain_interval=0)
+    assert slow_log._explain_mode("a", 200) == "EXPLAIN"
+    assert slow_log._explain_mode("b", 504) == "EXPLAIN"
+
+
+def test_analyze_is_opt_in_and_skipped_for_timeouts(tmp_path):
+    slow_log = SlowQueryLog(None, str(tmp_path), explain_sample=1.0, explain_interval=0, explain_analyze=True)
+    assert slow_log._explain_mode("a", 200) == "EXPLAIN (ANALYZE, BUFFERS)"
+    assert slow_log._explain_mode("b", 504) == "EXPLAIN"
+
+
+class InlineExecutor:
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+def test_stream_observation_finishes_after_the_body_is_sent():
+    events = []
+
+    def chunks():
+        yield b"2\n"
+        events.append("last chunk")
+
+    async def consume():
+        async for chunk in iterate_in_executor(InlineExecutor(), chunks(), b"1\n",
+                                               on_close=lambda: events.append("finish")):
+            events.append(chunk)
+
+    asyncio.run(consume())
+    assert events == [b"1\n", b"2\n", "last chunk", "finish"]
@@ -0,0 +1,85 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import pytest
+
+from query_admission import explain
+from query_engine import run_select
+from sql_validator import QueryValidationError, check_bindable, find_suspicious_param, has_embedded_placeholder, validate_sql
+
+# psycopg2はパラメータをクライアント側で埋め込むため、リテラル・コメント中の %s は
+# パラメータで引用符やコメントを閉じて後続のSQLを実行させることができる
+INJECTION_CASES = [
+    (
+        "SELECT name FROM instructor WHERE name = '%s'",
+        ["x'; COMMIT; DELETE FROM syllabus; COMMIT; --"],
+    ),
+    (
+        "SELECT 1 -- %s",
+        ["\n; COMMIT; DROP TABLE syllabus; --"],
+    ),
+    ("SELECT 1 /* %s */", ["*/; DROP TABLE syllabus; /*"]),
+    ('SELECT "%s" FROM instructor', ['x"; DROP TABLE syllabus; --']),
+    ("SELECT $$%s$$", ["$$; DROP TABLE syllabus; --"]),
+    ("SELECT E'\\' %s'", ["x"]),
+    # 名前付きプレースホルダの名前が2つのリテラルにまたがる
+    ("SELECT '%(' || %(a)s || ')s'", {"a": 1, "' || %(a)s || '": "x"}),
+    ("SELECT 1 -- %(name)s", {"name": "\n; DROP TABLE syllabus"}),
+    # メタデータクエリもパラメータ付きの場合は同じく確認する
+    (
+        "SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' AND table_name = '%s'",
+        ["x'; DROP TABLE syllabus; --"],
+    ),
+]
+
+
+@pytest.mark.parametrize("query,params", INJECTION_CASES)
+def test_rejects_placeholder_inside_literal_comment_or_identifier(query, params):
+    # 疑わしいLIKEパターンの検査では検出できない
+    if isinstance(params, list):
+        assert find_suspicious_param(params) is None
+    with pytest.raises(QueryValidationError, match="Placeholder inside"):
+        validate_sql(query, params)
+
+
+@pytest.mark.parametrize("execute", [run_select, explain])
+@pytest.mark.parametrize("query,params", INJECTION_CASES)
+def test_execution_paths_refuse_before_touching_connection(execute, query, params):
+    # 検証を経ずに渡された場合でも、接続を使う前に拒否する（接続にはNoneを渡す）
+    with pytest.raises(QueryValidationError):
+        execute(None, query, params)
+
+
+@pytest.mark.parametrize("query,params", [
+    ("SELECT name FROM instructor WHERE name = %s", ["藤原 和将"]),
+    ("SELECT name FROM instructor WHERE instructor_id = %(id)s", {"id": 1}),
+    ("SELECT name FROM instructor WHERE name LIKE %s -- 部分一致", ["%藤原%"]),
+    # %% はpsycopg2が % 1文字にするため、リテラル中でも置き換えられない
+    ("SELECT name FROM instructor WHERE name LIKE '%%s%%' AND instructor_id = %s", [1]),
+    ("SELECT name AS \"教員名\" FROM instructor WHERE instructor_id = %s", [1]),
+])
+def test_accepts_placeholders_outside_literals(query, params):
+    validate_sql(query, params)
+
+
+def test_literal_percent_without_params_is_not_interpolated():
+    # パラメータなしのクエリはpsycopg2が埋め込みを行わないため、リテラル中の %s はそのまま
+    query = "SELECT name FROM subject_name WHERE name LIKE '%sample%'"
+    validate_sql(query)
+    check_bindable(query, None)
+    assert has_embedded_placeholder(query)
+    with pytest.raises(QueryValidationError):
+        validate_sql(query, [])
+
+
+@pytest.mark.parametrize("query", [
+    "UPDATE syllabus SET term = '前期'",
+    "SELECT 1; DROP TABLE syllabus",
+    "WITH d AS (DELETE FROM book RETURNING *) SELECT * FROM d",
+    "SELECT * FROM syllabus WHERE term = 'x",
+    "SELECT namE'\\' ; DROP TABLE syllabus; --'",
+])
+def test_rejects_forbidden_queries(query):
+    with pytest.raises(QueryValidationError):
+        validate_sql(query)
@@ -0,0 +1,75 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+from collections import namedtuple
+
+import statement_cache
+from metrics import REGISTRY, fingerprints
+
+Column = namedtuple("Column", "name")
+
+QUERY = "SELECT name FROM instructor WHERE instructor_id = %s"
+
+
+class FakeCursor:
+    def __init__(self, executed):
+        self.executed = executed
+        self.description = [Column("name")]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+
+    def fetchall(self):
+        return [("藤原 和将",)]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self.executed)
+
+
+def sample(mode):
+    return REGISTRY.get_sample_value(
+        "api_statement_execute_seconds_count", {"mode": mode, "fingerprint": fingerprints.label(QUERY)}
+    ) or 0.0
+
+
+def test_prepared_executions_are_timed_separately_from_prepare():
+    before = statement_cache.stats.snapshot()
+    before_count = sample(statement_cache.PREPARED)
+    conn, extras = FakeConnection(), {}
+    for _ in range(3):
+        result = statement_cache.run_prepared(conn, extras, QUERY, [1])
+        assert result.rows == [("藤原 和将",)]
+    after = statement_cache.stats.snapshot()
+    # PREPAREは1回のみで、3回ともEXECUTEの時間を記録する
+    assert sum(1 for sql in conn.executed if sql.startswith("PREPARE")) == 1
+    assert after["prepare_calls_total"] - before["prepare_calls_total"] == 1
+    assert after["prepared_executions_total"] - before["prepared_executions_total"] == 3
+    assert sample(statement_cache.PREPARED) - before_count == 3
+
+
+def test_direct_executions_are_recorded_for_comparison():
+    before = statement_cache.stats.snapshot()
+    before_count = sample(statement_cache.DIRECT)
+    statement_cache.observe_execute(QUERY, statement_cache.DIRECT, 0.004)
+    after = statement_cache.stats.snapshot()
+    assert after["direct_executions_total"] - before["direct_executions_total"] == 1
+    assert after["direct_execute_time_avg"] > 0
+    assert sample(statement_cache.DIRECT) - before_count == 1
+
+
+def test_queries_without_params_are_not_prepared():
+    conn = FakeConnection()
+    assert statement_cache.run_prepared(conn, {}, "SELECT 1", []) is None
+    assert conn.executed == []
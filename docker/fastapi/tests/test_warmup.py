@@ -0,0 +1,102 @@
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+import json
+from contextlib import contextmanager
+
+from warmup import HotQueryTracker, WarmUp, load_queries
+
+
+class FakeCursor:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        pass
+
+
+class FakeConnection:
+    def cursor(self):
+        return FakeCursor()
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """fresh_connection() で未使用の接続を max_size 本まで払い出す"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.created = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+
+    @contextmanager
+    def fresh_connection(self):
+        if self.created >= self.max_size:
+            yield None
+            return
+        self.created += 1
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        try:
+            yield FakeConnection()
+        finally:
+            self.in_use -= 1
+
+
+def test_warms_one_connection_at_a_time():
+    pool = FakePool(max_size=4)
+    executed = []
+    warm_up = WarmUp(timeout=60)
+    warm_up.run(pool, [("SELECT 1", None), ("SELECT 2", None)], lambda conn, query, params: executed.append(query))
+    assert pool.peak_in_use == 1
+    assert warm_up.stats()["connections"] == 4
+    assert len(executed) == 8
+    assert warm_up.ready
+
+
+def test_stops_at_the_deadline():
+    pool = FakePool(max_size=4)
+    warm_up = WarmUp(timeout=0)
+    warm_up.run(pool, [("SELECT 1", None)], lambda conn, query, params: None)
+    assert warm_up.stats()["timed_out"]
+    assert warm_up.stats()["connections"] == 0
+    assert warm_up.ready
+
+
+class FakeObservation:
+    endpoint = "query"
+    fingerprint = "abc"
+    query = "SELECT name FROM instructor WHERE name = %s"
+    params = ["藤原 和将"]
+
+
+def test_saved_queries_do_not_contain_params(tmp_path):
+    tracker = HotQueryTracker()
+    tracker.on_query_finished(FakeObservation(), 200, 1)
+    path = tmp_path / "warmup_queries.json"
+    tracker.save(str(path), 10)
+    assert "藤原" not in path.read_text(encoding="utf-8")
+    assert json.loads(path.read_text(encoding="utf-8")) == [{"query": FakeObservation.query}]
+    assert load_queries(str(path), 10) == [(FakeObservation.query, None)]
+
+
+class LiteralObservation(FakeObservation):
+    query = "SELECT name FROM instructor WHERE name = '藤原 和将'"
+    params = None
+
+
+def test_queries_with_inline_literals_are_not_saved(tmp_path):
+    tracker = HotQueryTracker()
+    tracker.on_query_finished(LiteralObservation(), 200, 1)
+    assert tracker.top(10) == []
+    path = tmp_path / "warmup_queries.json"
+    path.write_text(json.dumps([{"query": LiteralObservation.query}, {"query": FakeObservation.query}],
+                               ensure_ascii=False), encoding="utf-8")
+    assert load_queries(str(path), 10) == [(FakeObservation.query, None)]
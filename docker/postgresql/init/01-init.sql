@@ -351,29 +351,61 @@ CREATE TABLE IF NOT EXISTS syllabus_study_system (
 CREATE INDEX IF NOT EXISTS idx_syllabus_study_system_source ON syllabus_study_system(source_syllabus_id);
 CREATE INDEX IF NOT EXISTS idx_syllabus_study_system_target ON syllabus_study_system(target);
 
+-- migration_history（適用済みマイグレーション）
+CREATE TABLE IF NOT EXISTS migration_history (
+    filename TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_migration_history_version ON migration_history(version);
+
 -- ========== マイグレーションファイルの実行 ==========
 
 -- （この部分はgenerate-init.shで自動挿入されます）
 \i /docker-entrypoint-initdb.d/migrations/V20250619213023__insert_classs.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250619213023__insert_classs.sql', '20250619213023') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250619213231__insert_subclasss.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250619213231__insert_subclasss.sql', '20250619213231') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250620225007__insert_instructors.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250620225007__insert_instructors.sql', '20250620225007') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250620225948__insert_syllabus_masters.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250620225948__insert_syllabus_masters.sql', '20250620225948') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250621183238__insert_subject_names.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250621183238__insert_subject_names.sql', '20250621183238') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250622213107__insert_subject_grades.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250622213107__insert_subject_grades.sql', '20250622213107') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250622213946__insert_lecture_times.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250622213946__insert_lecture_times.sql', '20250622213946') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250623185437__insert_syllabus_instructors.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250623185437__insert_syllabus_instructors.sql', '20250623185437') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250624112612__insert_lecture_session_irregulars.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250624112612__insert_lecture_session_irregulars.sql', '20250624112612') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250624112612__insert_lecture_sessions.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250624112612__insert_lecture_sessions.sql', '20250624112612') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250624112916__insert_lecture_session_instructors.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250624112916__insert_lecture_session_instructors.sql', '20250624112916') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250624124852__insert_syllabuss.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250624124852__insert_syllabuss.sql', '20250624124852') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250624171346__insert_grading_criterions.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250624171346__insert_grading_criterions.sql', '20250624171346') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250630111050__insert_syllabus_study_systems.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250630111050__insert_syllabus_study_systems.sql', '20250630111050') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250701153432__insert_book_uncategorizeds.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250701153432__insert_book_uncategorizeds.sql', '20250701153432') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250701153432__insert_books.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250701153432__insert_books.sql', '20250701153432') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250701153651__insert_syllabus_books.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250701153651__insert_syllabus_books.sql', '20250701153651') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250702122920__insert_facultys.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250702122920__insert_facultys.sql', '20250702122920') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250702123100__insert_subjects.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250702123100__insert_subjects.sql', '20250702123100') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250702123149__insert_subject_attributes.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250702123149__insert_subject_attributes.sql', '20250702123149') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250702130556__insert_syllabus_facultys.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250702130556__insert_syllabus_facultys.sql', '20250702130556') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250704175801_insert_comments_for_mcp.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250704175801_insert_comments_for_mcp.sql', '20250704175801') ON CONFLICT DO NOTHING;
 \i /docker-entrypoint-initdb.d/migrations/V20250705080622__insert_subject_attribute_values.sql
+INSERT INTO migration_history (filename, version) VALUES ('V20250705080622__insert_subject_attribute_values.sql', '20250705080622') ON CONFLICT DO NOTHING;
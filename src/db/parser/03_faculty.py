@@ -4,11 +4,11 @@
 
 import os
 import json
-import glob
 from typing import List, Set
 from datetime import datetime
 from tqdm import tqdm
 from .utils import normalize_faculty_name
+from .corpus import json_file_paths, read_json
 
 def get_current_year() -> int:
     """現在の年度を取得する"""
@@ -37,7 +37,7 @@ def get_faculty_names(year: int) -> Set[str]:
     
     print(f"JSONファイルパターン: {json_pattern}")
     
-    json_files = glob.glob(json_pattern)
+    json_files = json_file_paths(year)
     if not json_files:
         raise FileNotFoundError(f"JSONファイルが見つかりません: {json_pattern}")
     
@@ -46,21 +46,20 @@ def get_faculty_names(year: int) -> Set[str]:
     
     for json_file in tqdm(json_files, desc="JSONファイル処理", unit="file"):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # 基本情報.対象学部.内容から学部名を取得
-                if '基本情報' in data and '対象学部' in data['基本情報'] and '内容' in data['基本情報']['対象学部']:
-                    departments = data['基本情報']['対象学部']['内容']
-                    if departments:
-                        # カンマで区切られた学部名を分割して追加
-                        for dept in departments.split(','):
-                            dept = dept.strip()
-                            if dept:  # 空文字でない場合のみ追加
-                                # 学部課程名を正規化（utils.pyのnormalize_faculty_nameを使用）
-                                normalized_dept = normalize_faculty_name(dept)
-                                if normalized_dept != 'NULL':  # NULLでない場合のみ追加
-                                    faculty_names.add(normalized_dept)
+            data = read_json(json_file)
+            
+            # 基本情報.対象学部.内容から学部名を取得
+            if '基本情報' in data and '対象学部' in data['基本情報'] and '内容' in data['基本情報']['対象学部']:
+                departments = data['基本情報']['対象学部']['内容']
+                if departments:
+                    # カンマで区切られた学部名を分割して追加
+                    for dept in departments.split(','):
+                        dept = dept.strip()
+                        if dept:  # 空文字でない場合のみ追加
+                            # 学部課程名を正規化（utils.pyのnormalize_faculty_nameを使用）
+                            normalized_dept = normalize_faculty_name(dept)
+                            if normalized_dept != 'NULL':  # NULLでない場合のみ追加
+                                faculty_names.add(normalized_dept)
         
         except json.JSONDecodeError as e:
             print(f"\nJSONファイルの解析エラー ({json_file}): {str(e)}")
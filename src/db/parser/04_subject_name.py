@@ -4,11 +4,11 @@
 
 import os
 import json
-import glob
 from typing import List, Set, Dict
 from datetime import datetime
 from tqdm import tqdm
 from .utils import normalize_subject_name, get_year_from_user
+from .corpus import json_file_paths, read_json
 
 def get_subject_names(year: int) -> Set[str]:
     """JSONファイルから科目名を抽出する"""
@@ -19,7 +19,7 @@ def get_subject_names(year: int) -> Set[str]:
     
     print(f"JSONファイルパターン: {json_pattern}")
     
-    json_files = glob.glob(json_pattern)
+    json_files = json_file_paths(year)
     if not json_files:
         raise FileNotFoundError(f"JSONファイルが見つかりません: {json_pattern}")
     
@@ -28,17 +28,16 @@ def get_subject_names(year: int) -> Set[str]:
     
     for json_file in tqdm(json_files, desc="JSONファイル処理", unit="file"):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # 基本情報.科目名.内容から科目名を取得
-                if '基本情報' in data and '科目名' in data['基本情報'] and '内容' in data['基本情報']['科目名']:
-                    subject_name = data['基本情報']['科目名']['内容']
-                    if subject_name:
-                        # 科目名の正規化処理を適用
-                        normalized_name = normalize_subject_name(subject_name)
-                        if normalized_name:  # 空文字でない場合
-                            subject_names.add(normalized_name)
+            data = read_json(json_file)
+            
+            # 基本情報.科目名.内容から科目名を取得
+            if '基本情報' in data and '科目名' in data['基本情報'] and '内容' in data['基本情報']['科目名']:
+                subject_name = data['基本情報']['科目名']['内容']
+                if subject_name:
+                    # 科目名の正規化処理を適用
+                    normalized_name = normalize_subject_name(subject_name)
+                    if normalized_name:  # 空文字でない場合
+                        subject_names.add(normalized_name)
         
         except json.JSONDecodeError as e:
             print(f"\nJSONファイルの解析エラー ({json_file}): {str(e)}")
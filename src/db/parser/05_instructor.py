@@ -4,11 +4,11 @@
 
 import os
 import json
-import glob
 from typing import List, Dict, Set
 from datetime import datetime
 from tqdm import tqdm
 from .utils import normalize_subject_name, get_year_from_user
+from .corpus import json_file_paths, read_json
 
 def get_current_year() -> int:
     """現在の年度を取得する"""
@@ -37,7 +37,7 @@ def get_instructor_names(year: int) -> Set[dict]:
     
     print(f"JSONファイルパターン: {json_pattern}")
     
-    json_files = glob.glob(json_pattern)
+    json_files = json_file_paths(year)
     if not json_files:
         raise FileNotFoundError(f"JSONファイルが見つかりません: {json_pattern}")
     
@@ -46,44 +46,43 @@ def get_instructor_names(year: int) -> Set[dict]:
     
     for json_file in tqdm(json_files, desc="JSONファイル処理", unit="file"):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_json(json_file)
+            
+            # 基本情報から教員情報を取得
+            if '基本情報' in data:
+                basic_info = data['基本情報']
+                kanji_info = basic_info.get('漢字氏名', {}).get('内容', {})
+                kana_info = basic_info.get('カナ氏名', {}).get('内容', {})
                 
-                # 基本情報から教員情報を取得
-                if '基本情報' in data:
-                    basic_info = data['基本情報']
-                    kanji_info = basic_info.get('漢字氏名', {}).get('内容', {})
-                    kana_info = basic_info.get('カナ氏名', {}).get('内容', {})
-                    
-                    # 担当者一覧から教員情報を取得
-                    kanji_instructors = kanji_info.get('担当者一覧', [])
-                    kana_instructors = kana_info.get('担当者一覧', [])
-                    
-                    # 担当者数が一致することを確認
-                    if len(kanji_instructors) != len(kana_instructors):
-                        print(f"\n警告: 漢字氏名とカナ氏名の担当者数が一致しません: {json_file}")
-                        print(f"漢字氏名の担当者数: {len(kanji_instructors)}")
-                        print(f"カナ氏名の担当者数: {len(kana_instructors)}")
-                        continue
+                # 担当者一覧から教員情報を取得
+                kanji_instructors = kanji_info.get('担当者一覧', [])
+                kana_instructors = kana_info.get('担当者一覧', [])
+                
+                # 担当者数が一致することを確認
+                if len(kanji_instructors) != len(kana_instructors):
+                    print(f"\n警告: 漢字氏名とカナ氏名の担当者数が一致しません: {json_file}")
+                    print(f"漢字氏名の担当者数: {len(kanji_instructors)}")
+                    print(f"カナ氏名の担当者数: {len(kana_instructors)}")
+                    continue
+                
+                # 各担当者の情報を処理
+                for kanji_instructor, kana_instructor in zip(kanji_instructors, kana_instructors):
+                    kanji_name = kanji_instructor.get('氏名', '')
+                    kana_name = kana_instructor.get('カナ氏名', '')
                     
-                    # 各担当者の情報を処理
-                    for kanji_instructor, kana_instructor in zip(kanji_instructors, kana_instructors):
-                        kanji_name = kanji_instructor.get('氏名', '')
-                        kana_name = kana_instructor.get('カナ氏名', '')
+                    if kanji_name:  # 漢字名が存在する場合のみ追加
+                        # 名前の正規化処理を適用
+                        normalized_name = normalize_subject_name(kanji_name)
+                        normalized_kana = normalize_subject_name(kana_name) if kana_name else None
                         
-                        if kanji_name:  # 漢字名が存在する場合のみ追加
-                            # 名前の正規化処理を適用
-                            normalized_name = normalize_subject_name(kanji_name)
-                            normalized_kana = normalize_subject_name(kana_name) if kana_name else None
-                            
-                            if normalized_name:  # 空文字でない場合
-                                instructor_info = {
-                                    'name': normalized_name,
-                                    'name_kana': normalized_kana
-                                }
-                                # タプルに変換してセットに追加（重複を防ぐため）
-                                instructor_tuple = tuple(sorted(instructor_info.items()))
-                                instructors.add(instructor_tuple)
+                        if normalized_name:  # 空文字でない場合
+                            instructor_info = {
+                                'name': normalized_name,
+                                'name_kana': normalized_kana
+                            }
+                            # タプルに変換してセットに追加（重複を防ぐため）
+                            instructor_tuple = tuple(sorted(instructor_info.items()))
+                            instructors.add(instructor_tuple)
         
         except json.JSONDecodeError as e:
             print(f"\nJSONファイルの解析エラー ({json_file}): {str(e)}")
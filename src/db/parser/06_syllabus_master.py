@@ -1,9 +1,9 @@
 import os
 import json
-import glob
 from typing import List, Dict, Set
 from datetime import datetime
 from tqdm import tqdm
+from .corpus import json_file_paths, read_json
 
 def get_current_year() -> int:
     """現在の年度を取得する"""
@@ -33,7 +33,7 @@ def get_syllabus_masters(year: int) -> List[Dict]:
     
     # JSONファイルのパターンを取得
     json_pattern = os.path.join(json_dir, "*.json")
-    json_files = glob.glob(json_pattern)
+    json_files = json_file_paths(year)
     
     if not json_files:
         print(f"JSONファイルが見つかりません: {json_pattern}")
@@ -44,8 +44,7 @@ def get_syllabus_masters(year: int) -> List[Dict]:
     
     for json_file in tqdm(json_files, desc="JSONファイルを処理中"):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_json(json_file)
             
             # JSONファイルからシラバスコードを抽出
             # ファイル名から抽出する場合
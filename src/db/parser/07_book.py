@@ -8,7 +8,6 @@
 
 import os
 import json
-import glob
 import csv
 import re
 import requests
@@ -17,6 +16,7 @@ from typing import List, Dict, Set, Tuple, Any, Optional
 from datetime import datetime
 from tqdm import tqdm
 from .utils import get_year_from_user, get_db_connection, get_syllabus_master_id_from_db
+from .corpus import json_file_paths, read_json
 from pathlib import Path
 from sqlalchemy import text
 
@@ -134,206 +134,242 @@ def calculate_similarity(str1: str, str2: str) -> float:
     # 重み付けは0.7:0.3（仕様書に準拠）
     return 0.7 * string_similarity + 0.3 * word_similarity
 
-def get_book_info(year: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    """書籍情報を取得する（正常・未分類の2リストを返す）"""
-    books = []  # 正常な書籍
-    books_uncategorized = []  # 未分類書籍
-    # ISBN重複回避のためのセット
-    processed_isbns = set()
-    
-    # 統計情報
-    stats = {
-        'total_files': 0,
-        'processed_files': 0,
-        'total_books': 0,
-        'valid_books': 0,
-        'uncategorized_books': 0,
-        'duplicate_isbns': 0,
-        'invalid_isbns': 0,
-        'cinii_failures': 0
-    }
+def extract_books_from_single_json(data: Dict[str, Any], session, year: int,
+                                   books: List[Dict[str, Any]], books_uncategorized: List[Dict[str, Any]],
+                                   processed_isbns: Set[str], stats: Dict[str, int]) -> None:
+    """読み込み済みのシラバスJSONから書籍情報を抽出し、books・books_uncategorizedに追加する
+
+    processed_isbnsは重複ISBNの判定に使うため、ファイルをまたいで同じものを渡す。
+    """
+    if '詳細情報' not in data:
+        return
+        
+    detail = data['詳細情報']
+    syllabus_code = data.get('科目コード', '')
     
-    # データベース接続
-    session = get_db_connection()
+    # 基本情報から年度を取得（09_syllabus.pyを参考）
+    basic_info = data.get("基本情報", {})
+    syllabus_year = int(basic_info.get("開講年度", {}).get("内容", str(year)))
     
+    # syllabus_masterからsyllabus_idを取得
     try:
-        # シラバスから書籍情報を取得
-        script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        json_pattern = os.path.join(script_dir, 'syllabus', str(year), 'json', '*.json')
-        
-        json_files = glob.glob(json_pattern)
-        stats['total_files'] = len(json_files)
-        
-        tqdm.write(f"処理開始: {stats['total_files']}個のJSONファイルを処理します")
-        
-        for json_file in tqdm(json_files, desc="シラバスファイル処理中", unit="file"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                if '詳細情報' not in data:
-                    continue
+        syllabus_id = get_syllabus_master_id_from_db(session, syllabus_code, syllabus_year)
+        if not syllabus_id:
+            tqdm.write(f"syllabus_masterに対応するレコードがありません（科目コード: {syllabus_code}, 年度: {syllabus_year}）")
+            return
+    except Exception as e:
+        tqdm.write(f"致命的なDB接続エラー: {e}")
+        raise
+    
+    stats['processed_files'] += 1
+    
+    # 書籍情報処理関数
+    def process_books(books_list, role_type):
+        """書籍リストを処理する共通関数"""
+        if isinstance(books_list, list) and books_list:  # nullでない場合のみ処理
+            stats['total_books'] += len(books_list)
+            
+            # 書籍処理の進捗を表示
+            for book in tqdm(books_list, desc=f"{role_type}処理中 ({syllabus_code})", leave=False):
+                    isbn = book.get('ISBN', '').strip()
+                    title = book.get('書籍名', '').strip()
+                    # 著者名を正規化
+                    author = normalize_author(book.get('著者', ''))
+                    publisher = book.get('出版社', '').strip()
+                    price = None
+                    price_str = book.get('価格', '')
+                    if price_str and price_str.strip():
+                        try:
+                            price = int(price_str.replace(',', '').replace('円', ''))
+                        except ValueError:
+                            pass
+                    role = role_type
+                    now = datetime.now().isoformat()
                     
-                detail = data['詳細情報']
-                syllabus_code = data.get('科目コード', '')
-                
-                # 基本情報から年度を取得（09_syllabus.pyを参考）
-                basic_info = data.get("基本情報", {})
-                syllabus_year = int(basic_info.get("開講年度", {}).get("内容", str(year)))
-                
-                # syllabus_masterからsyllabus_idを取得
-                try:
-                    syllabus_id = get_syllabus_master_id_from_db(session, syllabus_code, syllabus_year)
-                    if not syllabus_id:
-                        tqdm.write(f"syllabus_masterに対応するレコードがありません（科目コード: {syllabus_code}, 年度: {syllabus_year}）")
+                    # ISBNがnullの場合
+                    if not isbn:
+                        books_uncategorized.append({
+                            'syllabus_id': syllabus_id,
+                            'title': title,
+                            'author': author,
+                            'publisher': publisher,
+                            'price': price,
+                            'role': role,
+                            'isbn': None,
+                            'categorization_status': 'ISBNなし',
+                            'created_at': now,
+                            'updated_at': now
+                        })
+                        stats['uncategorized_books'] += 1
                         continue
-                except Exception as e:
-                    tqdm.write(f"致命的なDB接続エラー: {e}")
-                    raise
-                
-                stats['processed_files'] += 1
-                
-                # 書籍情報処理関数
-                def process_books(books_list, role_type):
-                    """書籍リストを処理する共通関数"""
-                    if isinstance(books_list, list) and books_list:  # nullでない場合のみ処理
-                        stats['total_books'] += len(books_list)
+                    
+                    # ISBN重複チェック（正規のISBNのみ）
+                    if validate_isbn(isbn) and isbn in processed_isbns:
+                        # tqdm.write(f"重複ISBNをスキップ: {isbn}")
+                        stats['duplicate_isbns'] += 1
+                        continue
+                    
+                    # ISBNが存在する場合の処理
+                    if not validate_isbn(isbn):
+                        # 数字以外の文字を除去した後の長さでチェック
+                        cleaned_isbn = ''.join(c for c in isbn if c.isdigit() or c.upper() == 'X')
+                        if len(cleaned_isbn) != 10 and len(cleaned_isbn) != 13:
+                            books_uncategorized.append({
+                                'syllabus_id': syllabus_id,
+                                'title': title,
+                                'author': author,
+                                'publisher': publisher,
+                                'price': price,
+                                'role': role,
+                                'isbn': isbn,
+                                'categorization_status': '不正ISBN: 桁数違反',
+                                'created_at': now,
+                                'updated_at': now
+                            })
+                        else:
+                            books_uncategorized.append({
+                                'syllabus_id': syllabus_id,
+                                'title': title,
+                                'author': author,
+                                'publisher': publisher,
+                                'price': price,
+                                'role': role,
+                                'isbn': isbn,
+                                'categorization_status': '不正ISBN: cd違反',
+                                'created_at': now,
+                                'updated_at': now
+                            })
+                        stats['invalid_isbns'] += 1
+                        stats['uncategorized_books'] += 1
+                        continue
+                    
+                    # ISBNが正常な場合の処理（テキストと同様）
+                    # シラバスから価格情報を取得（既に取得済みの場合は再取得しない）
+                    if price is None:
+                        price_str = book.get('価格', '')
+                        if price_str and price_str.strip():
+                            try:
+                                price = int(price_str.replace(',', '').replace('円', ''))
+                            except ValueError:
+                                pass
+                    
+                    # シラバスから書籍名を取得（類似度比較用）
+                    syllabus_title = book.get('書籍名', '').strip()
+                    
+                    # src/books/json/{ISBN}.jsonの存在確認
+                    book_json_path = Path(f"src/books/json/{isbn}.json")
+                    if not book_json_path.exists():
+                        # 既存JSONファイルが存在しない場合はCiNiiから取得
+                        try:
+                            cinii_data = get_cinii_data(isbn)
+                            if not cinii_data:
+                                # tqdm.write(f"CiNiiから取得失敗: {isbn}")
+                                books_uncategorized.append({
+                                    'syllabus_id': syllabus_id,
+                                    'title': title,
+                                    'author': author,
+                                    'publisher': publisher,
+                                    'price': price,
+                                    'role': role,
+                                    'isbn': isbn,
+                                    'categorization_status': '問題ISBN: ciniiデータ不在',
+                                    'created_at': now,
+                                    'updated_at': now
+                                })
+                                continue
+                        except Exception as e:
+                            # tqdm.write(f"CiNii取得中にエラー: {isbn} - {str(e)}")
+                            books_uncategorized.append({
+                                'syllabus_id': syllabus_id,
+                                'title': title,
+                                'author': author,
+                                'publisher': publisher,
+                                'price': price,
+                                'role': role,
+                                'isbn': isbn,
+                                'categorization_status': '問題ISBN: ciniiデータ不在',
+                                'created_at': now,
+                                'updated_at': now
+                            })
+                            continue
+                        continue
+                    
+                    # BibTeX経由で書籍情報を取得
+                    bibtex_book_info = get_book_info_from_bibtex(isbn)
+                    if bibtex_book_info:
+                        # tqdm.write(f"BibTeXから取得した書籍情報: {bibtex_book_info}")
                         
-                        # 書籍処理の進捗を表示
-                        for book in tqdm(books_list, desc=f"{role_type}処理中 ({syllabus_code})", leave=False):
-                                isbn = book.get('ISBN', '').strip()
-                                title = book.get('書籍名', '').strip()
-                                # 著者名を正規化
-                                author = normalize_author(book.get('著者', ''))
-                                publisher = book.get('出版社', '').strip()
-                                price = None
-                                price_str = book.get('価格', '')
-                                if price_str and price_str.strip():
-                                    try:
-                                        price = int(price_str.replace(',', '').replace('円', ''))
-                                    except ValueError:
-                                        pass
-                                role = role_type
-                                now = datetime.now().isoformat()
-                                
-                                # ISBNがnullの場合
-                                if not isbn:
-                                    books_uncategorized.append({
-                                        'syllabus_id': syllabus_id,
-                                        'title': title,
-                                        'author': author,
-                                        'publisher': publisher,
-                                        'price': price,
-                                        'role': role,
-                                        'isbn': None,
-                                        'categorization_status': 'ISBNなし',
-                                        'created_at': now,
-                                        'updated_at': now
-                                    })
-                                    stats['uncategorized_books'] += 1
-                                    continue
-                                
-                                # ISBN重複チェック（正規のISBNのみ）
-                                if validate_isbn(isbn) and isbn in processed_isbns:
-                                    # tqdm.write(f"重複ISBNをスキップ: {isbn}")
-                                    stats['duplicate_isbns'] += 1
-                                    continue
-                                
-                                # ISBNが存在する場合の処理
-                                if not validate_isbn(isbn):
-                                    # 数字以外の文字を除去した後の長さでチェック
-                                    cleaned_isbn = ''.join(c for c in isbn if c.isdigit() or c.upper() == 'X')
-                                    if len(cleaned_isbn) != 10 and len(cleaned_isbn) != 13:
-                                        books_uncategorized.append({
-                                            'syllabus_id': syllabus_id,
-                                            'title': title,
-                                            'author': author,
-                                            'publisher': publisher,
-                                            'price': price,
-                                            'role': role,
-                                            'isbn': isbn,
-                                            'categorization_status': '不正ISBN: 桁数違反',
-                                            'created_at': now,
-                                            'updated_at': now
-                                        })
-                                    else:
-                                        books_uncategorized.append({
-                                            'syllabus_id': syllabus_id,
-                                            'title': title,
-                                            'author': author,
-                                            'publisher': publisher,
-                                            'price': price,
-                                            'role': role,
-                                            'isbn': isbn,
-                                            'categorization_status': '不正ISBN: cd違反',
-                                            'created_at': now,
-                                            'updated_at': now
-                                        })
-                                    stats['invalid_isbns'] += 1
-                                    stats['uncategorized_books'] += 1
-                                    continue
-                                
-                                # ISBNが正常な場合の処理（テキストと同様）
-                                # シラバスから価格情報を取得（既に取得済みの場合は再取得しない）
-                                if price is None:
-                                    price_str = book.get('価格', '')
-                                    if price_str and price_str.strip():
-                                        try:
-                                            price = int(price_str.replace(',', '').replace('円', ''))
-                                        except ValueError:
-                                            pass
-                                
-                                # シラバスから書籍名を取得（類似度比較用）
-                                syllabus_title = book.get('書籍名', '').strip()
-                                
-                                # src/books/json/{ISBN}.jsonの存在確認
-                                book_json_path = Path(f"src/books/json/{isbn}.json")
-                                if not book_json_path.exists():
-                                    # 既存JSONファイルが存在しない場合はCiNiiから取得
-                                    try:
-                                        cinii_data = get_cinii_data(isbn)
-                                        if not cinii_data:
-                                            # tqdm.write(f"CiNiiから取得失敗: {isbn}")
-                                            books_uncategorized.append({
-                                                'syllabus_id': syllabus_id,
-                                                'title': title,
-                                                'author': author,
-                                                'publisher': publisher,
-                                                'price': price,
-                                                'role': role,
-                                                'isbn': isbn,
-                                                'categorization_status': '問題ISBN: ciniiデータ不在',
-                                                'created_at': now,
-                                                'updated_at': now
-                                            })
-                                            continue
-                                    except Exception as e:
-                                        # tqdm.write(f"CiNii取得中にエラー: {isbn} - {str(e)}")
-                                        books_uncategorized.append({
-                                            'syllabus_id': syllabus_id,
-                                            'title': title,
-                                            'author': author,
-                                            'publisher': publisher,
-                                            'price': price,
-                                            'role': role,
-                                            'isbn': isbn,
-                                            'categorization_status': '問題ISBN: ciniiデータ不在',
-                                            'created_at': now,
-                                            'updated_at': now
-                                        })
-                                        continue
-                                    continue
-                                
-                                # BibTeX経由で書籍情報を取得
-                                bibtex_book_info = get_book_info_from_bibtex(isbn)
-                                if bibtex_book_info:
-                                    # tqdm.write(f"BibTeXから取得した書籍情報: {bibtex_book_info}")
+                        # 書籍名の類似度比較
+                        existing_title = bibtex_book_info.get('title', '')
+                        if syllabus_title and existing_title:
+                            similarity = calculate_similarity(syllabus_title, existing_title)
+                            # tqdm.write(f"類似度: {similarity:.3f} (シラバス: {syllabus_title}, BibTeX: {existing_title})")
+                            if similarity < 0.05:
+                                books_uncategorized.append({
+                                    'syllabus_id': syllabus_id,
+                                    'title': title,
+                                    'author': author,
+                                    'publisher': publisher,
+                                    'price': price,
+                                    'role': role,
+                                    'isbn': isbn,
+                                    'categorization_status': '問題レコード: 書籍名類似度低',
+                                    'created_at': now,
+                                    'updated_at': now
+                                })
+                                continue
+                        
+                        # BibTeXデータで空の項目がある場合は未分類に
+                        empty_fields = []
+                        if not bibtex_book_info.get('title', ''):
+                            empty_fields.append('タイトル')
+                        if not bibtex_book_info.get('author', ''):
+                            empty_fields.append('著者')
+                        if not bibtex_book_info.get('publisher', ''):
+                            empty_fields.append('出版社')
+                        if empty_fields:
+                            books_uncategorized.append({
+                                'syllabus_id': syllabus_id,
+                                'title': title,
+                                'author': author,
+                                'publisher': publisher,
+                                'price': price,
+                                'role': role,
+                                'isbn': isbn,
+                                'categorization_status': f'不正BibTeX データ: Null検知 - {", ".join(empty_fields)}が空',
+                                'created_at': now,
+                                'updated_at': now
+                            })
+                            stats['uncategorized_books'] += 1
+                            continue
+                        
+                        # 正常な書籍として登録
+                        book_info = {
+                            'title': bibtex_book_info.get('title', '') if bibtex_book_info.get('title', '') else syllabus_title,
+                            'isbn': isbn,
+                            'author': normalize_author(bibtex_book_info.get('author', '')) if bibtex_book_info.get('author', '') else author,
+                            'publisher': bibtex_book_info.get('publisher', '') if bibtex_book_info.get('publisher', '') else publisher,
+                            'price': price,
+                            'created_at': now
+                        }
+                        books.append(book_info)
+                        processed_isbns.add(isbn)
+                        stats['valid_books'] += 1
+                    else:
+                        # BibTeX取得に失敗した場合は既存のCiNiiデータを使用
+                        try:
+                            with open(book_json_path, 'r', encoding='utf-8') as f:
+                                existing_data = json.load(f)
+                            
+                            if '@graph' in existing_data and len(existing_data['@graph']) > 0:
+                                channel = existing_data['@graph'][0]
+                                if 'items' in channel and len(channel['items']) > 0:
+                                    item = channel['items'][0]
                                     
                                     # 書籍名の類似度比較
-                                    existing_title = bibtex_book_info.get('title', '')
+                                    existing_title = item.get('title', '')
                                     if syllabus_title and existing_title:
                                         similarity = calculate_similarity(syllabus_title, existing_title)
-                                        # tqdm.write(f"類似度: {similarity:.3f} (シラバス: {syllabus_title}, BibTeX: {existing_title})")
                                         if similarity < 0.05:
                                             books_uncategorized.append({
                                                 'syllabus_id': syllabus_id,
@@ -347,15 +383,16 @@ def get_book_info(year: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]
                                                 'created_at': now,
                                                 'updated_at': now
                                             })
+                                            stats['uncategorized_books'] += 1
                                             continue
                                     
-                                    # BibTeXデータで空の項目がある場合は未分類に
+                                    # CiNiiデータで空の項目がある場合は未分類に
                                     empty_fields = []
-                                    if not bibtex_book_info.get('title', ''):
+                                    if not item.get('title', ''):
                                         empty_fields.append('タイトル')
-                                    if not bibtex_book_info.get('author', ''):
+                                    if not item.get('dc:creator', ''):
                                         empty_fields.append('著者')
-                                    if not bibtex_book_info.get('publisher', ''):
+                                    if not item.get('dc:publisher', ''):
                                         empty_fields.append('出版社')
                                     if empty_fields:
                                         books_uncategorized.append({
@@ -366,7 +403,7 @@ def get_book_info(year: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]
                                             'price': price,
                                             'role': role,
                                             'isbn': isbn,
-                                            'categorization_status': f'不正BibTeX データ: Null検知 - {", ".join(empty_fields)}が空',
+                                            'categorization_status': f'不正CiNii データ: Null検知 - {", ".join(empty_fields)}が空',
                                             'created_at': now,
                                             'updated_at': now
                                         })
@@ -374,137 +411,110 @@ def get_book_info(year: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]
                                         continue
                                     
                                     # 正常な書籍として登録
+                                    cinii_title = item.get('title', '')
+                                    cinii_author = normalize_author(item.get('dc:creator', ''))
+                                    cinii_publisher = item.get('dc:publisher', '')
+                                    
                                     book_info = {
-                                        'title': bibtex_book_info.get('title', '') if bibtex_book_info.get('title', '') else syllabus_title,
+                                        'title': cinii_title if cinii_title else syllabus_title,
                                         'isbn': isbn,
-                                        'author': normalize_author(bibtex_book_info.get('author', '')) if bibtex_book_info.get('author', '') else author,
-                                        'publisher': bibtex_book_info.get('publisher', '') if bibtex_book_info.get('publisher', '') else publisher,
+                                        'author': cinii_author if cinii_author else author,
+                                        'publisher': cinii_publisher if cinii_publisher else publisher,
                                         'price': price,
                                         'created_at': now
                                     }
+                                    
+                                    # publisherが配列の場合は最初の要素を使用
+                                    if isinstance(book_info['publisher'], list):
+                                        book_info['publisher'] = book_info['publisher'][0] if book_info['publisher'] else ''
+                                    
                                     books.append(book_info)
                                     processed_isbns.add(isbn)
                                     stats['valid_books'] += 1
                                 else:
-                                    # BibTeX取得に失敗した場合は既存のCiNiiデータを使用
-                                    try:
-                                        with open(book_json_path, 'r', encoding='utf-8') as f:
-                                            existing_data = json.load(f)
-                                        
-                                        if '@graph' in existing_data and len(existing_data['@graph']) > 0:
-                                            channel = existing_data['@graph'][0]
-                                            if 'items' in channel and len(channel['items']) > 0:
-                                                item = channel['items'][0]
-                                                
-                                                # 書籍名の類似度比較
-                                                existing_title = item.get('title', '')
-                                                if syllabus_title and existing_title:
-                                                    similarity = calculate_similarity(syllabus_title, existing_title)
-                                                    if similarity < 0.05:
-                                                        books_uncategorized.append({
-                                                            'syllabus_id': syllabus_id,
-                                                            'title': title,
-                                                            'author': author,
-                                                            'publisher': publisher,
-                                                            'price': price,
-                                                            'role': role,
-                                                            'isbn': isbn,
-                                                            'categorization_status': '問題レコード: 書籍名類似度低',
-                                                            'created_at': now,
-                                                            'updated_at': now
-                                                        })
-                                                        stats['uncategorized_books'] += 1
-                                                        continue
-                                                
-                                                # CiNiiデータで空の項目がある場合は未分類に
-                                                empty_fields = []
-                                                if not item.get('title', ''):
-                                                    empty_fields.append('タイトル')
-                                                if not item.get('dc:creator', ''):
-                                                    empty_fields.append('著者')
-                                                if not item.get('dc:publisher', ''):
-                                                    empty_fields.append('出版社')
-                                                if empty_fields:
-                                                    books_uncategorized.append({
-                                                        'syllabus_id': syllabus_id,
-                                                        'title': title,
-                                                        'author': author,
-                                                        'publisher': publisher,
-                                                        'price': price,
-                                                        'role': role,
-                                                        'isbn': isbn,
-                                                        'categorization_status': f'不正CiNii データ: Null検知 - {", ".join(empty_fields)}が空',
-                                                        'created_at': now,
-                                                        'updated_at': now
-                                                    })
-                                                    stats['uncategorized_books'] += 1
-                                                    continue
-                                                
-                                                # 正常な書籍として登録
-                                                cinii_title = item.get('title', '')
-                                                cinii_author = normalize_author(item.get('dc:creator', ''))
-                                                cinii_publisher = item.get('dc:publisher', '')
-                                                
-                                                book_info = {
-                                                    'title': cinii_title if cinii_title else syllabus_title,
-                                                    'isbn': isbn,
-                                                    'author': cinii_author if cinii_author else author,
-                                                    'publisher': cinii_publisher if cinii_publisher else publisher,
-                                                    'price': price,
-                                                    'created_at': now
-                                                }
-                                                
-                                                # publisherが配列の場合は最初の要素を使用
-                                                if isinstance(book_info['publisher'], list):
-                                                    book_info['publisher'] = book_info['publisher'][0] if book_info['publisher'] else ''
-                                                
-                                                books.append(book_info)
-                                                processed_isbns.add(isbn)
-                                                stats['valid_books'] += 1
-                                            else:
-                                                # itemsが見つからない場合は未分類に
-                                                books_uncategorized.append({
-                                                    'syllabus_id': syllabus_id,
-                                                    'title': title,
-                                                    'author': author,
-                                                    'publisher': publisher,
-                                                    'price': price,
-                                                    'role': role,
-                                                    'isbn': isbn,
-                                                    'categorization_status': '問題ISBN: ciniiデータ不在',
-                                                    'created_at': now,
-                                                    'updated_at': now
-                                                })
-                                                stats['uncategorized_books'] += 1
-                                                stats['cinii_failures'] += 1
-                                    except Exception as e:
-                                        # tqdm.write(f"警告: 既存JSONファイル {book_json_path} の読み込みに失敗: {str(e)}")
-                                        books_uncategorized.append({
-                                            'syllabus_id': syllabus_id,
-                                            'title': title,
-                                            'author': author,
-                                            'publisher': publisher,
-                                            'price': price,
-                                            'role': role,
-                                            'isbn': isbn,
-                                            'categorization_status': '問題ISBN: ciniiデータ不在',
-                                            'created_at': now,
-                                            'updated_at': now
-                                        })
-                                        stats['uncategorized_books'] += 1
-                                        stats['cinii_failures'] += 1
+                                    # itemsが見つからない場合は未分類に
+                                    books_uncategorized.append({
+                                        'syllabus_id': syllabus_id,
+                                        'title': title,
+                                        'author': author,
+                                        'publisher': publisher,
+                                        'price': price,
+                                        'role': role,
+                                        'isbn': isbn,
+                                        'categorization_status': '問題ISBN: ciniiデータ不在',
+                                        'created_at': now,
+                                        'updated_at': now
+                                    })
+                                    stats['uncategorized_books'] += 1
+                                    stats['cinii_failures'] += 1
+                        except Exception as e:
+                            # tqdm.write(f"警告: 既存JSONファイル {book_json_path} の読み込みに失敗: {str(e)}")
+                            books_uncategorized.append({
+                                'syllabus_id': syllabus_id,
+                                'title': title,
+                                'author': author,
+                                'publisher': publisher,
+                                'price': price,
+                                'role': role,
+                                'isbn': isbn,
+                                'categorization_status': '問題ISBN: ciniiデータ不在',
+                                'created_at': now,
+                                'updated_at': now
+                            })
+                            stats['uncategorized_books'] += 1
+                            stats['cinii_failures'] += 1
+
+    # テキスト情報の処理（教科書）
+    if 'テキスト' in detail and '内容' in detail['テキスト'] and detail['テキスト']['内容'] is not None:
+        text_content = detail['テキスト']['内容']
+        if isinstance(text_content, dict) and '書籍' in text_content:
+            process_books(text_content['書籍'], '教科書')
 
-                # テキスト情報の処理（教科書）
-                if 'テキスト' in detail and '内容' in detail['テキスト'] and detail['テキスト']['内容'] is not None:
-                    text_content = detail['テキスト']['内容']
-                    if isinstance(text_content, dict) and '書籍' in text_content:
-                        process_books(text_content['書籍'], '教科書')
+    # 参考文献情報の処理（参考書）
+    if '参考文献' in detail and '内容' in detail['参考文献'] and detail['参考文献']['内容'] is not None:
+        ref_content = detail['参考文献']['内容']
+        if isinstance(ref_content, dict) and '書籍' in ref_content:
+            process_books(ref_content['書籍'], '参考書')
 
-                # 参考文献情報の処理（参考書）
-                if '参考文献' in detail and '内容' in detail['参考文献'] and detail['参考文献']['内容'] is not None:
-                    ref_content = detail['参考文献']['内容']
-                    if isinstance(ref_content, dict) and '書籍' in ref_content:
-                        process_books(ref_content['書籍'], '参考書')
+def get_book_info(year: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """書籍情報を取得する（正常・未分類の2リストを返す）"""
+    books = []  # 正常な書籍
+    books_uncategorized = []  # 未分類書籍
+    # ISBN重複回避のためのセット
+    processed_isbns = set()
+    
+    # 統計情報
+    stats = {
+        'total_files': 0,
+        'processed_files': 0,
+        'total_books': 0,
+        'valid_books': 0,
+        'uncategorized_books': 0,
+        'duplicate_isbns': 0,
+        'invalid_isbns': 0,
+        'cinii_failures': 0
+    }
+    
+    # データベース接続
+    session = get_db_connection()
+    
+    try:
+        # シラバスから書籍情報を取得
+        script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        json_pattern = os.path.join(script_dir, 'syllabus', str(year), 'json', '*.json')
+        
+        json_files = json_file_paths(year)
+        stats['total_files'] = len(json_files)
+        
+        tqdm.write(f"処理開始: {stats['total_files']}個のJSONファイルを処理します")
+        
+        for json_file in tqdm(json_files, desc="シラバスファイル処理中", unit="file"):
+            try:
+                data = read_json(json_file)
+                
+                extract_books_from_single_json(
+                    data, session, year, books, books_uncategorized, processed_isbns, stats
+                )
             except Exception as e:
                 continue
         
@@ -15,7 +15,8 @@ from tqdm import tqdm
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-from utils import normalize_subject_name
+from utils import normalize_subject_name, get_syllabus_master_id_from_db
+from corpus import json_file_paths, read_json
 
 def get_db_connection():
     """データベース接続を取得する"""
@@ -75,27 +76,6 @@ def get_subject_name_id_from_db(session, name: str) -> int:
         session.rollback()
         return None
 
-def get_syllabus_master_id_from_db(session, syllabus_code: str, syllabus_year: int) -> int:
-    """シラバスマスターIDを取得する"""
-    try:
-        # シラバスマスターIDを取得
-        query = text("""
-            SELECT syllabus_id 
-            FROM syllabus_master 
-            WHERE syllabus_code = :code 
-            AND syllabus_year = :year
-        """)
-        
-        result = session.execute(
-            query,
-            {"code": syllabus_code, "year": syllabus_year}
-        ).first()
-        
-        return result[0] if result else None
-    except Exception as e:
-        session.rollback()
-        return None
-
 def create_syllabus_json(syllabi: List[Dict]) -> str:
     """シラバス情報のJSONファイルを作成する"""
     output_dir = os.path.join("updates", "syllabus", "add")
@@ -147,18 +127,12 @@ def get_latest_json(year: int) -> str:
     return os.path.join(data_dir, latest_json)
 
 def get_all_json_files(year: int) -> List[str]:
-    """指定された年度のすべてのJSONファイルを取得する"""
-    data_dir = os.path.join("src", "syllabus", str(year), "json")
-    if not os.path.exists(data_dir):
-        raise FileNotFoundError(f"ディレクトリが見つかりません: {data_dir}")
-    
-    json_files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+    """指定された年度のすべてのJSONファイルを取得する（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+    json_files = json_file_paths(year)
     if not json_files:
-        raise FileNotFoundError(f"JSONファイルが見つかりません: {data_dir}")
+        raise FileNotFoundError(f"JSONファイルが見つかりません: {os.path.join('src', 'syllabus', str(year), 'json')}")
     
-    # ファイル名でソート
-    json_files.sort()
-    return [os.path.join(data_dir, f) for f in json_files]
+    return json_files
 
 def get_year_from_user() -> int:
     """ユーザーから年度を入力してもらう"""
@@ -176,11 +150,17 @@ def get_year_from_user() -> int:
 
 def process_syllabus_json(json_file: str, session) -> tuple[List[Dict], List[str]]:
 	"""個別のシラバスJSONファイルを処理する"""
+	try:
+		json_data = read_json(json_file)
+	except Exception as e:
+		return [], [f"処理中にエラーが発生: {str(e)}"]
+	
+	return extract_syllabus_from_single_json(json_data, session)
+
+def extract_syllabus_from_single_json(json_data: Dict, session) -> tuple[List[Dict], List[str]]:
+	"""読み込み済みのシラバスJSONからシラバス情報を抽出する"""
 	errors = []
 	try:
-		with open(json_file, 'r', encoding='utf-8') as f:
-			json_data = json.load(f)
-		
 		# 基本情報からデータを抽出
 		basic_info = json_data.get("基本情報", {})
 		detail_info = json_data.get("詳細情報", {})
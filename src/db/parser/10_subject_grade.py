@@ -16,6 +16,9 @@ from sqlalchemy.orm import sessionmaker
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
+from utils import get_syllabus_master_id_from_db
+from corpus import json_file_paths, read_json
+
 def get_db_connection():
 	"""データベース接続を取得する"""
 	# 環境変数から接続情報を取得
@@ -46,27 +49,6 @@ def get_db_connection():
 	
 	return session
 
-def get_syllabus_master_id_from_db(session, syllabus_code: str, syllabus_year: int) -> int:
-	"""シラバスマスターIDを取得する"""
-	try:
-		# シラバスマスターIDを取得
-		query = text("""
-			SELECT syllabus_id 
-			FROM syllabus_master 
-			WHERE syllabus_code = :code 
-			AND syllabus_year = :year
-		""")
-		
-		result = session.execute(
-			query,
-			{"code": syllabus_code, "year": syllabus_year}
-		).first()
-		
-		return result[0] if result else None
-	except Exception as e:
-		session.rollback()
-		return None
-
 def get_current_year() -> int:
 	"""現在の年度を取得する"""
 	return datetime.now().year
@@ -160,16 +142,12 @@ def convert_grade_format(grade_text: str) -> List[str]:
 	return [grade_text]
 
 def get_json_files(year: int) -> List[str]:
-	"""指定された年度のすべてのJSONファイルのパスを取得する"""
-	json_dir = os.path.join("src", "syllabus", str(year), "json")
-	if not os.path.exists(json_dir):
-		raise FileNotFoundError(f"ディレクトリが見つかりません: {json_dir}")
-	
-	json_files = [f for f in os.listdir(json_dir) if f.endswith('.json')]
+	"""指定された年度のすべてのJSONファイルのパスを取得する（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+	json_files = json_file_paths(year)
 	if not json_files:
-		raise FileNotFoundError(f"JSONファイルが見つかりません: {json_dir}")
+		raise FileNotFoundError(f"JSONファイルが見つかりません: {os.path.join('src', 'syllabus', str(year), 'json')}")
 	
-	return [os.path.join(json_dir, f) for f in json_files]
+	return json_files
 
 def extract_grade_info_from_single_json(json_data: Dict, session, year: int) -> List[Dict]:
 	"""単一のJSONファイルから学年情報を抽出する"""
@@ -201,8 +179,7 @@ def process_grade_json(json_file: str, session, year: int) -> tuple[List[Dict],
 	"""個別の学年JSONファイルを処理する"""
 	errors = []
 	try:
-		with open(json_file, 'r', encoding='utf-8') as f:
-			json_data = json.load(f)
+		json_data = read_json(json_file)
 		
 		# 学年情報を抽出
 		grades = extract_grade_info_from_single_json(json_data, session, year)
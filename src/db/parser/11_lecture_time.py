@@ -19,13 +19,15 @@ sys.path.append(current_dir)
 
 # utils.pyから関数をインポート
 try:
-	from utils import normalize_subject_name
+	from utils import normalize_subject_name, get_syllabus_master_id_from_db
 except ImportError:
 	# utils.pyが見つからない場合のフォールバック
 	def normalize_subject_name(text: str) -> str:
 		"""文字列を正規化する関数"""
 		return unicodedata.normalize('NFKC', text)
 
+from corpus import json_file_paths, read_json
+
 def get_db_connection():
 	"""データベース接続を取得する"""
 	# 環境変数から接続情報を取得
@@ -56,27 +58,6 @@ def get_db_connection():
 	
 	return session
 
-def get_syllabus_master_id_from_db(session, syllabus_code: str, syllabus_year: int) -> int:
-	"""シラバスマスターIDを取得する"""
-	try:
-		# シラバスマスターIDを取得
-		query = text("""
-			SELECT syllabus_id 
-			FROM syllabus_master 
-			WHERE syllabus_code = :code 
-			AND syllabus_year = :year
-		""")
-		
-		result = session.execute(
-			query,
-			{"code": syllabus_code, "year": syllabus_year}
-		).first()
-		
-		return result[0] if result else None
-	except Exception as e:
-		session.rollback()
-		return None
-
 def get_current_year() -> int:
 	"""現在の年を取得する"""
 	return datetime.now().year
@@ -166,16 +147,12 @@ def parse_lecture_time(time_text: str) -> List[Dict]:
 	return lecture_times
 
 def get_json_files(year: int) -> List[str]:
-	"""指定された年のすべてのJSONファイルを取得する"""
-	json_dir = os.path.join("src", "syllabus", str(year), "json")
-	if not os.path.exists(json_dir):
-		raise FileNotFoundError(f"ディレクトリが見つかりません: {json_dir}")
-	
-	json_files = [f for f in os.listdir(json_dir) if f.endswith('.json')]
+	"""指定された年のすべてのJSONファイルを取得する（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+	json_files = json_file_paths(year)
 	if not json_files:
-		raise FileNotFoundError(f"JSONファイルが見つかりません: {json_dir}")
+		raise FileNotFoundError(f"JSONファイルが見つかりません: {os.path.join('src', 'syllabus', str(year), 'json')}")
 	
-	return [os.path.join(json_dir, f) for f in json_files]
+	return json_files
 
 def extract_lecture_time_from_single_json(json_data: Dict, session, year: int) -> List[Dict]:
 	"""単一JSONファイルから講義時間情報を抽出する"""
@@ -215,8 +192,7 @@ def process_lecture_time_json(json_file: str, session, year: int) -> tuple[List[
 	"""JSONファイルから講義時間情報を抽出する"""
 	errors = []
 	try:
-		with open(json_file, 'r', encoding='utf-8') as f:
-			json_data = json.load(f)
+		json_data = read_json(json_file)
 		
 		# 講義時間情報を抽出
 		lecture_times = extract_lecture_time_from_single_json(json_data, session, year)
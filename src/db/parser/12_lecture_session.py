@@ -4,6 +4,7 @@
 # Last Updated: 2025/6/23
 # Cursorはversionをいじるな
 
+import argparse
 import os
 import json
 import sys
@@ -22,7 +23,7 @@ sys.path.append(current_dir)
 
 # utils.pyから関数をインポート
 try:
-	from utils import normalize_subject_name, process_session_data, is_regular_session_list
+	from utils import normalize_subject_name, get_syllabus_master_id_from_db, get_syllabus_master_index, process_session_data, is_regular_session_list
 except ImportError:
 	# utils.pyが見つからない場合のフォールバック関数
 	def normalize_subject_name(text: str) -> str:
@@ -37,6 +38,9 @@ except ImportError:
 		"""フォールバック関数"""
 		return False
 
+from parallel import map_json_files
+from corpus import json_file_paths, read_json
+
 def get_db_connection():
 	"""データベース接続を取得する"""
 	# 環境変数から接続情報を取得
@@ -67,36 +71,6 @@ def get_db_connection():
 	
 	return session
 
-def get_syllabus_master_id_from_db(session, syllabus_code: str, syllabus_year: int) -> Optional[int]:
-	"""シラバスマスターのIDを取得する"""
-	try:
-		# シラバスマスターのIDを検索
-		query = text("""
-			SELECT syllabus_id 
-			FROM syllabus_master 
-			WHERE syllabus_code = :code 
-			AND syllabus_year = :year
-		""")
-		
-		result = session.execute(
-			query,
-			{"code": syllabus_code, "year": syllabus_year}
-		).first()
-		
-		if result and result[0] is not None:
-			syllabus_id = result[0]
-			# 整数型であることを確認
-			if isinstance(syllabus_id, int) and syllabus_id > 0:
-				return syllabus_id
-			else:
-				print(f"警告: 無効なsyllabus_idが返されました: {syllabus_id} (型: {type(syllabus_id)})")
-				return None
-		return None
-	except Exception as e:
-		print(f"データベースエラー: {syllabus_code} ({syllabus_year}) - {str(e)}")
-		session.rollback()
-		return None
-
 def get_current_year() -> int:
 	"""現在の年を取得する"""
 	return datetime.now().year
@@ -179,16 +153,8 @@ def parse_lecture_sessions_from_schedule(schedule_data: List[Dict]) -> List[Dict
 	return unique_sessions
 
 def get_json_files(year: int) -> List[str]:
-	"""指定された年のJSONファイル一覧を取得"""
-	json_dir = os.path.join("src", "syllabus", str(year), "json")
-	json_files = []
-	
-	if os.path.exists(json_dir):
-		for file in os.listdir(json_dir):
-			if file.endswith('.json'):
-				json_files.append(os.path.join(json_dir, file))
-	
-	return json_files
+	"""指定された年のJSONファイル一覧を取得（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+	return json_file_paths(year)
 
 def extract_lecture_session_from_single_json(json_data: Dict, session, year: int, json_file: str) -> tuple[List[Dict], List[str]]:
 	"""単一のJSONファイルから通常の講義セッション情報を抽出"""
@@ -236,14 +202,27 @@ def extract_lecture_session_from_single_json(json_data: Dict, session, year: int
 	
 	return lecture_sessions, errors
 
+def extract_lecture_session_from_file(json_file: str, session, year: int) -> Tuple[List[Dict], List[str], Optional[str]]:
+	"""1ファイル分の通常の講義セッション情報を抽出する（--workers指定時はワーカープロセスで実行）
+	
+	Returns:
+		Tuple[List[Dict], List[str], Optional[str]]: (講義セッション, エラー, ファイル読み込みエラー)
+	"""
+	try:
+		json_data = read_json(json_file)
+		
+		lecture_sessions, errors = extract_lecture_session_from_single_json(json_data, session, year, json_file)
+		return lecture_sessions, errors, None
+	except Exception as e:
+		return [], [], f"ファイル読み込みエラー {json_file}: {str(e)}"
+
 def process_lecture_session_json(json_file: str, session, year: int) -> tuple[List[Dict], List[str]]:
 	"""JSONファイルを処理して通常の講義セッション情報を抽出"""
 	all_lecture_sessions = []
 	all_errors = []
 	
 	try:
-		with open(json_file, 'r', encoding='utf-8') as f:
-			json_data = json.load(f)
+		json_data = read_json(json_file)
 		
 		lecture_sessions, errors = extract_lecture_session_from_single_json(json_data, session, year, json_file)
 		
@@ -329,10 +308,15 @@ def create_error_csv(all_errors: List[str], final_session_errors: List[str], yea
 
 def main():
 	"""メイン処理"""
+	parser = argparse.ArgumentParser(description="通常講義セッション情報抽出処理")
+	parser.add_argument("--year", type=int, help="対象年度（省略時は入力を求める）")
+	parser.add_argument("--workers", type=int, default=1, help="並列に処理するプロセス数（1で逐次実行）")
+	args = parser.parse_args()
+	
 	print("通常講義セッション情報抽出処理を開始します...")
 	
 	# 年を取得
-	year = get_year_from_user()
+	year = args.year or get_year_from_user()
 	
 	# JSONファイル一覧を取得
 	json_files = get_json_files(year)
@@ -347,6 +331,9 @@ def main():
 		print(f"データベース接続エラー: {str(e)}")
 		return
 	
+	# syllabus_masterの対応表を読み込んでおく（ワーカープロセスはDBに接続しない）
+	get_syllabus_master_index(session).preload(year)
+	
 	# 統計情報の初期化
 	stats = {
 		'total_files': len(json_files),
@@ -383,36 +370,34 @@ def main():
 		# 処理開始時のメッセージ
 		tqdm.write(f"\n{'='*60}")
 		tqdm.write(f"通常講義セッション情報抽出処理 - 対象年度: {year}")
+		if args.workers > 1:
+			tqdm.write(f"並列実行: {args.workers}プロセス")
 		tqdm.write(f"{'='*60}")
 		
-		for i, json_file in enumerate(tqdm(json_files, desc="JSONファイル処理中", unit="file")):
-			try:
-				with open(json_file, 'r', encoding='utf-8') as f:
-					json_data = json.load(f)
-				
-				lecture_sessions, errors = extract_lecture_session_from_single_json(json_data, session, year, json_file)
-				
-				# 統計情報の更新
-				stats['processed_files'] += 1
-				stats['total_items'] += len(lecture_sessions)
-				stats['valid_items'] += len(lecture_sessions)
-				stats['error_items'] += len(errors)
-				
-				# 通常の講義セッションを書き込み
-				for session_data in lecture_sessions:
-					if not lecture_first:
-						lecture_f.write(',\n')
-					json.dump(session_data, lecture_f, ensure_ascii=False, indent=2)
-					lecture_first = False
-					lecture_session_count += 1
-				
-				all_errors.extend(errors)
-				
-			except Exception as e:
-				error_msg = f"ファイル読み込みエラー {json_file}: {str(e)}"
-				tqdm.write(f"エラー: {error_msg}")
-				all_errors.append(error_msg)
+		# 結果はjson_filesの順に返るため、並列実行でも出力は逐次実行と同じになる
+		results = map_json_files(extract_lecture_session_from_file, json_files, session, (year,), args.workers)
+		for lecture_sessions, errors, load_error in tqdm(results, total=len(json_files), desc="JSONファイル処理中", unit="file"):
+			if load_error:
+				tqdm.write(f"エラー: {load_error}")
+				all_errors.append(load_error)
 				stats['error_items'] += 1
+				continue
+			
+			# 統計情報の更新
+			stats['processed_files'] += 1
+			stats['total_items'] += len(lecture_sessions)
+			stats['valid_items'] += len(lecture_sessions)
+			stats['error_items'] += len(errors)
+			
+			# 通常の講義セッションを書き込み
+			for session_data in lecture_sessions:
+				if not lecture_first:
+					lecture_f.write(',\n')
+				json.dump(session_data, lecture_f, ensure_ascii=False, indent=2)
+				lecture_first = False
+				lecture_session_count += 1
+			
+			all_errors.extend(errors)
 		
 		# ファイルを閉じる
 		lecture_f.write('\n]')
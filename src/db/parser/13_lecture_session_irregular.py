@@ -21,7 +21,7 @@ sys.path.append(current_dir)
 
 # utils.pyから関数をインポート
 try:
-	from utils import normalize_subject_name, process_session_data, is_regular_session_list
+	from utils import normalize_subject_name, get_syllabus_master_id_from_db, process_session_data, is_regular_session_list
 except ImportError:
 	# utils.pyが見つからない場合のフォールバック関数
 	def normalize_subject_name(text: str) -> str:
@@ -36,6 +36,8 @@ except ImportError:
 		"""フォールバック関数"""
 		return False
 
+from corpus import json_file_paths, read_json
+
 def get_db_connection():
 	"""データベース接続を取得する"""
 	# 環境変数から接続情報を取得
@@ -66,28 +68,6 @@ def get_db_connection():
 	
 	return session
 
-def get_syllabus_master_id_from_db(session, syllabus_code: str, syllabus_year: int) -> int:
-	"""シラバスマスターのIDを取得する"""
-	try:
-		# シラバスマスターのIDを検索
-		query = text("""
-			SELECT syllabus_id 
-			FROM syllabus_master 
-			WHERE syllabus_code = :code 
-			AND syllabus_year = :year
-		""")
-		
-		result = session.execute(
-			query,
-			{"code": syllabus_code, "year": syllabus_year}
-		).first()
-		
-		return result[0] if result else None
-	except Exception as e:
-		print(f"データベースエラー: {syllabus_code} ({syllabus_year}) - {str(e)}")
-		session.rollback()
-		return None
-
 def get_current_year() -> int:
 	"""現在の年を取得する"""
 	return datetime.now().year
@@ -188,16 +168,8 @@ def parse_lecture_sessions_irregular_from_schedule(schedule_data: List[Dict]) ->
 	return lecture_sessions_irregular
 
 def get_json_files(year: int) -> List[str]:
-	"""指定された年のJSONファイル一覧を取得"""
-	json_dir = os.path.join("src", "syllabus", str(year), "json")
-	json_files = []
-	
-	if os.path.exists(json_dir):
-		for file in os.listdir(json_dir):
-			if file.endswith('.json'):
-				json_files.append(os.path.join(json_dir, file))
-	
-	return json_files
+	"""指定された年のJSONファイル一覧を取得（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+	return json_file_paths(year)
 
 def extract_lecture_session_irregular_from_single_json(json_data: Dict, session, year: int, json_file: str) -> tuple[List[Dict], List[str]]:
 	"""単一のJSONファイルから不規則な講義セッション情報を抽出"""
@@ -246,8 +218,7 @@ def process_lecture_session_irregular_json(json_file: str, session, year: int) -
 	all_errors = []
 	
 	try:
-		with open(json_file, 'r', encoding='utf-8') as f:
-			json_data = json.load(f)
+		json_data = read_json(json_file)
 		
 		lecture_sessions_irregular, errors = extract_lecture_session_irregular_from_single_json(json_data, session, year, json_file)
 		
@@ -4,11 +4,80 @@
 
 import os
 import json
-import glob
 from typing import List, Dict, Set
 from datetime import datetime
 from tqdm import tqdm
 from .utils import get_db_connection, get_syllabus_master_id_from_db, get_year_from_user, normalize_subject_name
+from .corpus import json_file_paths, read_json
+
+def extract_syllabus_instructor_from_single_json(data: Dict, year: int, json_file: str, debug: bool = False) -> List[Dict]:
+    """読み込み済みのシラバスJSONから教員名を抽出する（IDの解決はprocess_syllabus_instructor_dataで行う）"""
+    syllabus_instructors = []
+    
+    # 基本情報から科目コードと年度を取得
+    syllabus_code = data.get("科目コード")
+    basic_info = data.get("基本情報", {})
+    syllabus_year = int(basic_info.get("開講年度", {}).get("内容", str(year)))
+    
+    if not syllabus_code:
+        return syllabus_instructors
+    
+    # 指定されたパスから教員名を取得
+    # 基本情報.漢字氏名.内容.担当者一覧.氏名
+    instructor_names = []
+    
+    # パスを段階的に取得
+    kanji_name_info = basic_info.get("漢字氏名", {})
+    content_info = kanji_name_info.get("内容", {})
+    instructor_list = content_info.get("担当者一覧", [])
+    
+    # デバッグ出力（最初の数ファイルのみ）
+    if debug:
+        print(f"\nデバッグ: {os.path.basename(json_file)}")
+        print(f"  漢字氏名情報: {kanji_name_info}")
+        print(f"  内容情報: {content_info}")
+        print(f"  担当者一覧: {instructor_list}")
+    
+    # 担当者一覧から氏名を取得
+    if isinstance(instructor_list, list):
+        for instructor in instructor_list:
+            if isinstance(instructor, dict) and "氏名" in instructor:
+                instructor_name = instructor["氏名"]
+                if instructor_name and instructor_name.strip():
+                    instructor_names.append(instructor_name.strip())
+    
+    # 担当者一覧が取得できない場合の代替手段
+    if not instructor_names:
+        # 文字列表記を取得
+        text_notation = content_info.get("文字列表記")
+        if text_notation and text_notation.strip():
+            instructor_names.append(text_notation.strip())
+        
+        # 元の内容を取得
+        original_content = kanji_name_info.get("元の内容")
+        if original_content and original_content.strip():
+            instructor_names.append(original_content.strip())
+    
+    # デバッグ出力（最初の数ファイルのみ）
+    if debug:
+        print(f"  取得された教員名: {instructor_names}")
+    
+    # 各教員についてシラバス教員関連情報を作成
+    for instructor_name in instructor_names:
+        if instructor_name and instructor_name.strip():
+            # 教員名を正規化（既存のnormalize_subject_name関数を使用）
+            normalized_name = normalize_subject_name(instructor_name.strip())
+            
+            syllabus_instructor = {
+                "syllabus_code": syllabus_code,
+                "syllabus_year": syllabus_year,
+                "instructor_name": normalized_name,
+                "original_name": instructor_name.strip(),
+                "source_file": os.path.basename(json_file)
+            }
+            syllabus_instructors.append(syllabus_instructor)
+    
+    return syllabus_instructors
 
 def get_syllabus_instructor_data(year: int) -> List[Dict]:
     """JSONファイルからシラバス教員関連情報を取得する"""
@@ -18,7 +87,7 @@ def get_syllabus_instructor_data(year: int) -> List[Dict]:
     script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     json_pattern = os.path.join(script_dir, "syllabus", str(year), "json", "*.json")
     
-    json_files = glob.glob(json_pattern)
+    json_files = json_file_paths(year)
     
     if not json_files:
         print(f"警告: {year}年度のJSONファイルが見つかりません: {json_pattern}")
@@ -32,79 +101,22 @@ def get_syllabus_instructor_data(year: int) -> List[Dict]:
     
     for json_file in tqdm(json_files, desc="シラバス教員情報を抽出中"):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_json(json_file)
             
-            # 基本情報から科目コードと年度を取得
-            syllabus_code = data.get("科目コード")
-            basic_info = data.get("基本情報", {})
-            syllabus_year = int(basic_info.get("開講年度", {}).get("内容", str(year)))
-            
-            if not syllabus_code:
+            if not data.get("科目コード"):
                 continue
             
-            # 指定されたパスから教員名を取得
-            # 基本情報.漢字氏名.内容.担当者一覧.氏名
-            instructor_names = []
-            
             try:
-                # パスを段階的に取得
-                kanji_name_info = basic_info.get("漢字氏名", {})
-                content_info = kanji_name_info.get("内容", {})
-                instructor_list = content_info.get("担当者一覧", [])
-                
-                # デバッグ出力（最初の数ファイルのみ）
-                if processed_files < 5:
-                    print(f"\nデバッグ: {os.path.basename(json_file)}")
-                    print(f"  漢字氏名情報: {kanji_name_info}")
-                    print(f"  内容情報: {content_info}")
-                    print(f"  担当者一覧: {instructor_list}")
-                
-                # 担当者一覧から氏名を取得
-                if isinstance(instructor_list, list):
-                    for instructor in instructor_list:
-                        if isinstance(instructor, dict) and "氏名" in instructor:
-                            instructor_name = instructor["氏名"]
-                            if instructor_name and instructor_name.strip():
-                                instructor_names.append(instructor_name.strip())
-                
-                # 担当者一覧が取得できない場合の代替手段
-                if not instructor_names:
-                    # 文字列表記を取得
-                    text_notation = content_info.get("文字列表記")
-                    if text_notation and text_notation.strip():
-                        instructor_names.append(text_notation.strip())
-                    
-                    # 元の内容を取得
-                    original_content = kanji_name_info.get("元の内容")
-                    if original_content and original_content.strip():
-                        instructor_names.append(original_content.strip())
-                
-                # デバッグ出力（最初の数ファイルのみ）
-                if processed_files < 5:
-                    print(f"  取得された教員名: {instructor_names}")
-                
+                instructors = extract_syllabus_instructor_from_single_json(
+                    data, year, json_file, debug=processed_files < 5
+                )
                 processed_files += 1
-                
             except Exception as e:
                 print(f"教員名取得エラー: {json_file} - {str(e)}")
                 continue
             
-            # 各教員についてシラバス教員関連情報を作成
-            for instructor_name in instructor_names:
-                if instructor_name and instructor_name.strip():
-                    # 教員名を正規化（既存のnormalize_subject_name関数を使用）
-                    normalized_name = normalize_subject_name(instructor_name.strip())
-                    
-                    syllabus_instructor = {
-                        "syllabus_code": syllabus_code,
-                        "syllabus_year": syllabus_year,
-                        "instructor_name": normalized_name,
-                        "original_name": instructor_name.strip(),
-                        "source_file": os.path.basename(json_file)
-                    }
-                    syllabus_instructors.append(syllabus_instructor)
-                    found_instructors += 1
+            syllabus_instructors.extend(instructors)
+            found_instructors += len(instructors)
                     
         except Exception as e:
             print(f"エラー: {json_file}の処理中にエラーが発生しました: {str(e)}")
@@ -3,6 +3,7 @@
 # Project Version: v3.0.0
 # Last Updated: 2025/6/23
 
+import argparse
 import os
 import json
 import sys
@@ -21,7 +22,7 @@ sys.path.append(current_dir)
 
 # utils.pyから関数をインポート
 try:
-	from utils import normalize_subject_name, get_db_connection, get_syllabus_master_id_from_db, process_session_data, is_regular_session_list
+	from utils import normalize_subject_name, get_db_connection, get_syllabus_master_id_from_db, get_syllabus_master_index, process_session_data, is_regular_session_list, LookupCache
 except ImportError:
 	# utils.pyが見つからない場合のフォールバック関数
 	def normalize_subject_name(text: str) -> str:
@@ -84,8 +85,39 @@ except ImportError:
 		"""フォールバック関数"""
 		return False, 0, "", None
 
+from parallel import map_json_files
+from corpus import json_file_paths, read_json
+
+def load_lookup_maps(session) -> None:
+	"""instructor・lecture_session・lecture_session_irregularを一括で読み込み、session.infoに保持する
+	
+	読み込み後は get_instructor_id_from_db 等がDBに問い合わせずに対応表を引く。
+	--workers指定時は、この対応表をワーカープロセスに渡す。
+	"""
+	session.info['instructor_lookups'] = LookupCache.load(session, 'instructor')
+	
+	# (syllabus_id, session_number) -> lecture_session_id（重複時はIDの小さいもの）
+	rows = session.execute(text("""
+		SELECT lecture_session_id, syllabus_id, session_number
+		FROM lecture_session
+		ORDER BY lecture_session_id
+	""")).all()
+	lecture_session_ids = {}
+	for lecture_session_id, syllabus_id, session_number in rows:
+		lecture_session_ids.setdefault((syllabus_id, session_number), lecture_session_id)
+	session.info['lecture_session_ids'] = lecture_session_ids
+	
+	rows = session.execute(text("""
+		SELECT DISTINCT syllabus_id FROM lecture_session_irregular
+	""")).all()
+	session.info['irregular_syllabus_ids'] = {row[0] for row in rows}
+
 def get_instructor_id_from_db(session, instructor_name: str) -> Optional[int]:
 	"""教員名からinstructor_idを取得する"""
+	lookups = session.info.get('instructor_lookups')
+	if lookups is not None:
+		return lookups.get_id('instructor', instructor_name)
+	
 	try:
 		# 教員名を正規化
 		normalized_name = normalize_subject_name(instructor_name)
@@ -110,6 +142,10 @@ def get_instructor_id_from_db(session, instructor_name: str) -> Optional[int]:
 
 def get_lecture_session_id_from_db(session, syllabus_id: int, session_number: int) -> Optional[int]:
 	"""シラバスIDと回数からlecture_session_idを取得する"""
+	lecture_session_ids = session.info.get('lecture_session_ids')
+	if lecture_session_ids is not None:
+		return lecture_session_ids.get((syllabus_id, session_number))
+	
 	try:
 		query = text("""
 			SELECT lecture_session_id 
@@ -217,19 +253,15 @@ def extract_instructors_from_schedule(schedule_data: List[Dict]) -> tuple[List[T
 	return lecture_session_instructors, null_instructor_count
 
 def get_json_files(year: int) -> List[str]:
-	"""指定された年のJSONファイル一覧を取得"""
-	json_dir = os.path.join("src", "syllabus", str(year), "json")
-	json_files = []
-	
-	if os.path.exists(json_dir):
-		for file in os.listdir(json_dir):
-			if file.endswith('.json'):
-				json_files.append(os.path.join(json_dir, file))
-	
-	return json_files
+	"""指定された年のJSONファイル一覧を取得（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+	return json_file_paths(year)
 
 def check_lecture_session_irregular_exists(session, syllabus_id: int) -> bool:
 	"""lecture_session_irregularテーブルにsyllabus_idが存在するかチェック"""
+	irregular_syllabus_ids = session.info.get('irregular_syllabus_ids')
+	if irregular_syllabus_ids is not None:
+		return syllabus_id in irregular_syllabus_ids
+	
 	query = text("""
 		SELECT COUNT(*) FROM lecture_session_irregular 
 		WHERE syllabus_id = :syllabus_id
@@ -315,14 +347,29 @@ def extract_lecture_session_instructor_from_single_json(json_data: Dict, session
 	
 	return lecture_session_instructors, errors
 
+def extract_lecture_session_instructor_from_file(json_file: str, session, year: int, max_lecture_session_id: int = None) -> Tuple[List[Dict], List[str], int, Optional[str]]:
+	"""1ファイル分の講義回数担当者情報を抽出する（--workers指定時はワーカープロセスで実行）
+	
+	Returns:
+		Tuple[List[Dict], List[str], int, Optional[str]]: (講義回数担当者, エラー, 講師名null件数, ファイル読み込みエラー)
+	"""
+	# ワーカープロセスでは呼び出し元のstatsを更新できないため、件数は戻り値で返す
+	stats = {'null_instructor_count': 0}
+	try:
+		json_data = read_json(json_file)
+		
+		lecture_session_instructors, errors = extract_lecture_session_instructor_from_single_json(json_data, session, year, json_file, stats, max_lecture_session_id)
+		return lecture_session_instructors, errors, stats['null_instructor_count'], None
+	except Exception as e:
+		return [], [], stats['null_instructor_count'], f"ファイル読み込みエラー {json_file}: {str(e)}"
+
 def process_lecture_session_instructor_json(json_file: str, session, year: int) -> tuple[List[Dict], List[str]]:
 	"""JSONファイルを処理して講義回数担当者情報を抽出"""
 	all_lecture_session_instructors = []
 	all_errors = []
 	
 	try:
-		with open(json_file, 'r', encoding='utf-8') as f:
-			json_data = json.load(f)
+		json_data = read_json(json_file)
 		
 		lecture_session_instructors, errors = extract_lecture_session_instructor_from_single_json(json_data, session, year, json_file)
 		
@@ -408,10 +455,15 @@ def create_error_csv(all_errors: List[str], final_errors: List[str], year: int)
 
 def main():
 	"""メイン処理"""
+	parser = argparse.ArgumentParser(description="講義回数担当者情報抽出処理")
+	parser.add_argument("--year", type=int, help="対象年度（省略時は入力を求める）")
+	parser.add_argument("--workers", type=int, default=1, help="並列に処理するプロセス数（1で逐次実行）")
+	args = parser.parse_args()
+	
 	print("講義回数担当者情報抽出処理を開始します...")
 	
 	# 年を取得
-	year = get_year_from_user()
+	year = args.year or get_year_from_user()
 	
 	# JSONファイル一覧を取得
 	json_files = get_json_files(year)
@@ -446,6 +498,10 @@ def main():
 		tqdm.write("lecture_session_idの最大値の取得に失敗しました")
 		return
 	
+	# 参照するマスタを一括で読み込んでおく（ワーカープロセスはDBに接続しない）
+	get_syllabus_master_index(session).preload(year)
+	load_lookup_maps(session)
+	
 	# 出力ファイルの準備
 	timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 	
@@ -471,35 +527,34 @@ def main():
 	try:
 		# 処理開始時のメッセージ
 		tqdm.write(f"講義回数担当者情報抽出処理 - 対象年度: {year}")
+		if args.workers > 1:
+			tqdm.write(f"並列実行: {args.workers}プロセス")
 		
-		for i, json_file in enumerate(tqdm(json_files, desc="JSONファイル処理中", unit="file")):
-			try:
-				with open(json_file, 'r', encoding='utf-8') as f:
-					json_data = json.load(f)
-				
-				lecture_session_instructors, errors = extract_lecture_session_instructor_from_single_json(json_data, session, year, json_file, stats, max_lecture_session_id)
-				
-				# 統計情報の更新
-				stats['processed_files'] += 1
-				stats['total_items'] += len(lecture_session_instructors)
-				stats['valid_items'] += len(lecture_session_instructors)
-				stats['error_items'] += len(errors)
-				
-				# 講義回数担当者を書き込み
-				for instructor_data in lecture_session_instructors:
-					if not instructor_first:
-						instructor_f.write(',\n')
-					json.dump(instructor_data, instructor_f, ensure_ascii=False, indent=2)
-					instructor_first = False
-					lecture_session_instructor_count += 1
-				
-				all_errors.extend(errors)
-				
-			except Exception as e:
-				error_msg = f"ファイル読み込みエラー {json_file}: {str(e)}"
-				tqdm.write(f"エラー: {error_msg}")
-				all_errors.append(error_msg)
+		# 結果はjson_filesの順に返るため、並列実行でも出力は逐次実行と同じになる
+		results = map_json_files(extract_lecture_session_instructor_from_file, json_files, session, (year, max_lecture_session_id), args.workers)
+		for lecture_session_instructors, errors, null_instructor_count, load_error in tqdm(results, total=len(json_files), desc="JSONファイル処理中", unit="file"):
+			stats['null_instructor_count'] += null_instructor_count
+			if load_error:
+				tqdm.write(f"エラー: {load_error}")
+				all_errors.append(load_error)
 				stats['error_items'] += 1
+				continue
+			
+			# 統計情報の更新
+			stats['processed_files'] += 1
+			stats['total_items'] += len(lecture_session_instructors)
+			stats['valid_items'] += len(lecture_session_instructors)
+			stats['error_items'] += len(errors)
+			
+			# 講義回数担当者を書き込み
+			for instructor_data in lecture_session_instructors:
+				if not instructor_first:
+					instructor_f.write(',\n')
+				json.dump(instructor_data, instructor_f, ensure_ascii=False, indent=2)
+				instructor_first = False
+				lecture_session_instructor_count += 1
+			
+			all_errors.extend(errors)
 		
 		# ファイルを閉じる
 		instructor_f.write('\n]')
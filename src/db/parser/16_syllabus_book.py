@@ -8,13 +8,13 @@
 
 import os
 import json
-import glob
 import csv
 import re
 from typing import List, Dict, Set, Tuple, Any, Optional
 from datetime import datetime
 from tqdm import tqdm
 from .utils import get_year_from_user, get_db_connection, get_syllabus_master_id_from_db
+from .corpus import json_file_paths, read_json
 from pathlib import Path
 from sqlalchemy import text
 
@@ -96,15 +96,14 @@ def get_syllabus_book_info(year: int) -> Tuple[List[Dict[str, Any]], List[Dict[s
 		script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 		json_pattern = os.path.join(script_dir, 'syllabus', str(year), 'json', '*.json')
 		
-		json_files = glob.glob(json_pattern)
+		json_files = json_file_paths(year)
 		stats['total_files'] = len(json_files)
 		
 		tqdm.write(f"処理開始: {stats['total_files']}個のJSONファイルを処理します")
 		
 		for json_file in tqdm(json_files, desc="シラバスファイル処理中", unit="file"):
 			try:
-				with open(json_file, 'r', encoding='utf-8') as f:
-					data = json.load(f)
+				data = read_json(json_file)
 				
 				if '詳細情報' not in data:
 					continue
@@ -8,16 +8,91 @@
 
 import os
 import json
-import glob
 import csv
 import re
 from typing import List, Dict, Set, Tuple, Any, Optional
 from datetime import datetime
 from tqdm import tqdm
 from .utils import get_year_from_user, get_db_connection, get_syllabus_master_id_from_db
+from .corpus import json_file_paths, read_json
 from pathlib import Path
 from sqlalchemy import text
 
+def extract_grading_criteria_from_single_json(data: Dict[str, Any], session, year: int, stats: Dict[str, int]) -> List[Dict[str, Any]]:
+	"""読み込み済みのシラバスJSONから成績評価基準情報を抽出する"""
+	grading_criteria = []
+	
+	if '詳細情報' not in data:
+		return grading_criteria
+		
+	detail = data['詳細情報']
+	syllabus_code = data.get('科目コード', '')
+	
+	# 基本情報から年度を取得
+	basic_info = data.get("基本情報", {})
+	syllabus_year = int(basic_info.get("開講年度", {}).get("内容", str(year)))
+	
+	# syllabus_masterからsyllabus_idを取得
+	try:
+		syllabus_id = get_syllabus_master_id_from_db(session, syllabus_code, syllabus_year)
+		if not syllabus_id:
+			return grading_criteria
+	except Exception as e:
+		print(f"❌ 致命的なDB接続エラー: {e}")
+		raise
+	
+	stats['processed_files'] += 1
+	
+	# 成績評価の方法情報の処理
+	if '成績評価の方法' in detail and '内容' in detail['成績評価の方法'] and detail['成績評価の方法']['内容'] is not None:
+		grading_content = detail['成績評価の方法']['内容']
+		if isinstance(grading_content, dict) and '評価項目' in grading_content:
+			criteria_list = grading_content['評価項目']
+			if isinstance(criteria_list, list) and criteria_list:  # nullでない場合のみ処理
+				stats['files_with_criteria'] += 1
+				stats['total_criteria'] += len(criteria_list)
+				
+				# 評価項目処理の進捗を表示
+				for criterion in tqdm(criteria_list, desc=f"評価項目処理中 ({syllabus_code})", leave=False):
+					try:
+						raw_criteria_type = criterion.get('項目', '')
+						criteria_type = str(raw_criteria_type).strip() if raw_criteria_type is not None else ""
+						ratio = None
+						ratio_str = criterion.get('割合', '')
+						if ratio_str and str(ratio_str).strip():
+							try:
+								ratio = int(ratio_str)
+							except ValueError:
+								pass
+						raw_criteria_description = criterion.get('基準', '')
+						criteria_description = str(raw_criteria_description).strip() if raw_criteria_description is not None else ""
+						raw_note = criterion.get('備考', '')
+						note = str(raw_note).strip() if raw_note is not None else ""
+						now = datetime.now().isoformat()
+						
+						# 必須フィールドのチェック
+						if not criteria_type:
+							continue
+						
+						# 成績評価基準情報として登録
+						grading_criterion_info = {
+							'syllabus_id': syllabus_id,
+							'criteria_type': criteria_type,
+							'ratio': ratio,
+							'criteria_description': criteria_description,
+							'note': note,
+							'created_at': now
+						}
+						grading_criteria.append(grading_criterion_info)
+						stats['valid_criteria'] += 1
+					except Exception as e:
+						print(f"❌ 項目処理エラー ({syllabus_code}): {str(e)}")
+						import traceback
+						print(f"📋 エラーの詳細: {traceback.format_exc()}")
+						continue
+	
+	return grading_criteria
+
 def get_grading_criterion_info(year: int) -> List[Dict[str, Any]]:
 	"""成績評価基準情報を取得する"""
 	grading_criteria = []
@@ -39,84 +114,16 @@ def get_grading_criterion_info(year: int) -> List[Dict[str, Any]]:
 		script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 		json_pattern = os.path.join(script_dir, 'syllabus', str(year), 'json', '*.json')
 		
-		json_files = glob.glob(json_pattern)
+		json_files = json_file_paths(year)
 		stats['total_files'] = len(json_files)
 		
 		print(f"処理開始: {stats['total_files']}個のJSONファイルを処理します")
 		
 		for json_file in tqdm(json_files, desc="シラバスファイル処理中", unit="file"):
 			try:
-				with open(json_file, 'r', encoding='utf-8') as f:
-					data = json.load(f)
-				
-				if '詳細情報' not in data:
-					continue
-					
-				detail = data['詳細情報']
-				syllabus_code = data.get('科目コード', '')
-				
-				# 基本情報から年度を取得
-				basic_info = data.get("基本情報", {})
-				syllabus_year = int(basic_info.get("開講年度", {}).get("内容", str(year)))
-				
-				# syllabus_masterからsyllabus_idを取得
-				try:
-					syllabus_id = get_syllabus_master_id_from_db(session, syllabus_code, syllabus_year)
-					if not syllabus_id:
-						continue
-				except Exception as e:
-					print(f"❌ 致命的なDB接続エラー: {e}")
-					raise
-				
-				stats['processed_files'] += 1
+				data = read_json(json_file)
 				
-				# 成績評価の方法情報の処理
-				if '成績評価の方法' in detail and '内容' in detail['成績評価の方法'] and detail['成績評価の方法']['内容'] is not None:
-					grading_content = detail['成績評価の方法']['内容']
-					if isinstance(grading_content, dict) and '評価項目' in grading_content:
-						criteria_list = grading_content['評価項目']
-						if isinstance(criteria_list, list) and criteria_list:  # nullでない場合のみ処理
-							stats['files_with_criteria'] += 1
-							stats['total_criteria'] += len(criteria_list)
-							
-							# 評価項目処理の進捗を表示
-							for criterion in tqdm(criteria_list, desc=f"評価項目処理中 ({syllabus_code})", leave=False):
-								try:
-									raw_criteria_type = criterion.get('項目', '')
-									criteria_type = str(raw_criteria_type).strip() if raw_criteria_type is not None else ""
-									ratio = None
-									ratio_str = criterion.get('割合', '')
-									if ratio_str and str(ratio_str).strip():
-										try:
-											ratio = int(ratio_str)
-										except ValueError:
-											pass
-									raw_criteria_description = criterion.get('基準', '')
-									criteria_description = str(raw_criteria_description).strip() if raw_criteria_description is not None else ""
-									raw_note = criterion.get('備考', '')
-									note = str(raw_note).strip() if raw_note is not None else ""
-									now = datetime.now().isoformat()
-									
-									# 必須フィールドのチェック
-									if not criteria_type:
-										continue
-									
-									# 成績評価基準情報として登録
-									grading_criterion_info = {
-										'syllabus_id': syllabus_id,
-										'criteria_type': criteria_type,
-										'ratio': ratio,
-										'criteria_description': criteria_description,
-										'note': note,
-										'created_at': now
-									}
-									grading_criteria.append(grading_criterion_info)
-									stats['valid_criteria'] += 1
-								except Exception as e:
-									print(f"❌ 項目処理エラー ({syllabus_code}): {str(e)}")
-									import traceback
-									print(f"📋 エラーの詳細: {traceback.format_exc()}")
-									continue
+				grading_criteria.extend(extract_grading_criteria_from_single_json(data, session, year, stats))
 			except Exception as e:
 				continue
 		
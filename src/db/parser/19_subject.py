@@ -13,7 +13,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from tqdm import tqdm
 from dotenv import load_dotenv
-from .utils import normalize_subject_name, get_year_from_user
+from .utils import normalize_subject_name, get_year_from_user, LookupCache
 
 def get_current_year() -> int:
     """現在の年度を取得する"""
@@ -110,161 +110,58 @@ def clean_subject_name(name: str) -> str:
     
     return name
 
-def get_subject_name_id_from_db(session, name: str) -> int:
+def get_subject_name_id(lookups: LookupCache, name: str) -> int:
     """科目名IDを取得する"""
-    try:
-        # 科目名をクリーニング（[隔年開講]などを削除）
-        cleaned_name = clean_subject_name(name)
-        
-        # 科目名を正規化
-        normalized_name = normalize_subject_name(cleaned_name)
-        
-        # まず完全一致で検索
-        query = text("""
-            SELECT subject_name_id 
-            FROM subject_name 
-            WHERE name = :name
-            ORDER BY subject_name_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": normalized_name}
-        ).first()
-        
-        if result:
-            return result[0]
-            
-        # 完全一致で見つからない場合、部分一致で検索
-        query = text("""
-            SELECT subject_name_id 
-            FROM subject_name 
-            WHERE name LIKE :name
-            ORDER BY subject_name_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": f"%{normalized_name}%"}
-        ).first()
-        
-        if result:
-            tqdm.write(f"警告: 科目名の部分一致が見つかりました: {name} -> {normalized_name}")
-            return result[0]
-        
-        # ローマ数字を除去して再検索
-        name_without_roman = re.sub(r'[Ⅰ-Ⅹ]', '', normalized_name)
-        if name_without_roman != normalized_name:
-            query = text("""
-                SELECT subject_name_id 
-                FROM subject_name 
-                WHERE name LIKE :name
-                ORDER BY subject_name_id
-                LIMIT 1
-            """)
-            
-            result = session.execute(
-                query,
-                {"name": f"%{name_without_roman}%"}
-            ).first()
-            
-            if result:
-                tqdm.write(f"警告: ローマ数字を除去した科目名の部分一致が見つかりました: {name} -> {name_without_roman}")
-                return result[0]
-        
-        tqdm.write(f"エラー: 科目名が見つかりません: {name} (正規化後: {normalized_name})")
-        return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 科目名IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
-        return None
+    # 科目名をクリーニング（[隔年開講]などを削除）
+    cleaned_name = clean_subject_name(name)
+    
+    # 部分一致検索とメッセージ用に正規化した名前
+    normalized_name = normalize_subject_name(cleaned_name)
+    
+    # まず完全一致で検索（get_idが正規化する）
+    subject_name_id = lookups.get_id('subject_name', cleaned_name)
+    if subject_name_id is not None:
+        return subject_name_id
+    
+    # 完全一致で見つからない場合、部分一致で検索
+    subject_name_id = lookups.find_subject_name_id(normalized_name)
+    if subject_name_id is not None:
+        tqdm.write(f"警告: 科目名の部分一致が見つかりました: {name} -> {normalized_name}")
+        return subject_name_id
+    
+    # ローマ数字を除去して再検索
+    name_without_roman = re.sub(r'[Ⅰ-Ⅹ]', '', normalized_name)
+    if name_without_roman != normalized_name:
+        subject_name_id = lookups.find_subject_name_id(name_without_roman)
+        if subject_name_id is not None:
+            tqdm.write(f"警告: ローマ数字を除去した科目名の部分一致が見つかりました: {name} -> {name_without_roman}")
+            return subject_name_id
+    
+    tqdm.write(f"エラー: 科目名が見つかりません: {name} (正規化後: {normalized_name})")
+    return None
 
-def get_faculty_id_from_db(session, faculty_name: str) -> int:
+def get_faculty_id(lookups: LookupCache, faculty_name: str) -> int:
     """学部IDを取得する"""
-    try:
-        query = text("""
-            SELECT faculty_id 
-            FROM faculty 
-            WHERE faculty_name = :name
-            ORDER BY faculty_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": faculty_name}
-        ).first()
-        
-        if result:
-            return result[0]
-        else:
-            tqdm.write(f"エラー: 学部が見つかりません: {faculty_name}")
-            return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 学部IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
-        return None
+    faculty_id = lookups.get_id('faculty', faculty_name)
+    if faculty_id is None:
+        tqdm.write(f"エラー: 学部が見つかりません: {faculty_name}")
+    return faculty_id
 
-def get_class_id_from_db(session, class_name: str) -> int:
+def get_class_id(lookups: LookupCache, class_name: str) -> int:
     """科目区分IDを取得する"""
-    try:
-        query = text("""
-            SELECT class_id 
-            FROM class 
-            WHERE class_name = :name
-            ORDER BY class_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": class_name}
-        ).first()
-        
-        if result:
-            return result[0]
-        else:
-            tqdm.write(f"エラー: 科目区分が見つかりません: {class_name}")
-            return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 科目区分IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
-        return None
+    class_id = lookups.get_id('class', class_name)
+    if class_id is None:
+        tqdm.write(f"エラー: 科目区分が見つかりません: {class_name}")
+    return class_id
 
-def get_subclass_id_from_db(session, subclass_name: str) -> int:
+def get_subclass_id(lookups: LookupCache, subclass_name: str) -> int:
     """科目小区分IDを取得する"""
-    try:
-        if not subclass_name:
-            return None
-            
-        query = text("""
-            SELECT subclass_id 
-            FROM subclass 
-            WHERE subclass_name = :name
-            ORDER BY subclass_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": subclass_name}
-        ).first()
-        
-        if result:
-            return result[0]
-        else:
-            tqdm.write(f"エラー: 科目小区分が見つかりません: {subclass_name}")
-            return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 科目小区分IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
+    if not subclass_name:
         return None
+    subclass_id = lookups.get_id('subclass', subclass_name)
+    if subclass_id is None:
+        tqdm.write(f"エラー: 科目小区分が見つかりません: {subclass_name}")
+    return subclass_id
 
 def create_warning_csv(year: int, errors: List[Dict]) -> str:
     """エラー内容を詳細にCSVファイルに記載する"""
@@ -316,113 +213,109 @@ def create_warning_csv(year: int, errors: List[Dict]) -> str:
     
     return output_file
 
-def extract_subject_info(csv_file: str, db_config: Dict[str, str], stats: Dict, errors: List[Dict]) -> List[Dict]:
-    """CSVから科目基本情報を抽出する"""
+def extract_subject_info(csv_file: str, lookups: LookupCache, stats: Dict, errors: List[Dict]) -> List[Dict]:
+    """CSVから科目基本情報を抽出する（IDは読み込み済みのlookupsから引く）"""
     subjects = []
-    session = get_db_connection(db_config)
     
-    try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='\t')
-            rows = list(reader)
-            stats['total_items'] += len(rows)
-            
-            for row_idx, row in enumerate(rows, start=2):  # ヘッダー行を除いて2から開始
-                try:
-                    # 科目名をクリーニングして正規化
-                    subject_name = clean_subject_name(row['科目名'])
-                    normalized_subject_name = normalize_subject_name(subject_name)
-                    
-                    # 各IDを取得
-                    subject_name_id = get_subject_name_id_from_db(session, subject_name)
-                    faculty_id = get_faculty_id_from_db(session, row['学部課程'])
-                    class_id = get_class_id_from_db(session, row['科目区分'])
-                    subclass_id = get_subclass_id_from_db(session, row['科目小区分']) if row['科目小区分'] else None
-                    
-                    # エラーチェックとエラー情報の収集
-                    error_info = {
-                        'file_name': os.path.basename(csv_file),
-                        'row_number': row_idx,
-                        'subject_name': row['科目名'],
-                        'faculty_name': row['学部課程'],
-                        'year': row['年度'],
-                        'class_name': row['科目区分'],
-                        'subclass_name': row['科目小区分'],
-                        'requirement_type': row['必須度'],
-                        'normalized_subject_name': normalized_subject_name,
-                        'processed_at': datetime.now().isoformat()
-                    }
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f, delimiter='\t')
+        rows = list(reader)
+        stats['total_items'] += len(rows)
+        
+        for row_idx, row in enumerate(rows, start=2):  # ヘッダー行を除いて2から開始
+            try:
+                # 科目名をクリーニングして正規化
+                subject_name = clean_subject_name(row['科目名'])
+                normalized_subject_name = normalize_subject_name(subject_name)
+                
+                # 各IDを取得
+                subject_name_id = get_subject_name_id(lookups, subject_name)
+                faculty_id = get_faculty_id(lookups, row['学部課程'])
+                class_id = get_class_id(lookups, row['科目区分'])
+                subclass_id = get_subclass_id(lookups, row['科目小区分']) if row['科目小区分'] else None
+                
+                # エラーチェックとエラー情報の収集
+                error_info = {
+                    'file_name': os.path.basename(csv_file),
+                    'row_number': row_idx,
+                    'subject_name': row['科目名'],
+                    'faculty_name': row['学部課程'],
+                    'year': row['年度'],
+                    'class_name': row['科目区分'],
+                    'subclass_name': row['科目小区分'],
+                    'requirement_type': row['必須度'],
+                    'normalized_subject_name': normalized_subject_name,
+                    'processed_at': datetime.now().isoformat()
+                }
+                
+                if subject_name_id is None:
+                    error_info['error_type'] = '科目名ID未取得'
+                    error_info['error_detail'] = f'科目名が見つかりません: {subject_name} (正規化後: {normalized_subject_name})'
+                    errors.append(error_info)
+                    stats['error_items'] += 1
+                    error_type = '科目名ID未取得'
+                    if error_type not in stats['specific_errors']:
+                        stats['specific_errors'][error_type] = 0
+                    stats['specific_errors'][error_type] += 1
+                    continue
                     
-                    if subject_name_id is None:
-                        error_info['error_type'] = '科目名ID未取得'
-                        error_info['error_detail'] = f'科目名が見つかりません: {subject_name} (正規化後: {normalized_subject_name})'
-                        errors.append(error_info)
-                        stats['error_items'] += 1
-                        error_type = '科目名ID未取得'
-                        if error_type not in stats['specific_errors']:
-                            stats['specific_errors'][error_type] = 0
-                        stats['specific_errors'][error_type] += 1
-                        continue
-                        
-                    if faculty_id is None:
-                        error_info['error_type'] = '学部ID未取得'
-                        error_info['error_detail'] = f'学部が見つかりません: {row["学部課程"]}'
-                        errors.append(error_info)
-                        stats['error_items'] += 1
-                        error_type = '学部ID未取得'
-                        if error_type not in stats['specific_errors']:
-                            stats['specific_errors'][error_type] = 0
-                        stats['specific_errors'][error_type] += 1
-                        continue
-                        
-                    if class_id is None:
-                        error_info['error_type'] = '科目区分ID未取得'
-                        error_info['error_detail'] = f'科目区分が見つかりません: {row["科目区分"]}'
-                        errors.append(error_info)
-                        stats['error_items'] += 1
-                        error_type = '科目区分ID未取得'
-                        if error_type not in stats['specific_errors']:
-                            stats['specific_errors'][error_type] = 0
-                        stats['specific_errors'][error_type] += 1
-                        continue
-                        
-                    subject_info = {
-                        'subject_name_id': subject_name_id,
-                        'faculty_id': faculty_id,
-                        'curriculum_year': int(row['年度']),
-                        'class_id': class_id,
-                        'subclass_id': subclass_id,
-                        'requirement_type': row['必須度'] if row['必須度'] else None,
-                        'created_at': datetime.now().isoformat()
-                    }
-                    subjects.append(subject_info)
-                    stats['valid_items'] += 1
+                if faculty_id is None:
+                    error_info['error_type'] = '学部ID未取得'
+                    error_info['error_detail'] = f'学部が見つかりません: {row["学部課程"]}'
+                    errors.append(error_info)
+                    stats['error_items'] += 1
+                    error_type = '学部ID未取得'
+                    if error_type not in stats['specific_errors']:
+                        stats['specific_errors'][error_type] = 0
+                    stats['specific_errors'][error_type] += 1
+                    continue
                     
-                except Exception as e:
-                    error_info = {
-                        'file_name': os.path.basename(csv_file),
-                        'row_number': row_idx,
-                        'subject_name': row.get('科目名', ''),
-                        'faculty_name': row.get('学部課程', ''),
-                        'year': row.get('年度', ''),
-                        'class_name': row.get('科目区分', ''),
-                        'subclass_name': row.get('科目小区分', ''),
-                        'requirement_type': row.get('必須度', ''),
-                        'normalized_subject_name': '',
-                        'error_type': 'データ処理エラー',
-                        'error_detail': str(e),
-                        'processed_at': datetime.now().isoformat()
-                    }
+                if class_id is None:
+                    error_info['error_type'] = '科目区分ID未取得'
+                    error_info['error_detail'] = f'科目区分が見つかりません: {row["科目区分"]}'
                     errors.append(error_info)
                     stats['error_items'] += 1
-                    error_type = 'データ処理エラー'
+                    error_type = '科目区分ID未取得'
                     if error_type not in stats['specific_errors']:
                         stats['specific_errors'][error_type] = 0
                     stats['specific_errors'][error_type] += 1
-                    tqdm.write(f"エラー: 行の処理でエラーが発生しました: {str(e)}")
                     continue
-    finally:
-        session.close()
+                    
+                subject_info = {
+                    'subject_name_id': subject_name_id,
+                    'faculty_id': faculty_id,
+                    'curriculum_year': int(row['年度']),
+                    'class_id': class_id,
+                    'subclass_id': subclass_id,
+                    'requirement_type': row['必須度'] if row['必須度'] else None,
+                    'created_at': datetime.now().isoformat()
+                }
+                subjects.append(subject_info)
+                stats['valid_items'] += 1
+                
+            except Exception as e:
+                error_info = {
+                    'file_name': os.path.basename(csv_file),
+                    'row_number': row_idx,
+                    'subject_name': row.get('科目名', ''),
+                    'faculty_name': row.get('学部課程', ''),
+                    'year': row.get('年度', ''),
+                    'class_name': row.get('科目区分', ''),
+                    'subclass_name': row.get('科目小区分', ''),
+                    'requirement_type': row.get('必須度', ''),
+                    'normalized_subject_name': '',
+                    'error_type': 'データ処理エラー',
+                    'error_detail': str(e),
+                    'processed_at': datetime.now().isoformat()
+                }
+                errors.append(error_info)
+                stats['error_items'] += 1
+                error_type = 'データ処理エラー'
+                if error_type not in stats['specific_errors']:
+                    stats['specific_errors'][error_type] = 0
+                stats['specific_errors'][error_type] += 1
+                tqdm.write(f"エラー: 行の処理でエラーが発生しました: {str(e)}")
+                continue
     
     return subjects
 
@@ -488,11 +381,18 @@ def main(db_config: Dict[str, str]):
         stats['total_files'] = len(csv_files)
         tqdm.write(f"処理対象ファイル数: {len(csv_files)}")
         
+        # 科目名・学部・科目区分・科目小区分のIDを一括で読み込む（行ごとの問い合わせはしない）
+        session = get_db_connection(db_config)
+        try:
+            lookups = LookupCache.load(session, 'subject_name', 'faculty', 'class', 'subclass')
+        finally:
+            session.close()
+        
         # 科目基本情報の抽出
         all_subjects = []
         for csv_file in tqdm(csv_files, desc="CSVファイル処理中", unit="file"):
             try:
-                subjects = extract_subject_info(csv_file, db_config, stats, errors)
+                subjects = extract_subject_info(csv_file, lookups, stats, errors)
                 all_subjects.extend(subjects)
                 stats['processed_files'] += 1
                 tqdm.write(f"ファイル {os.path.basename(csv_file)}: {len(subjects)}件の科目を抽出")
@@ -13,7 +13,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from tqdm import tqdm
 from dotenv import load_dotenv
-from .utils import normalize_subject_name, get_year_from_user
+from .utils import normalize_subject_name, get_year_from_user, LookupCache
 
 def get_current_year() -> int:
     """現在の年度を取得する"""
@@ -110,116 +110,12 @@ def get_db_connection(db_config: Dict[str, str]):
     
     return session
 
-def get_subject_name_id_from_db(session, subject_name: str) -> int:
-    """科目名IDを取得する"""
-    try:
-        # 科目名を正規化
-        normalized_name = normalize_subject_name(subject_name)
-        
-        query = text("""
-            SELECT subject_name_id 
-            FROM subject_name 
-            WHERE name = :name
-            ORDER BY subject_name_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": normalized_name}
-        ).first()
-        
-        if result:
-            return result[0]
-        return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 科目名IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
-        return None
-
-def get_faculty_id_from_db(session, faculty_name: str) -> int:
-    """学部IDを取得する"""
-    try:
-        query = text("""
-            SELECT faculty_id 
-            FROM faculty 
-            WHERE faculty_name = :name
-            ORDER BY faculty_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": faculty_name}
-        ).first()
-        
-        if result:
-            return result[0]
-        return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 学部IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
-        return None
-
-def get_subject_id_from_db(session, subject_name_id: int, faculty_id: int, curriculum_year: int) -> int:
-    """科目IDを取得する"""
-    try:
-        query = text("""
-            SELECT subject_id 
-            FROM subject 
-            WHERE subject_name_id = :subject_name_id
-            AND faculty_id = :faculty_id
-            AND curriculum_year = :curriculum_year
-            ORDER BY subject_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {
-                "subject_name_id": subject_name_id,
-                "faculty_id": faculty_id,
-                "curriculum_year": curriculum_year
-            }
-        ).first()
-        
-        if result:
-            return result[0]
-        return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 科目IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
-        return None
-
-def get_attribute_id_from_db(session, attribute_name: str) -> int:
+def get_attribute_id(lookups: LookupCache, attribute_name: str) -> int:
     """属性IDを取得する"""
-    try:
-        query = text("""
-            SELECT attribute_id 
-            FROM subject_attribute 
-            WHERE attribute_name = :name
-            ORDER BY attribute_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": attribute_name}
-        ).first()
-        
-        if result:
-            return result[0]
-        else:
-            tqdm.write(f"エラー: 属性が見つかりません: {attribute_name}")
-            return None
-            
-    except Exception as e:
-        tqdm.write(f"エラー: 属性IDの取得中にエラーが発生しました: {str(e)}")
-        session.rollback()
-        return None
+    attribute_id = lookups.get_id('subject_attribute', attribute_name)
+    if attribute_id is None:
+        tqdm.write(f"エラー: 属性が見つかりません: {attribute_name}")
+    return attribute_id
 
 def create_warning_csv(year: int, errors: List[Dict]) -> str:
     """エラー内容を詳細にCSVファイルに記載する"""
@@ -269,182 +165,178 @@ def create_warning_csv(year: int, errors: List[Dict]) -> str:
     
     return output_file
 
-def extract_subject_attribute_values(csv_file: str, db_config: Dict[str, str], stats: Dict, errors: List[Dict]) -> List[Dict]:
-    """CSVから科目属性値情報を抽出する"""
+def extract_subject_attribute_values(csv_file: str, lookups: LookupCache, stats: Dict, errors: List[Dict]) -> List[Dict]:
+    """CSVから科目属性値情報を抽出する（IDは読み込み済みのlookupsから引く）"""
     attribute_values = []
-    session = get_db_connection(db_config)
     
-    try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f, delimiter='\t')
-            rows = list(reader)
-            stats['total_items'] += len(rows)
-            
-            for row_idx, row in enumerate(rows, start=2):  # ヘッダー行を除いて2から開始
-                try:
-                    # 17_subject.pyで処理したフィールドを除外
-                    processed_fields = {'科目名', '学部課程', '年度', '科目区分', '科目小区分', '必須度'}
-                    attribute_fields = set(row.keys()) - processed_fields
-                    
-                    # 科目名を正規化
-                    subject_name = row['科目名']
-                    cleaned_subject_name = clean_subject_name(subject_name)
-                    normalized_subject_name = normalize_subject_name(cleaned_subject_name)
-                    
-                    # 科目名IDを取得
-                    subject_name_id = get_subject_name_id_from_db(session, cleaned_subject_name)
-                    if subject_name_id is None:
-                        error_info = {
-                            'file_name': os.path.basename(csv_file),
-                            'row_number': row_idx,
-                            'subject_name': subject_name,
-                            'faculty_name': row['学部課程'],
-                            'year': row['年度'],
-                            'attribute_name': '',
-                            'attribute_value': '',
-                            'normalized_subject_name': normalized_subject_name,
-                            'error_type': '科目名ID未取得',
-                            'error_detail': f'科目名が見つかりません: {cleaned_subject_name} (正規化後: {normalized_subject_name})',
-                            'processed_at': datetime.now().isoformat()
-                        }
-                        errors.append(error_info)
-                        stats['error_items'] += 1
-                        error_type = '科目名ID未取得'
-                        if error_type not in stats['specific_errors']:
-                            stats['specific_errors'][error_type] = 0
-                        stats['specific_errors'][error_type] += 1
-                        continue
-                    
-                    # 学部IDを取得
-                    faculty_id = get_faculty_id_from_db(session, row['学部課程'])
-                    if faculty_id is None:
-                        error_info = {
-                            'file_name': os.path.basename(csv_file),
-                            'row_number': row_idx,
-                            'subject_name': subject_name,
-                            'faculty_name': row['学部課程'],
-                            'year': row['年度'],
-                            'attribute_name': '',
-                            'attribute_value': '',
-                            'normalized_subject_name': normalized_subject_name,
-                            'error_type': '学部ID未取得',
-                            'error_detail': f'学部が見つかりません: {row["学部課程"]}',
-                            'processed_at': datetime.now().isoformat()
-                        }
-                        errors.append(error_info)
-                        stats['error_items'] += 1
-                        error_type = '学部ID未取得'
-                        if error_type not in stats['specific_errors']:
-                            stats['specific_errors'][error_type] = 0
-                        stats['specific_errors'][error_type] += 1
-                        continue
-                    
-                    # 科目IDを取得
-                    subject_id = get_subject_id_from_db(session, subject_name_id, faculty_id, int(row['年度']))
-                    if subject_id is None:
-                        error_info = {
-                            'file_name': os.path.basename(csv_file),
-                            'row_number': row_idx,
-                            'subject_name': subject_name,
-                            'faculty_name': row['学部課程'],
-                            'year': row['年度'],
-                            'attribute_name': '',
-                            'attribute_value': '',
-                            'normalized_subject_name': normalized_subject_name,
-                            'error_type': '科目ID未取得',
-                            'error_detail': f'科目が見つかりません: {subject_name} (学部: {row["学部課程"]}, 年度: {row["年度"]})',
-                            'processed_at': datetime.now().isoformat()
-                        }
-                        errors.append(error_info)
-                        stats['error_items'] += 1
-                        error_type = '科目ID未取得'
-                        if error_type not in stats['specific_errors']:
-                            stats['specific_errors'][error_type] = 0
-                        stats['specific_errors'][error_type] += 1
-                        continue
-                    
-                    # 各属性フィールドを処理
-                    for field_name in attribute_fields:
-                        value = row[field_name]
-                        # NULL値、null値、空文字、空白文字のみの場合はスキップ
-                        if value == "NULL" or value == "null" or not value or value.strip() == "":
-                            continue
-                        
-                        # 可変長配列形式の値を分割
-                        values_to_process = []
-                        if value.startswith('[') and value.endswith(']'):
-                            # [A,B,C]形式の場合、カンマで分割
-                            array_content = value[1:-1]  # [と]を除去
-                            if array_content.strip():  # 空の配列でない場合
-                                values_to_process = [item.strip() for item in array_content.split(',') if item.strip()]
-                            else:
-                                continue  # 空の配列はスキップ
-                        else:
-                            # 通常の値の場合
-                            values_to_process = [value]
-                        
-                        # 分割された各値を処理
-                        for single_value in values_to_process:
-                            # 空の値はスキップ
-                            if not single_value or single_value.strip() == "":
-                                continue
-                                
-                            attribute_id = get_attribute_id_from_db(session, field_name)
-                            if attribute_id is None:
-                                error_info = {
-                                    'file_name': os.path.basename(csv_file),
-                                    'row_number': row_idx,
-                                    'subject_name': subject_name,
-                                    'faculty_name': row['学部課程'],
-                                    'year': row['年度'],
-                                    'attribute_name': field_name,
-                                    'attribute_value': single_value,
-                                    'normalized_subject_name': normalized_subject_name,
-                                    'error_type': '属性ID未取得',
-                                    'error_detail': f'属性が見つかりません: {field_name}',
-                                    'processed_at': datetime.now().isoformat()
-                                }
-                                errors.append(error_info)
-                                stats['error_items'] += 1
-                                error_type = '属性ID未取得'
-                                if error_type not in stats['specific_errors']:
-                                    stats['specific_errors'][error_type] = 0
-                                stats['specific_errors'][error_type] += 1
-                                continue
-                            
-                            attribute_value_info = {
-                                'subject_id': subject_id,
-                                'attribute_id': attribute_id,
-                                'value': single_value,
-                                'created_at': datetime.now().isoformat()
-                            }
-                            attribute_values.append(attribute_value_info)
-                            stats['valid_items'] += 1
-                        
-                except Exception as e:
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f, delimiter='\t')
+        rows = list(reader)
+        stats['total_items'] += len(rows)
+        
+        for row_idx, row in enumerate(rows, start=2):  # ヘッダー行を除いて2から開始
+            try:
+                # 17_subject.pyで処理したフィールドを除外
+                processed_fields = {'科目名', '学部課程', '年度', '科目区分', '科目小区分', '必須度'}
+                attribute_fields = set(row.keys()) - processed_fields
+                
+                # 科目名を正規化
+                subject_name = row['科目名']
+                cleaned_subject_name = clean_subject_name(subject_name)
+                normalized_subject_name = normalize_subject_name(cleaned_subject_name)
+                
+                # 科目名IDを取得
+                subject_name_id = lookups.get_id('subject_name', cleaned_subject_name)
+                if subject_name_id is None:
                     error_info = {
                         'file_name': os.path.basename(csv_file),
                         'row_number': row_idx,
-                        'subject_name': row.get('科目名', ''),
-                        'faculty_name': row.get('学部課程', ''),
-                        'year': row.get('年度', ''),
+                        'subject_name': subject_name,
+                        'faculty_name': row['学部課程'],
+                        'year': row['年度'],
                         'attribute_name': '',
                         'attribute_value': '',
-                        'normalized_subject_name': '',
-                        'error_type': 'データ処理エラー',
-                        'error_detail': str(e),
+                        'normalized_subject_name': normalized_subject_name,
+                        'error_type': '科目名ID未取得',
+                        'error_detail': f'科目名が見つかりません: {cleaned_subject_name} (正規化後: {normalized_subject_name})',
                         'processed_at': datetime.now().isoformat()
                     }
                     errors.append(error_info)
                     stats['error_items'] += 1
-                    error_type = 'データ処理エラー'
+                    error_type = '科目名ID未取得'
                     if error_type not in stats['specific_errors']:
                         stats['specific_errors'][error_type] = 0
                     stats['specific_errors'][error_type] += 1
-                    tqdm.write(f"エラー: 行の処理でエラーが発生しました: {str(e)}")
                     continue
-    finally:
-        session.close()
+                
+                # 学部IDを取得
+                faculty_id = lookups.get_id('faculty', row['学部課程'])
+                if faculty_id is None:
+                    error_info = {
+                        'file_name': os.path.basename(csv_file),
+                        'row_number': row_idx,
+                        'subject_name': subject_name,
+                        'faculty_name': row['学部課程'],
+                        'year': row['年度'],
+                        'attribute_name': '',
+                        'attribute_value': '',
+                        'normalized_subject_name': normalized_subject_name,
+                        'error_type': '学部ID未取得',
+                        'error_detail': f'学部が見つかりません: {row["学部課程"]}',
+                        'processed_at': datetime.now().isoformat()
+                    }
+                    errors.append(error_info)
+                    stats['error_items'] += 1
+                    error_type = '学部ID未取得'
+                    if error_type not in stats['specific_errors']:
+                        stats['specific_errors'][error_type] = 0
+                    stats['specific_errors'][error_type] += 1
+                    continue
+                
+                # 科目IDを取得
+                subject_id = lookups.get_subject_id(subject_name_id, faculty_id, int(row['年度']))
+                if subject_id is None:
+                    error_info = {
+                        'file_name': os.path.basename(csv_file),
+                        'row_number': row_idx,
+                        'subject_name': subject_name,
+                        'faculty_name': row['学部課程'],
+                        'year': row['年度'],
+                        'attribute_name': '',
+                        'attribute_value': '',
+                        'normalized_subject_name': normalized_subject_name,
+                        'error_type': '科目ID未取得',
+                        'error_detail': f'科目が見つかりません: {subject_name} (学部: {row["学部課程"]}, 年度: {row["年度"]})',
+                        'processed_at': datetime.now().isoformat()
+                    }
+                    errors.append(error_info)
+                    stats['error_items'] += 1
+                    error_type = '科目ID未取得'
+                    if error_type not in stats['specific_errors']:
+                        stats['specific_errors'][error_type] = 0
+                    stats['specific_errors'][error_type] += 1
+                    continue
+                
+                # 各属性フィールドを処理
+                for field_name in attribute_fields:
+                    value = row[field_name]
+                    # NULL値、null値、空文字、空白文字のみの場合はスキップ
+                    if value == "NULL" or value == "null" or not value or value.strip() == "":
+                        continue
+                    
+                    # 可変長配列形式の値を分割
+                    values_to_process = []
+                    if value.startswith('[') and value.endswith(']'):
+                        # [A,B,C]形式の場合、カンマで分割
+                        array_content = value[1:-1]  # [と]を除去
+                        if array_content.strip():  # 空の配列でない場合
+                            values_to_process = [item.strip() for item in array_content.split(',') if item.strip()]
+                        else:
+                            continue  # 空の配列はスキップ
+                    else:
+                        # 通常の値の場合
+                        values_to_process = [value]
+                    
+                    # 分割された各値を処理
+                    for single_value in values_to_process:
+                        # 空の値はスキップ
+                        if not single_value or single_value.strip() == "":
+                            continue
+                            
+                        attribute_id = get_attribute_id(lookups, field_name)
+                        if attribute_id is None:
+                            error_info = {
+                                'file_name': os.path.basename(csv_file),
+                                'row_number': row_idx,
+                                'subject_name': subject_name,
+                                'faculty_name': row['学部課程'],
+                                'year': row['年度'],
+                                'attribute_name': field_name,
+                                'attribute_value': single_value,
+                                'normalized_subject_name': normalized_subject_name,
+                                'error_type': '属性ID未取得',
+                                'error_detail': f'属性が見つかりません: {field_name}',
+                                'processed_at': datetime.now().isoformat()
+                            }
+                            errors.append(error_info)
+                            stats['error_items'] += 1
+                            error_type = '属性ID未取得'
+                            if error_type not in stats['specific_errors']:
+                                stats['specific_errors'][error_type] = 0
+                            stats['specific_errors'][error_type] += 1
+                            continue
+                        
+                        attribute_value_info = {
+                            'subject_id': subject_id,
+                            'attribute_id': attribute_id,
+                            'value': single_value,
+                            'created_at': datetime.now().isoformat()
+                        }
+                        attribute_values.append(attribute_value_info)
+                        stats['valid_items'] += 1
+                    
+            except Exception as e:
+                error_info = {
+                    'file_name': os.path.basename(csv_file),
+                    'row_number': row_idx,
+                    'subject_name': row.get('科目名', ''),
+                    'faculty_name': row.get('学部課程', ''),
+                    'year': row.get('年度', ''),
+                    'attribute_name': '',
+                    'attribute_value': '',
+                    'normalized_subject_name': '',
+                    'error_type': 'データ処理エラー',
+                    'error_detail': str(e),
+                    'processed_at': datetime.now().isoformat()
+                }
+                errors.append(error_info)
+                stats['error_items'] += 1
+                error_type = 'データ処理エラー'
+                if error_type not in stats['specific_errors']:
+                    stats['specific_errors'][error_type] = 0
+                stats['specific_errors'][error_type] += 1
+                tqdm.write(f"エラー: 行の処理でエラーが発生しました: {str(e)}")
+                continue
     
     return attribute_values
 
@@ -504,11 +396,18 @@ def main(db_config: Dict[str, str]):
         stats['total_files'] = len(csv_files)
         tqdm.write(f"処理対象ファイル数: {len(csv_files)}")
         
+        # 科目名・学部・属性・科目のIDを一括で読み込む（行ごとの問い合わせはしない）
+        session = get_db_connection(db_config)
+        try:
+            lookups = LookupCache.load(session, 'subject_name', 'faculty', 'subject_attribute', subjects=True)
+        finally:
+            session.close()
+        
         # 科目属性値情報の抽出
         all_attribute_values = []
         for csv_file in tqdm(csv_files, desc="CSVファイル処理中", unit="file"):
             try:
-                attribute_values = extract_subject_attribute_values(csv_file, db_config, stats, errors)
+                attribute_values = extract_subject_attribute_values(csv_file, lookups, stats, errors)
                 all_attribute_values.extend(attribute_values)
                 stats['processed_files'] += 1
                 tqdm.write(f"ファイル {os.path.basename(csv_file)}: {len(attribute_values)}件の属性値を抽出")
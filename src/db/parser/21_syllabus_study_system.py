@@ -17,7 +17,8 @@ from tqdm import tqdm
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-from utils import normalize_subject_name
+from utils import normalize_subject_name, get_syllabus_master_id_from_db
+from corpus import json_file_paths, read_json
 
 def get_db_connection():
     """データベース接続を取得する"""
@@ -77,27 +78,6 @@ def get_subject_name_id_from_db(session, name: str) -> int:
         session.rollback()
         return None
 
-def get_syllabus_master_id_from_db(session, syllabus_code: str, syllabus_year: int) -> int:
-    """シラバスマスターIDを取得する"""
-    try:
-        # シラバスマスターIDを取得
-        query = text("""
-            SELECT syllabus_id 
-            FROM syllabus_master 
-            WHERE syllabus_code = :code 
-            AND syllabus_year = :year
-        """)
-        
-        result = session.execute(
-            query,
-            {"code": syllabus_code, "year": syllabus_year}
-        ).first()
-        
-        return result[0] if result else None
-    except Exception as e:
-        session.rollback()
-        return None
-
 def get_syllabus_id_from_db(session, syllabus_master_id: int, subject_name_id: int) -> int:
     """シラバスIDを取得する"""
     try:
@@ -202,18 +182,12 @@ def get_latest_json(year: int) -> str:
     return os.path.join(data_dir, latest_json)
 
 def get_all_json_files(year: int) -> List[str]:
-    """指定された年度のすべてのJSONファイルを取得する"""
-    data_dir = os.path.join("src", "syllabus", str(year), "json")
-    if not os.path.exists(data_dir):
-        raise FileNotFoundError(f"ディレクトリが見つかりません: {data_dir}")
-    
-    json_files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+    """指定された年度のすべてのJSONファイルを取得する（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+    json_files = json_file_paths(year)
     if not json_files:
-        raise FileNotFoundError(f"JSONファイルが見つかりません: {data_dir}")
+        raise FileNotFoundError(f"JSONファイルが見つかりません: {os.path.join('src', 'syllabus', str(year), 'json')}")
     
-    # ファイル名でソート
-    json_files.sort()
-    return [os.path.join(data_dir, f) for f in json_files]
+    return json_files
 
 def get_year_from_user() -> int:
     """ユーザーから年度を入力してもらう"""
@@ -231,13 +205,28 @@ def get_year_from_user() -> int:
 
 def process_syllabus_study_system_json(json_file: str, session) -> tuple[List[Dict], List[Dict]]:
     """個別のシラバスJSONファイルから学習システム情報を処理する"""
+    try:
+        json_data = read_json(json_file)
+    except Exception as e:
+        return [], [{
+            'file_name': os.path.basename(json_file),
+            'subject_name': '',
+            'syllabus_code': '',
+            'syllabus_year': '',
+            'error_type': 'データ処理エラー',
+            'error_detail': f'処理中にエラーが発生: {str(e)}',
+            'normalized_subject_name': '',
+            'processed_at': datetime.now().isoformat()
+        }]
+    
+    return extract_syllabus_study_system_from_single_json(json_data, session, json_file)
+
+def extract_syllabus_study_system_from_single_json(json_data: Dict, session, json_file: str) -> tuple[List[Dict], List[Dict]]:
+    """読み込み済みのシラバスJSONから学習システム情報を抽出する"""
     errors = []
     study_systems = []
     
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            json_data = json.load(f)
-        
         # 基本情報からデータを抽出
         basic_info = json_data.get("基本情報", {})
         
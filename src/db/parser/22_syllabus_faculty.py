@@ -7,10 +7,8 @@ import os
 import json
 import csv
 import sys
-from typing import List, Dict, Set
+from typing import List, Dict
 from datetime import datetime
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
 from tqdm import tqdm
 
 # 現在のディレクトリをPythonパスに追加
@@ -21,33 +19,10 @@ from utils import (
     normalize_faculty_name, 
     get_db_connection, 
     get_syllabus_master_id_from_db,
-    get_year_from_user
+    get_year_from_user,
+    LookupCache
 )
-
-def get_faculty_id_from_db(session, faculty_name: str) -> int:
-    """学部・課程IDを取得する"""
-    try:
-        # 学部・課程名を正規化
-        normalized_name = normalize_faculty_name(faculty_name)
-        
-        # 学部・課程IDを取得
-        query = text("""
-            SELECT faculty_id 
-            FROM faculty 
-            WHERE faculty_name = :name
-            ORDER BY faculty_id
-            LIMIT 1
-        """)
-        
-        result = session.execute(
-            query,
-            {"name": normalized_name}
-        ).first()
-        
-        return result[0] if result else None
-    except Exception as e:
-        session.rollback()
-        return None
+from corpus import json_file_paths, read_json
 
 def create_syllabus_faculty_json(syllabus_faculties: List[Dict]) -> str:
     """シラバス学部関連情報のJSONファイルを作成する"""
@@ -136,26 +111,50 @@ def get_latest_json(year: int) -> str:
     return os.path.join(data_dir, latest_file)
 
 def get_all_json_files(year: int) -> List[str]:
-    """指定された年度のすべてのJSONファイルを取得する"""
-    data_dir = os.path.join("src", "syllabus", str(year), "json")
-    if not os.path.exists(data_dir):
-        raise FileNotFoundError(f"ディレクトリが見つかりません: {data_dir}")
-    
-    json_files = [f for f in os.listdir(data_dir) if f.endswith('.json')]
+    """指定された年度のすべてのJSONファイルを取得する（アーカイブのみの場合はメンバーのパス。read_jsonで読む）"""
+    json_files = json_file_paths(year)
     if not json_files:
-        raise FileNotFoundError(f"JSONファイルが見つかりません: {data_dir}")
+        raise FileNotFoundError(f"JSONファイルが見つかりません: {os.path.join('src', 'syllabus', str(year), 'json')}")
     
-    return [os.path.join(data_dir, f) for f in sorted(json_files)]
+    return json_files
 
-def process_syllabus_faculty_json(json_file: str, session) -> tuple[List[Dict], List[Dict]]:
+def process_syllabus_faculty_json(json_file: str, session, lookups: LookupCache) -> tuple[List[Dict], List[Dict]]:
     """シラバスJSONファイルから学部関連情報を抽出する"""
+    try:
+        data = read_json(json_file)
+    except json.JSONDecodeError as e:
+        return [], [{
+            'file_name': os.path.basename(json_file),
+            'subject_name': '',
+            'syllabus_code': '',
+            'syllabus_year': '',
+            'faculty_name': '',
+            'error_type': 'JSON_DECODE_ERROR',
+            'error_detail': f'JSONファイルの解析エラー: {str(e)}',
+            'normalized_faculty_name': '',
+            'processed_at': datetime.now().isoformat()
+        }]
+    except Exception as e:
+        return [], [{
+            'file_name': os.path.basename(json_file),
+            'subject_name': '',
+            'syllabus_code': '',
+            'syllabus_year': '',
+            'faculty_name': '',
+            'error_type': 'UNKNOWN_ERROR',
+            'error_detail': f'予期しないエラー: {str(e)}',
+            'normalized_faculty_name': '',
+            'processed_at': datetime.now().isoformat()
+        }]
+    
+    return extract_syllabus_faculty_from_single_json(data, session, lookups, json_file)
+
+def extract_syllabus_faculty_from_single_json(data: Dict, session, lookups: LookupCache, json_file: str) -> tuple[List[Dict], List[Dict]]:
+    """読み込み済みのシラバスJSONから学部関連情報を抽出する"""
     syllabus_faculties = []
     errors = []
     
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         # 基本情報の取得
         syllabus_code = data.get('科目コード', '')
         syllabus_year = data.get('基本情報', {}).get('開講年度', {}).get('内容', '')
@@ -211,7 +210,7 @@ def process_syllabus_faculty_json(json_file: str, session) -> tuple[List[Dict],
                             continue
                         
                         # 学部・課程IDを取得
-                        faculty_id = get_faculty_id_from_db(session, normalized_faculty_name)
+                        faculty_id = lookups.get_id('faculty', normalized_faculty_name)
                         
                         if faculty_id is None:
                             errors.append({
@@ -258,18 +257,6 @@ def process_syllabus_faculty_json(json_file: str, session) -> tuple[List[Dict],
                 'processed_at': datetime.now().isoformat()
             })
     
-    except json.JSONDecodeError as e:
-        errors.append({
-            'file_name': os.path.basename(json_file),
-            'subject_name': '',
-            'syllabus_code': '',
-            'syllabus_year': '',
-            'faculty_name': '',
-            'error_type': 'JSON_DECODE_ERROR',
-            'error_detail': f'JSONファイルの解析エラー: {str(e)}',
-            'normalized_faculty_name': '',
-            'processed_at': datetime.now().isoformat()
-        })
     except Exception as e:
         errors.append({
             'file_name': os.path.basename(json_file),
@@ -285,6 +272,19 @@ def process_syllabus_faculty_json(json_file: str, session) -> tuple[List[Dict],
     
     return syllabus_faculties, errors
 
+def unique_syllabus_faculty_records(syllabus_faculties: List[Dict]) -> List[Dict]:
+    """syllabus_id, faculty_idの組み合わせで重複を除去する（最初の出現を残す）"""
+    unique_syllabus_faculties = []
+    seen_combinations = set()
+    
+    for faculty in syllabus_faculties:
+        combination = (faculty['syllabus_id'], faculty['faculty_id'])
+        if combination not in seen_combinations:
+            seen_combinations.add(combination)
+            unique_syllabus_faculties.append(faculty)
+    
+    return unique_syllabus_faculties
+
 def main():
     """メイン処理"""
     try:
@@ -299,6 +299,9 @@ def main():
         # データベース接続
         session = get_db_connection()
         
+        # 学部・課程IDを一括で読み込む（学部ごとの問い合わせはしない）
+        lookups = LookupCache.load(session, 'faculty')
+        
         # JSONファイルの取得
         json_files = get_all_json_files(year)
         
@@ -318,7 +321,7 @@ def main():
         
         # ファイル処理の進捗バー
         for json_file in tqdm(json_files, desc="ファイル処理中", unit="file"):
-            syllabus_faculties, errors = process_syllabus_faculty_json(json_file, session)
+            syllabus_faculties, errors = process_syllabus_faculty_json(json_file, session, lookups)
             all_syllabus_faculties.extend(syllabus_faculties)
             all_errors.extend(errors)
             
@@ -333,14 +336,7 @@ def main():
                 stats['specific_errors'][error_type] = stats['specific_errors'].get(error_type, 0) + 1
         
         # 重複を除去（syllabus_id, faculty_idの組み合わせでユニーク）
-        unique_syllabus_faculties = []
-        seen_combinations = set()
-        
-        for faculty in all_syllabus_faculties:
-            combination = (faculty['syllabus_id'], faculty['faculty_id'])
-            if combination not in seen_combinations:
-                seen_combinations.add(combination)
-                unique_syllabus_faculties.append(faculty)
+        unique_syllabus_faculties = unique_syllabus_faculty_records(all_syllabus_faculties)
         
         # 最終統計の表示
         tqdm.write("\n" + "="*60)
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""シラバスJSONコーパスの読み込み
+
+シラバスJSONは src/syllabus/{year}/json に個別のファイルとして置くか、
+2025Y.tar.xz のようなアーカイブ（.tar.xz / .tar.zst）のまま置く。
+アーカイブはディスクに展開せず、メンバーを先頭から順に読みながら解析する。
+
+ランダムアクセスが必要な場合は build_index() で索引を作成する。xz・zstdは途中から
+伸長できないため、1回だけ全体を伸長したデータファイル（メンバーを連結したもの）と、
+メンバー名 -> (オフセット, サイズ) の索引をアーカイブの隣に保存し、以降はシークして読む。
+メンバー名はアーカイブ内のパス（ディレクトリを含む）とする。
+
+ファイル単位で処理するパーサーは json_file_paths() でパスの一覧を取得し、read_json() で読む。
+アーカイブのメンバーは「アーカイブのパス/メンバー名」で表し、索引から読む（索引がなければ作成する）。
+
+使用例:
+    python -m src.db.parser.corpus --year 2025                 # メンバー数とエラーを表示
+    python -m src.db.parser.corpus --year 2025 --build-index   # 索引を作成
+    python -m src.db.parser.corpus --year 2025 --show Y000001020.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import tarfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_SUFFIXES = (".tar.xz", ".tar.zst", ".tar.zstd")
+INDEX_SUFFIX = ".index.json"
+DATA_SUFFIX = ".data"
+# 索引の形式（メンバー名をベース名としていた索引は使わない）
+INDEX_FORMAT = 2
+
+def _member_name(name: str) -> str:
+    # 別のディレクトリにある同名のメンバーを区別するため、アーカイブ内のパスをそのまま使う
+    return os.path.normpath(name)
+
+def _loose_json_files(directory: str) -> List[str]:
+    """ディレクトリの *.json（アーカイブの索引 *.index.json は除く）"""
+    return sorted(
+        path for path in glob.glob(os.path.join(directory, "*.json")) if not path.endswith(INDEX_SUFFIX)
+    )
+
+def _is_archive(path: str) -> bool:
+    return path.endswith(ARCHIVE_SUFFIXES)
+
+def _archive_stem(path: str) -> str:
+    for suffix in ARCHIVE_SUFFIXES:
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+class CorpusIndex:
+    """伸長済みデータファイルと、メンバー名 -> (オフセット, サイズ) の索引"""
+
+    def __init__(self, data_path: str, members: List[Tuple[str, int, int]]):
+        self.data_path = data_path
+        self.members = members
+        self._offsets = {name: (offset, size) for name, offset, size in members}
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._offsets
+
+    def read(self, name: str) -> bytes:
+        offset, size = self._offsets[name]
+        with open(self.data_path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def iter_raw(self) -> Iterator[Tuple[str, bytes]]:
+        """アーカイブ内の順序でメンバーを読む"""
+        with open(self.data_path, "rb") as f:
+            for name, offset, size in self.members:
+                f.seek(offset)
+                yield name, f.read(size)
+
+class SyllabusCorpus:
+    """シラバスJSONの集合（ディレクトリまたはアーカイブ）
+
+    documents() は (メンバー名, 解析済みのJSON) を順に返す。解析できなかったメンバーは
+    読み飛ばし、(メンバー名, 理由) を errors に記録する。
+    """
+
+    def __init__(self, path: str, index_dir: Optional[str] = None):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"コーパスが見つかりません: {path}")
+        if os.path.isfile(path) and not _is_archive(path):
+            raise ValueError(f"対応していない形式です（{', '.join(ARCHIVE_SUFFIXES)} またはディレクトリ）: {path}")
+        self.path = path
+        self.index_dir = index_dir
+        self.errors: List[Tuple[str, str]] = []
+        self._index: Optional[CorpusIndex] = None
+
+    @property
+    def is_archive(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def _index_paths(self) -> Tuple[str, str]:
+        stem = _archive_stem(self.path)
+        if self.index_dir:
+            stem = os.path.join(self.index_dir, os.path.basename(stem))
+        return stem + INDEX_SUFFIX, stem + DATA_SUFFIX
+
+    def _signature(self) -> Dict[str, int]:
+        stat = os.stat(self.path)
+        return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+    def load_index(self) -> Optional[CorpusIndex]:
+        """アーカイブと一致する索引があれば読み込む（アーカイブが更新されていれば使わない）"""
+        if not self.is_archive:
+            return None
+        if self._index is not None:
+            return self._index
+        index_path, data_path = self._index_paths()
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (index.get("format") != INDEX_FORMAT or index.get("archive") != self._signature()
+                or not os.path.exists(data_path)):
+            return None
+        self._index = CorpusIndex(data_path, [tuple(member) for member in index["members"]])
+        return self._index
+
+    def build_index(self) -> CorpusIndex:
+        """アーカイブを1回だけ伸長し、データファイルと索引を保存する"""
+        if not self.is_archive:
+            raise ValueError("索引はアーカイブに対してのみ作成できます")
+        index_path, data_path = self._index_paths()
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        members = []
+        offset = 0
+        tmp_data = f"{data_path}.{os.getpid()}.tmp"
+        with open(tmp_data, "wb") as out:
+            for name, raw in self._stream_raw():
+                out.write(raw)
+                members.append((name, offset, len(raw)))
+                offset += len(raw)
+        os.replace(tmp_data, data_path)
+        tmp_index = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump({"format": INDEX_FORMAT, "archive": self._signature(), "members": members}, f, ensure_ascii=False)
+        os.replace(tmp_index, index_path)
+        self._index = CorpusIndex(data_path, members)
+        return self._index
+
+    def _open_stream(self):
+        """アーカイブをストリームとして開く（シークしない）"""
+        if self.path.endswith(".tar.xz"):
+            return tarfile.open(self.path, mode="r|xz")
+        if zstandard is None:
+            raise ImportError("zstandardがインストールされていません。.tar.zstを読むには `pip install zstandard` が必要です")
+        fileobj = open(self.path, "rb")
+        reader = zstandard.ZstdDecompressor().stream_reader(fileobj)
+        tar = tarfile.open(fileobj=reader, mode="r|")
+        # tarfileはfileobjを閉じないため、閉じるときに一緒に閉じる
+        original_close = tar.close
+        def close():
+            original_close()
+            reader.close()
+            fileobj.close()
+        tar.close = close
+        return tar
+
+    def _stream_raw(self) -> Iterator[Tuple[str, bytes]]:
+        tar = self._open_stream()
+        seen = set()
+        try:
+            for member in tar:
+                if not member.isfile() or not member.name.endswith(".json"):
+                    continue
+                name = _member_name(member.name)
+                if name in seen:
+                    # 索引で1つに定まらないため、同じパスのメンバーは最初のものだけを使う
+                    self.errors.append((name, "同じパスのメンバーが複数あります（最初のものを使用）"))
+                    continue
+                seen.add(name)
+                f = tar.extractfile(member)
+                if f is None:
+                    continue
+                yield name, f.read()
+        finally:
+            tar.close()
+
+    def iter_raw(self) -> Iterator[Tuple[str, bytes]]:
+        """(メンバー名, 生のバイト列) を順に返す"""
+        if not self.is_archive:
+            for path in _loose_json_files(self.path):
+                with open(path, "rb") as f:
+                    yield os.path.basename(path), f.read()
+            return
+        index = self.load_index()
+        if index is not None:
+            yield from index.iter_raw()
+        else:
+            yield from self._stream_raw()
+
+    def _parse(self, name: str, raw: bytes) -> Optional[Dict]:
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError) as e:
+            if raw[257:262] == b"ustar":
+                reason = "JSONではなくtarアーカイブが格納されています"
+            else:
+                reason = f"JSONの解析エラー: {str(e)}"
+            self.errors.append((name, reason))
+            return None
+
+    def documents(self) -> Iterator[Tuple[str, Dict]]:
+        """(メンバー名, 解析済みのJSON) を順に返す"""
+        self.errors = []
+        for name, raw in self.iter_raw():
+            data = self._parse(name, raw)
+            if data is not None:
+                yield name, data
+
+    def get(self, name: str) -> Dict:
+        """メンバー名を指定して1件読む（アーカイブの場合は索引が必要）"""
+        if not self.is_archive:
+            with open(os.path.join(self.path, name), "rb") as f:
+                raw = f.read()
+        else:
+            index = self.load_index()
+            if index is None:
+                raise LookupError("索引がありません。先に build_index() を実行してください")
+            raw = index.read(name)
+        data = self._parse(name, raw)
+        if data is None:
+            raise ValueError(f"{name}: {self.errors[-1][1]}")
+        return data
+
+    def count(self) -> Optional[int]:
+        """メンバー数（索引のないアーカイブは読み終えるまで分からないためNone）"""
+        if not self.is_archive:
+            return len(_loose_json_files(self.path))
+        index = self.load_index()
+        return len(index) if index is not None else None
+
+def open_syllabus_corpus(year: int, index_dir: Optional[str] = None) -> SyllabusCorpus:
+    """src/syllabus/{year}/json のコーパスを開く
+
+    展開済みの .json があればそれを使い、なければアーカイブ（.tar.xz / .tar.zst）を使う。
+    """
+    src_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    json_dir = os.path.join(src_dir, "syllabus", str(year), "json")
+    if _loose_json_files(json_dir):
+        return SyllabusCorpus(json_dir)
+    archives = sorted(
+        path for suffix in ARCHIVE_SUFFIXES for path in glob.glob(os.path.join(json_dir, f"*{suffix}"))
+    )
+    if not archives:
+        raise FileNotFoundError(f"{year}年度のJSONファイル・アーカイブが見つかりません: {json_dir}")
+    return SyllabusCorpus(archives[0], index_dir=index_dir)
+
+# read_json() で開いたアーカイブ（プロセスごとに索引を1回だけ読み込む）
+_archives: Dict[str, SyllabusCorpus] = {}
+
+def json_file_paths(year: int) -> List[str]:
+    """src/syllabus/{year}/json のシラバスJSONのパス一覧（ファイル単位で処理するパーサー用）
+
+    展開済みの .json があればそのパスを、なければ「アーカイブのパス/メンバー名」を返す。
+    アーカイブの場合はランダムアクセスのため、索引がなければ作成する。見つからない場合は空。
+    """
+    try:
+        corpus = open_syllabus_corpus(year)
+    except FileNotFoundError:
+        return []
+    if not corpus.is_archive:
+        return _loose_json_files(corpus.path)
+    index = corpus.load_index() or corpus.build_index()
+    for name, reason in corpus.errors:
+        print(f"アーカイブの読み込みエラー: {name}: {reason}")
+    _archives[corpus.path] = corpus
+    return [os.path.join(corpus.path, name) for name, _, _ in index.members]
+
+def _split_member_path(path: str) -> Optional[Tuple[str, str]]:
+    for suffix in ARCHIVE_SUFFIXES:
+        marker = suffix + os.sep
+        if marker in path:
+            archive, name = path.split(marker, 1)
+            return archive + suffix, name
+    return None
+
+def read_json(path: str) -> Dict:
+    """json_file_paths() が返したパスのJSONを読む（アーカイブのメンバーは索引から読む）"""
+    member = _split_member_path(path)
+    if member is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    archive, name = member
+    corpus = _archives.get(archive)
+    if corpus is None:
+        corpus = _archives[archive] = SyllabusCorpus(archive)
+    return corpus.get(name)
+
+def main():
+    parser = argparse.ArgumentParser(description="シラバスJSONコーパス（ディレクトリ・アーカイブ）の確認と索引の作成")
+    parser.add_argument("--year", type=int, help="対象年度（src/syllabus/{year}/json）")
+    parser.add_argument("--source", help="ディレクトリまたはアーカイブのパス（--yearの代わりに指定）")
+    parser.add_argument("--build-index", action="store_true", help="ランダムアクセス用の索引を作成する")
+    parser.add_argument("--show", metavar="NAME", help="指定したメンバーを表示する（アーカイブの場合は索引が必要）")
+    args = parser.parse_args()
+    if not args.year and not args.source:
+        parser.error("--year または --source を指定してください")
+
+    corpus = SyllabusCorpus(args.source) if args.source else open_syllabus_corpus(args.year)
+    if args.build_index:
+        index = corpus.build_index()
+        print(f"索引を作成しました: {len(index)}件 ({index.data_path})")
+    if args.show:
+        print(json.dumps(corpus.get(args.show), ensure_ascii=False, indent=2))
+        return
+    count = sum(1 for _ in corpus.documents())
+    print(f"{corpus.path}: {count}件")
+    for name, reason in corpus.errors:
+        print(f"  エラー: {name}: {reason}")
+
+if __name__ == "__main__":
+    main()
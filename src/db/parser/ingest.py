@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""シラバスJSONの一括取り込み
+
+各パーサーが src/syllabus/{year}/json を個別に読み込むと、同じファイルをパーサーの数だけ
+読み込み・解析することになる。ここでは各シラバスJSONを1回だけ読み込み、登録された抽出器に
+順に渡す。抽出器は各パーサーの1ファイル分の抽出関数（extract_*_from_single_json 等）を呼び、
+最後に各パーサーと同じ updates/<table>/add に出力する。
+
+使用例:
+    python -m src.db.parser.ingest --year 2025
+    python -m src.db.parser.ingest --year 2025 --only syllabus,lecture_time
+    python -m src.db.parser.ingest --year 2025 --source src/syllabus/2025/json/2025Y.tar.xz
+
+シラバスJSONは corpus.SyllabusCorpus で読むため、展開済みのディレクトリのほか
+2025Y.tar.xz のようなアーカイブも展開せずにそのまま読み込める。
+
+syllabus_book・lecture_session_instructor は取り込み済みの book・lecture_session を
+参照するため対象外（それぞれのパーサーで実行する）。
+"""
+
+import argparse
+import importlib
+from abc import ABC, abstractmethod
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Type
+
+from tqdm import tqdm
+
+from .corpus import SyllabusCorpus, open_syllabus_corpus
+from .utils import get_db_connection, get_year_from_user
+
+_PACKAGE = __package__ or "src.db.parser"
+_modules: Dict[str, Any] = {}
+
+def _parser(module_name: str):
+    """パーサーモジュールを読み込む（ファイル名が数字で始まるためimportlibを使う）"""
+    if module_name not in _modules:
+        _modules[module_name] = importlib.import_module(f"{_PACKAGE}.{module_name}")
+    return _modules[module_name]
+
+class Extractor(ABC):
+    """抽出器の基底クラス
+
+    process() を各シラバスJSONについて呼び、全ファイルの処理後に finish() で出力する。
+    """
+
+    name = ""
+
+    def __init__(self, session, year: int):
+        self.session = session
+        self.year = year
+        self.records: List[Dict] = []
+        self.errors: List[Any] = []
+        self.elapsed = 0.0
+
+    @abstractmethod
+    def process(self, data: Dict, json_file: str) -> None:
+        """1ファイル分のレコードを抽出する"""
+
+    @abstractmethod
+    def finish(self) -> List[str]:
+        """出力したファイルのパスを返す"""
+
+    def add_error(self, json_file: str, message: str) -> None:
+        self.errors.append(f"{os.path.basename(json_file)}: {message}")
+
+EXTRACTORS: Dict[str, Type[Extractor]] = {}
+
+def register_extractor(cls: Type[Extractor]) -> Type[Extractor]:
+    """抽出器を登録する（登録順に実行する）"""
+    EXTRACTORS[cls.name] = cls
+    return cls
+
+@register_extractor
+class SyllabusExtractor(Extractor):
+    name = "syllabus"
+
+    def process(self, data, json_file):
+        syllabi, errors = _parser("09_syllabus").extract_syllabus_from_single_json(data, self.session)
+        self.records.extend(syllabi)
+        for error in errors:
+            self.add_error(json_file, error)
+
+    def finish(self):
+        if not self.records:
+            return []
+        return [_parser("09_syllabus").create_syllabus_json(self.records)]
+
+@register_extractor
+class SubjectGradeExtractor(Extractor):
+    name = "subject_grade"
+
+    def process(self, data, json_file):
+        grades = _parser("10_subject_grade").extract_grade_info_from_single_json(data, self.session, self.year)
+        if not grades:
+            self.add_error(json_file, "学年情報が見つからないか、syllabus_masterに対応するレコードがありません")
+        self.records.extend(grades)
+
+    def finish(self):
+        if not self.records:
+            return []
+        return [_parser("10_subject_grade").create_grade_json(self.records)]
+
+@register_extractor
+class LectureTimeExtractor(Extractor):
+    name = "lecture_time"
+
+    def process(self, data, json_file):
+        lecture_times = _parser("11_lecture_time").extract_lecture_time_from_single_json(data, self.session, self.year)
+        if not lecture_times:
+            self.add_error(json_file, "講義時間情報が見つかりませんでした。syllabus_masterにデータが存在しない可能性があります。")
+        self.records.extend(lecture_times)
+
+    def finish(self):
+        if not self.records:
+            return []
+        return [_parser("11_lecture_time").create_lecture_time_json(self.records)]
+
+@register_extractor
+class LectureSessionExtractor(Extractor):
+    name = "lecture_session"
+    module_name = "12_lecture_session"
+    extract_name = "extract_lecture_session_from_single_json"
+    create_name = "create_lecture_session_json"
+    not_found_message = "通常の講義セッション情報が見つかりませんでした"
+
+    def process(self, data, json_file):
+        extract = getattr(_parser(self.module_name), self.extract_name)
+        sessions, errors = extract(data, self.session, self.year, json_file)
+        self.records.extend(sessions)
+        self.errors.extend(errors)
+
+    def finish(self):
+        module = _parser(self.module_name)
+        outputs = []
+        final_errors = []
+        if self.records:
+            outputs.append(getattr(module, self.create_name)(self.records))
+        else:
+            final_errors.append(self.not_found_message)
+        outputs.append(module.create_error_csv(self.errors, final_errors, self.year))
+        return outputs
+
+@register_extractor
+class LectureSessionIrregularExtractor(LectureSessionExtractor):
+    name = "irregular"
+    module_name = "13_lecture_session_irregular"
+    extract_name = "extract_lecture_session_irregular_from_single_json"
+    create_name = "create_lecture_session_irregular_json"
+    not_found_message = "不規則な講義セッション情報が見つかりませんでした"
+
+@register_extractor
+class SyllabusInstructorExtractor(Extractor):
+    name = "instructor"
+
+    def process(self, data, json_file):
+        # 教員名の抽出のみ行い、IDはfinish()でまとめて解決する
+        self.records.extend(
+            _parser("14_syllabus_instructor").extract_syllabus_instructor_from_single_json(data, self.year, json_file)
+        )
+
+    def finish(self):
+        module = _parser("14_syllabus_instructor")
+        processed, errors = module.process_syllabus_instructor_data(self.records, self.session)
+        self.errors.extend(errors)
+        if not processed:
+            return []
+        return [module.create_syllabus_instructor_json(processed)]
+
+@register_extractor
+class BookExtractor(Extractor):
+    name = "book"
+
+    def __init__(self, session, year):
+        super().__init__(session, year)
+        self.books_uncategorized: List[Dict] = []
+        # 重複ISBNの判定はファイルをまたいで行う
+        self.processed_isbns = set()
+        self.stats = defaultdict(int)
+
+    def process(self, data, json_file):
+        _parser("07_book").extract_books_from_single_json(
+            data, self.session, self.year, self.records, self.books_uncategorized, self.processed_isbns, self.stats
+        )
+
+    def finish(self):
+        module = _parser("07_book")
+        outputs = []
+        if self.records:
+            outputs.append(module.create_book_json(self.records))
+        if self.books_uncategorized:
+            outputs.append(module.create_book_uncategorized_json(self.books_uncategorized))
+        return outputs
+
+@register_extractor
+class GradingCriterionExtractor(Extractor):
+    name = "grading_criterion"
+
+    def __init__(self, session, year):
+        super().__init__(session, year)
+        self.stats = defaultdict(int)
+
+    def process(self, data, json_file):
+        self.records.extend(
+            _parser("17_grading_criterion").extract_grading_criteria_from_single_json(data, self.session, self.year, self.stats)
+        )
+
+    def finish(self):
+        if not self.records:
+            return []
+        return [_parser("17_grading_criterion").create_grading_criterion_json(self.records)]
+
+@register_extractor
+class StudySystemExtractor(Extractor):
+    name = "study_system"
+
+    def process(self, data, json_file):
+        study_systems, errors = _parser("21_syllabus_study_system").extract_syllabus_study_system_from_single_json(
+            data, self.session, json_file
+        )
+        self.records.extend(study_systems)
+        self.errors.extend(errors)
+
+    def finish(self):
+        module = _parser("21_syllabus_study_system")
+        outputs = []
+        if self.errors:
+            outputs.append(module.create_warning_csv(self.year, self.errors))
+        if self.records:
+            outputs.append(module.create_syllabus_study_system_json(self.records))
+        return outputs
+
+@register_extractor
+class SyllabusFacultyExtractor(Extractor):
+    name = "faculty"
+
+    def __init__(self, session, year):
+        super().__init__(session, year)
+        module = _parser("22_syllabus_faculty")
+        self.lookups = module.LookupCache.load(session, 'faculty')
+
+    def process(self, data, json_file):
+        faculties, errors = _parser("22_syllabus_faculty").extract_syllabus_faculty_from_single_json(
+            data, self.session, self.lookups, json_file
+        )
+        self.records.extend(faculties)
+        self.errors.extend(errors)
+
+    def finish(self):
+        module = _parser("22_syllabus_faculty")
+        outputs = []
+        unique_syllabus_faculties = module.unique_syllabus_faculty_records(self.records)
+        if unique_syllabus_faculties:
+            outputs.append(module.create_syllabus_faculty_json(unique_syllabus_faculties))
+        if self.errors:
+            outputs.append(module.create_warning_csv(self.year, self.errors))
+        return outputs
+
+def ingest(year: int, names: Optional[List[str]] = None, corpus: Optional[SyllabusCorpus] = None) -> Dict[str, List[str]]:
+    """各シラバスJSONを1回だけ読み込み、抽出器namesに渡す。抽出器ごとの出力ファイルを返す
+
+    corpusを省略した場合は src/syllabus/{year}/json（展開済みのJSONまたはアーカイブ）を読む。
+    """
+    names = names or list(EXTRACTORS)
+    unknown = [name for name in names if name not in EXTRACTORS]
+    if unknown:
+        raise ValueError(f"不明な抽出器: {', '.join(unknown)}（有効な値: {', '.join(EXTRACTORS)}）")
+    if corpus is None:
+        corpus = open_syllabus_corpus(year)
+
+    session = get_db_connection()
+    try:
+        extractors = [EXTRACTORS[name](session, year) for name in names]
+        load_elapsed = 0.0
+        file_count = 0
+
+        tqdm.write(f"\n{'='*60}")
+        tqdm.write(f"シラバス一括取り込み - 対象年度: {year}")
+        tqdm.write(f"入力: {corpus.path}")
+        tqdm.write(f"抽出器: {', '.join(names)}")
+        tqdm.write(f"{'='*60}")
+
+        documents = corpus.documents()
+        progress = tqdm(total=corpus.count(), desc="ファイル処理中", unit="file")
+        while True:
+            # アーカイブの伸長とJSONの解析はnext()の中で行われる
+            start = time.perf_counter()
+            document = next(documents, None)
+            load_elapsed += time.perf_counter() - start
+            if document is None:
+                break
+            json_file, data = document
+            file_count += 1
+            progress.update()
+
+            for extractor in extractors:
+                start = time.perf_counter()
+                try:
+                    extractor.process(data, json_file)
+                except Exception as e:
+                    # 1つの抽出器の失敗で他の抽出器の処理を止めない
+                    # （DBエラーで中断したトランザクションは共有のセッションを使う他の抽出器も失敗させるため戻す）
+                    session.rollback()
+                    extractor.add_error(json_file, f"処理中にエラーが発生: {str(e)}")
+                finally:
+                    extractor.elapsed += time.perf_counter() - start
+        progress.close()
+        load_errors = [f"{name}: ファイル読み込みエラー: {reason}" for name, reason in corpus.errors]
+
+        outputs = {}
+        for extractor in extractors:
+            start = time.perf_counter()
+            outputs[extractor.name] = extractor.finish()
+            extractor.elapsed += time.perf_counter() - start
+
+        # 最終統計の表示
+        tqdm.write("\n" + "="*60)
+        tqdm.write("処理完了 - 統計情報")
+        tqdm.write("="*60)
+        tqdm.write(f"総ファイル数: {file_count + len(load_errors)}")
+        tqdm.write(f"読み込みエラー数: {len(load_errors)}")
+        tqdm.write(f"読み込み・解析時間: {load_elapsed:.2f}秒")
+        for extractor in extractors:
+            tqdm.write(
+                f"  {extractor.name:<18} {len(extractor.records):>8}件"
+                f"  エラー {len(extractor.errors):>6}件  {extractor.elapsed:.2f}秒"
+            )
+            for output in outputs[extractor.name]:
+                tqdm.write(f"    📄 {output}")
+        tqdm.write("="*60)
+        for error in load_errors:
+            tqdm.write(f"エラー: {error}")
+
+        return outputs
+    finally:
+        session.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="シラバスJSONを1回だけ読み込み、各テーブルの抽出器に渡す")
+    parser.add_argument("--year", type=int, help="対象年度（省略時は入力を求める）")
+    parser.add_argument("--only", help=f"実行する抽出器（カンマ区切り、省略時は全て: {', '.join(EXTRACTORS)}）")
+    parser.add_argument("--source", help="シラバスJSONのディレクトリまたはアーカイブ（.tar.xz / .tar.zst）。省略時は src/syllabus/{year}/json")
+    args = parser.parse_args()
+
+    year = args.year or get_year_from_user()
+    names = [name.strip() for name in args.only.split(",") if name.strip()] if args.only else None
+    corpus = SyllabusCorpus(args.source) if args.source else None
+    ingest(year, names, corpus)
+
+if __name__ == "__main__":
+    main()
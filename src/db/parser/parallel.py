@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# File Version: v3.0.0
+# Project Version: v3.0.0
+# Last Updated: 2026-10-17
+
+"""パーサーのファイル単位の処理の並列実行
+
+12_lecture_session.py・15_lecture_session_instructor.py のループは、JSONファイルごとの
+json.load と名前の正規化が処理時間の大半を占める。--workers N を指定した場合は、
+ファイルをプロセスプールに分配して処理する。
+
+ワーカープロセスはDBに接続しない。親プロセスで必要な対応表を読み込んで session.info に
+格納しておき、ワーカーには同じ内容の session.info を持つ OfflineSession を渡す。
+結果は入力ファイルの順に受け取るため、出力ファイルは逐次実行と同じ内容になる。
+"""
+
+from functools import partial
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+class OfflineSession:
+    """ワーカープロセスで使う、DBに接続しないセッション
+
+    親プロセスで読み込んだ対応表（session.info）だけを持つ。SQLを実行しようとした場合は
+    対応表の読み込み漏れのため、RuntimeErrorを送出する。
+    """
+
+    def __init__(self, info: Dict[str, Any]):
+        self.info = info
+
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("ワーカープロセスではDBにアクセスできません（対応表が読み込まれていません）")
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+_worker_session: Optional[OfflineSession] = None
+
+def _init_worker(info: Dict[str, Any]) -> None:
+    global _worker_session
+    _worker_session = OfflineSession(info)
+
+def _run(func: Callable, args: tuple, json_file: str) -> Any:
+    return func(json_file, _worker_session, *args)
+
+def map_json_files(func: Callable, json_files: List[str], session, args: Sequence = (), workers: int = 1) -> Iterator[Any]:
+    """func(json_file, session, *args) を各ファイルについて実行し、結果を json_files の順に返す
+
+    workersが2以上の場合はプロセスプールで実行する。funcはモジュールのトップレベルの関数とし、
+    DBの参照は session.info に読み込み済みの対応表で行うこと。
+    """
+    if workers <= 1:
+        for json_file in json_files:
+            yield func(json_file, session, *args)
+        return
+    # 1件ずつ受け渡すとプロセス間の通信が支配的になるため、ワーカーあたり4つ程度に分けて渡す
+    chunksize = max(1, len(json_files) // (workers * 4))
+    with Pool(workers, initializer=_init_worker, initargs=(dict(session.info),)) as pool:
+        yield from pool.imap(partial(_run, func, tuple(args)), json_files, chunksize)
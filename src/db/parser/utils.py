@@ -4,11 +4,14 @@
 # Last Updated: 2025-07-08
 # curosrはversionをいじるな
 
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+import re
 import unicodedata
 import sys
 import os
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
@@ -173,22 +176,220 @@ def get_db_connection():
     session.commit()
     return session
 
+class SyllabusMasterIndex:
+    """(syllabus_code, syllabus_year) -> syllabus_id の対応表
+
+    年度ごとに syllabus_master を1回のクエリで読み込み、以降はメモリ上で引く。
+    1年度あたり数万件になるため、辞書ではなく科目コードの昇順リストとIDの配列
+    （array）で保持し、二分探索で引く。
+    """
+
+    def __init__(self, session):
+        self._session = session
+        # 年度 -> (科目コードの昇順リスト, 同じ順序のsyllabus_idの配列)
+        self._years: Dict[int, Tuple[List[str], array]] = {}
+
+    def _load_year(self, year: int) -> Tuple[List[str], array]:
+        try:
+            rows = self._session.execute(text("""
+                SELECT syllabus_code, syllabus_id
+                FROM syllabus_master
+                WHERE syllabus_year = :year
+            """), {"year": year}).all()
+        except Exception as e:
+            print(f"[DB接続エラー] syllabus_master取得時にエラー: {str(e)}")
+            raise
+        # 二分探索はPythonの文字列順で行うため、DBの照合順序ではなくここで並べる
+        rows.sort(key=lambda row: row[0])
+        codes = [sys.intern(code) for code, _ in rows]
+        ids = array('l', (syllabus_id for _, syllabus_id in rows))
+        self._years[year] = (codes, ids)
+        return codes, ids
+
+    def get(self, syllabus_code: str, year: int) -> Optional[int]:
+        """syllabus_idを返す（見つからない場合はNone）"""
+        if not syllabus_code:
+            return None
+        try:
+            year = int(year)
+        except (TypeError, ValueError):
+            return None
+        codes, ids = self._years.get(year) or self._load_year(year)
+        i = bisect_left(codes, syllabus_code)
+        if i < len(codes) and codes[i] == syllabus_code:
+            return ids[i]
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(codes) for codes, _ in self._years.values())
+
+    def preload(self, year: int) -> None:
+        """指定した年度を読み込んでおく（ワーカープロセスに渡す前に呼ぶ）"""
+        if int(year) not in self._years:
+            self._load_year(int(year))
+
+    def __getstate__(self):
+        # セッションはプロセス間で受け渡せないため、読み込み済みの対応表のみを渡す
+        return {'_session': None, '_years': self._years}
+
+def get_syllabus_master_index(session) -> SyllabusMasterIndex:
+    """セッションに紐づく対応表を返す（セッションごとに1つ作り、session.infoに保持する）"""
+    index = session.info.get('syllabus_master_index')
+    if index is None:
+        index = SyllabusMasterIndex(session)
+        session.info['syllabus_master_index'] = index
+    return index
+
 def get_syllabus_master_id_from_db(session, syllabus_code: str, year: int) -> int:
-    try:
-        query = text("""
-            SELECT syllabus_id 
-            FROM syllabus_master 
-            WHERE syllabus_code = :code 
-            AND syllabus_year = :year
-        """)
-        result = session.execute(
-            query,
-            {"code": syllabus_code, "year": year}
-        ).first()
-        return result[0] if result else None
-    except Exception as e:
-        print(f"[DB接続エラー] syllabus_master取得時にエラー: {str(e)}")
-        raise 
+    """syllabus_idを取得する（年度ごとに一括で読み込んだ対応表から引く）"""
+    return get_syllabus_master_index(session).get(syllabus_code, year)
+
+def _like_fragment_pattern(fragment: str, separator: str = '\x00') -> Optional['re.Pattern']:
+    """LIKE '%fragment%' と同じ判定を行う正規表現（separatorを跨いで一致しない）
+
+    %・_ はワイルドカード、\\ は次の1文字をそのまま一致させる（PostgreSQLのLIKEの既定のエスケープ）。
+    末尾が \\ のパターンはPostgreSQLではエラーとなるため None を返す。
+    """
+    any_char = f'[^{re.escape(separator)}]'
+    parts = []
+    i = 0
+    while i < len(fragment):
+        char = fragment[i]
+        if char == '\\':
+            if i + 1 == len(fragment):
+                return None
+            parts.append(re.escape(fragment[i + 1]))
+            i += 2
+            continue
+        if char == '%':
+            parts.append(any_char + '*')
+        elif char == '_':
+            parts.append(any_char)
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return re.compile(''.join(parts))
+
+class LookupCache:
+    """マスタテーブルの名前 -> ID の対応を一括で読み込んで保持する
+
+    パーサーが行ごとにSELECTを発行する代わりに、実行の最初にテーブルごとに1回だけ読み込み、
+    以降は辞書で引く。従来の WHERE 名前列 = :name と同じく、DB側の名前は正規化せずそのまま
+    キーとし、引く側の名前のみテーブルごとの正規化関数（Noneの場合はそのまま）で正規化する。
+    同じ名前の行が複数ある場合はIDの最も小さいもの（従来の ORDER BY ... LIMIT 1 と同じ）を採用する。
+    instructor は従来 ORDER BY がなく結果が不定だったため、同じくIDの最も小さいものに揃えている。
+    """
+
+    # キー: (テーブル名, ID列, 名前列, 引く側の名前の正規化関数)
+    TABLES = {
+        'subject_name': ('subject_name', 'subject_name_id', 'name', normalize_subject_name),
+        'faculty': ('faculty', 'faculty_id', 'faculty_name', None),
+        'class': ('class', 'class_id', 'class_name', None),
+        'subclass': ('subclass', 'subclass_id', 'subclass_name', None),
+        'subject_attribute': ('subject_attribute', 'attribute_id', 'attribute_name', None),
+        'instructor': ('instructor', 'instructor_id', 'name', normalize_subject_name),
+    }
+
+    def __init__(self):
+        self._maps: Dict[str, Dict[str, int]] = {}
+        # 科目名の部分一致検索用。ID順の名前を区切り文字で連結した文字列を1回の検索で走査し、
+        # 一致した位置から科目名IDを引く（名前ごとにPythonで走査しない）
+        self._subject_name_text = ''
+        self._subject_name_offsets: List[int] = []
+        self._subject_name_ids: List[int] = []
+        # 部分一致検索の結果（同じ断片の再検索を省く）
+        self._subject_name_matches: Dict[str, Optional[int]] = {}
+        # (subject_name_id, faculty_id, curriculum_year) -> subject_id
+        self._subjects: Optional[Dict[Tuple[int, int, int], int]] = None
+
+    @classmethod
+    def load(cls, session, *tables: str, subjects: bool = False) -> 'LookupCache':
+        """指定したテーブル（省略時は全て）を読み込む。subjects=Trueでsubjectテーブルも読み込む"""
+        cache = cls()
+        for name in tables or cls.TABLES:
+            cache._load_table(session, name)
+        if subjects:
+            cache._load_subjects(session)
+        return cache
+
+    def _load_table(self, session, name: str) -> None:
+        table, id_column, name_column, _ = self.TABLES[name]
+        try:
+            rows = session.execute(text(
+                f"SELECT {id_column}, {name_column} FROM {table} ORDER BY {id_column}"
+            )).all()
+        except Exception as e:
+            print(f"[DB接続エラー] {table}の読み込み時にエラー: {str(e)}")
+            raise
+        mapping: Dict[str, int] = {}
+        for row_id, row_name in rows:
+            if row_name is None:
+                continue
+            mapping.setdefault(row_name, row_id)
+        self._maps[name] = mapping
+        if name == 'subject_name':
+            self._index_subject_names(rows)
+
+    def _index_subject_names(self, rows) -> None:
+        names = []
+        offset = 0
+        self._subject_name_offsets = []
+        self._subject_name_ids = []
+        self._subject_name_matches = {}
+        for row_id, row_name in rows:
+            if row_name is None:
+                continue
+            names.append(row_name)
+            self._subject_name_offsets.append(offset)
+            self._subject_name_ids.append(row_id)
+            offset += len(row_name) + 1
+        self._subject_name_text = '\x00'.join(names)
+
+    def _load_subjects(self, session) -> None:
+        try:
+            rows = session.execute(text("""
+                SELECT subject_id, subject_name_id, faculty_id, curriculum_year
+                FROM subject
+                ORDER BY subject_id
+            """)).all()
+        except Exception as e:
+            print(f"[DB接続エラー] subjectの読み込み時にエラー: {str(e)}")
+            raise
+        self._subjects = {}
+        for subject_id, subject_name_id, faculty_id, curriculum_year in rows:
+            self._subjects.setdefault((subject_name_id, faculty_id, curriculum_year), subject_id)
+
+    def get_id(self, table: str, name: Optional[str]) -> Optional[int]:
+        """名前でIDを引く（見つからない場合はNone）"""
+        if not name:
+            return None
+        if table not in self._maps:
+            raise KeyError(f"{table}は読み込まれていません")
+        normalize = self.TABLES[table][3]
+        return self._maps[table].get(normalize(name) if normalize else name)
+
+    def find_subject_name_id(self, fragment: str) -> Optional[int]:
+        """名前が LIKE '%fragment%' に一致する科目名のうち、IDの最も小さいものを返す
+
+        従来のSQLと同じく fragment 中の %・_ はワイルドカードとして扱う。
+        """
+        if 'subject_name' not in self._maps:
+            raise KeyError("subject_nameは読み込まれていません")
+        if fragment in self._subject_name_matches:
+            return self._subject_name_matches[fragment]
+        subject_name_id = None
+        pattern = _like_fragment_pattern(fragment)
+        match = pattern.search(self._subject_name_text) if pattern is not None and self._subject_name_ids else None
+        if match is not None:
+            # 最も左の一致が、ID順で最初に一致する名前
+            subject_name_id = self._subject_name_ids[bisect_right(self._subject_name_offsets, match.start()) - 1]
+        self._subject_name_matches[fragment] = subject_name_id
+        return subject_name_id
+
+    def get_subject_id(self, subject_name_id: int, faculty_id: int, curriculum_year: int) -> Optional[int]:
+        if self._subjects is None:
+            raise KeyError("subjectは読み込まれていません")
+        return self._subjects.get((subject_name_id, faculty_id, curriculum_year))
 
 def is_regular_session(session_text: str) -> Tuple[bool, Optional[str]]:
 	"""講義セッションが正規かどうかを判定し、講義形式も返す